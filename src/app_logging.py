@@ -0,0 +1,82 @@
+import sys
+import atexit
+import queue
+import logging
+import logging.handlers
+
+ROOT_LOGGER = "deadlock"
+LOG_LEVEL_ENV = "DEADLOCK_LOG_LEVEL"  # Default of main.py --log-level, e.g., DEADLOCK_LOG_LEVEL=debug
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener = None
+
+# Until configure_logging() is called, debug and info records are dropped where they are made and
+# only warnings and errors reach stderr (through logging's last-resort handler).
+logging.getLogger(ROOT_LOGGER).setLevel(logging.WARNING)
+
+
+def get_logger(name):
+    """Returns the logger of a module, below the application's "deadlock" logger.
+
+    Args:
+        name (str): The module name (usually __name__).
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name.rsplit('.', 1)[-1]}")
+
+
+def log_event(logger, event, level=logging.DEBUG, **fields):
+    """Logs an event with key=value fields, e.g., "allocation process='P1' resource='R2'".
+
+    Nothing is formatted unless the level is enabled, so debug events cost one level check in normal
+    use. When enabled, the fields are formatted right away, so later changes to mutable values do not
+    leak into the record that the writer thread prints.
+
+    Args:
+        logger (logging.Logger): The logger (see get_logger).
+        event (str): The event name.
+        level (int): The logging level.
+        **fields: The event data.
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s %s", event, " ".join(f"{key}={value!r}" for key, value in fields.items()),
+                   extra={"event": event})
+
+
+def configure_logging(level=logging.DEBUG, log_file=None):
+    """Sends the application's log records to stderr (and a file) through a background writer thread.
+
+    Loggers only put records on a queue; a logging.handlers.QueueListener thread formats and writes
+    them, so slow consoles or disks never hold up the GUI. Calling this again replaces the previous
+    configuration, and the queue is flushed at exit.
+
+    Args:
+        level (int or str): The lowest level to log (e.g., logging.DEBUG or "info").
+        log_file (str, optional): A file to append the log to, in addition to stderr.
+    """
+    global _listener
+    stop_logging()
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+
+@atexit.register
+def stop_logging():
+    """Writes out the queued records and stops the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,220 @@
+import time
+import pickle
+import threading
+import multiprocessing
+import tkinter as tk
+from tkinter import ttk
+
+POLL_MS = 16  # Check for the result about 60 times per second; the window keeps redrawing in between
+PROGRESS_DELAY_MS = 250  # Fast runs finish before the progress dialog would even appear
+INLINE_MAX_SIZE = 10000  # States up to this size (nodes or matrix cells) are detected faster than a process starts
+
+
+def detect_single(resources_held, resources_wanted, total_resources):
+    """Runs single-instance detection (task function for BackgroundTask).
+
+    Returns:
+        tuple: (has_deadlock, message, cycle)
+    """
+    from deadlock_algo import DeadlockDetector
+    detector = DeadlockDetector(resources_held, resources_wanted, total_resources)
+    has_deadlock, message = detector.detect_deadlock()
+    return has_deadlock, message, detector.cycle
+
+
+def build_single_graph(resources_held, resources_wanted, total_resources):
+    """Validates and interns a single-instance state for visualization (task function for BackgroundTask).
+
+    Returns:
+        RAGGraph: The interned graph.
+    """
+    from deadlock_algo import DeadlockDetector
+    return DeadlockDetector(resources_held, resources_wanted, total_resources).graph
+
+
+def detect_multi_arrays(allocation, max_matrix, total_resources, num_processes, num_resources):
+    """Runs multi-instance detection on flat row-major matrices (task function for BackgroundTask).
+
+    Uses the NumPy detector when NumPy is installed, so no per-cell dicts are built; otherwise the
+    matrices are converted for MultiInstanceDeadlockDetector.
+
+    Args:
+        allocation (sequence of int): Allocation matrix, num_processes x num_resources, row-major.
+        max_matrix (sequence of int): Max matrix, same layout.
+        total_resources (sequence of int): Total instances of each resource.
+        num_processes (int): Number of processes.
+        num_resources (int): Number of resources.
+
+    Returns:
+        tuple: (has_deadlock, message, safe_sequence)
+    """
+    available = [total_resources[j] - sum(allocation[j::num_resources]) for j in range(num_resources)]
+    try:
+        import numpy as np
+        from multi_deadlock_numpy import VectorizedMultiInstanceDeadlockDetector
+    except ImportError:
+        from multi_deadlock_algo import MultiInstanceDeadlockDetector
+        processes = [f"P{i+1}" for i in range(num_processes)]
+        resources = [f"R{j+1}" for j in range(num_resources)]
+
+        def rows(values):
+            return {p: dict(zip(resources, values[i * num_resources:(i + 1) * num_resources]))
+                    for i, p in enumerate(processes)}
+        detector = MultiInstanceDeadlockDetector(rows(allocation), rows(max_matrix), dict(zip(resources, available)),
+                                                 dict(zip(resources, total_resources)))
+    else:
+        shape = (num_processes, num_resources)
+        detector = VectorizedMultiInstanceDeadlockDetector.from_arrays(
+            np.asarray(allocation, dtype=np.int64).reshape(shape),
+            np.asarray(max_matrix, dtype=np.int64).reshape(shape),
+            np.asarray(available, dtype=np.int64))
+    has_deadlock, message = detector.detect_deadlock()
+    return has_deadlock, message, detector.safe_sequence
+
+
+def _run(function, args):
+    """Runs a task function, returning ('ok', value, elapsed) or ('error', message, elapsed)."""
+    start_time = time.perf_counter()
+    try:
+        outcome = ("ok", function(*args))
+    except ValueError as e:
+        outcome = ("error", str(e))
+    except Exception as e:
+        outcome = ("error", f"{type(e).__name__}: {e}")
+    return outcome + (time.perf_counter() - start_time,)
+
+
+def _run_in_child(conn):
+    """Child process entry point: receives (function, args), runs it and sends back the outcome of _run()."""
+    function, args = pickle.loads(conn.recv_bytes())
+    conn.send(_run(function, args))
+    conn.close()
+
+
+class BackgroundTask:
+    """Runs a task function in a separate process and reports back on the Tk thread.
+
+    Detection is pure Python, so a worker thread would still compete with Tk for the GIL and could not
+    be stopped; a process keeps the main loop free and can be terminated. The result is collected by
+    polling with window.after(), so on_done/on_error always run on the Tk thread. If the task takes
+    longer than PROGRESS_DELAY_MS, a small dialog with a progress bar and a Cancel button is shown.
+
+    Starting a process costs far more than detecting a small state, so a task whose size is at most
+    INLINE_MAX_SIZE runs on the Tk thread instead (still after the constructor returns, like a
+    process result).
+
+    Args:
+        window (tk.Toplevel): The window that owns the task; the progress dialog is its child.
+        function (callable): A module-level (picklable) function to run.
+        args (tuple): Arguments for the function (they are pickled to the child process).
+        on_done (callable): Called with (value, elapsed_seconds) when the task succeeds.
+        on_error (callable): Called with the error message when the task raises.
+        title (str): Title of the progress dialog.
+        size (int, optional): Size of the input (e.g., nodes or matrix cells), to run small tasks inline.
+    """
+    def __init__(self, window, function, args, on_done, on_error, title="Detecting Deadlock", size=None):
+        self.window = window
+        self.on_done = on_done
+        self.on_error = on_error
+        self.title = title
+        self.dialog = None
+        self.running = True
+        self._process = None
+        self._dialog_id = None
+
+        if size is not None and size <= INLINE_MAX_SIZE:
+            args = pickle.loads(pickle.dumps(args, protocol=pickle.HIGHEST_PROTOCOL))  # The same snapshot
+            self._poll_id = window.after(0, self._run_inline, function, args)
+            return
+
+        # The arguments are snapshotted here, so later edits in the GUI do not race with the worker.
+        # Sending them is left to a helper thread: the pipe only drains as fast as the child unpickles.
+        payload = pickle.dumps((function, args), protocol=pickle.HIGHEST_PROTOCOL)
+        # "spawn" everywhere: forking a process that runs Tk (and audio threads) is not safe.
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_run_in_child, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        threading.Thread(target=self._send, args=(payload,), daemon=True).start()
+        self._poll_id = window.after(POLL_MS, self._poll)
+        self._dialog_id = window.after(PROGRESS_DELAY_MS, self._show_progress)
+
+    def cancel(self):
+        """Stops the task; neither callback is called afterwards."""
+        if self.running:
+            if self._process is not None:
+                self._process.terminate()
+            self._finish()
+
+    def _run_inline(self, function, args):
+        """Runs a small task on the Tk thread and delivers its outcome."""
+        self._deliver(*_run(function, args))
+
+    def _send(self, payload):
+        """Writes the task to the child (helper thread)."""
+        try:
+            self._conn.send_bytes(payload)
+        except OSError:
+            pass  # Cancelled before the child read everything
+
+    def _poll(self):
+        """Delivers the result if it has arrived, otherwise checks again on the next tick."""
+        if not self.window.winfo_exists():
+            self.cancel()
+            return
+        if self._conn.poll():
+            try:
+                status, value, elapsed = self._conn.recv()
+            except EOFError:
+                status, value, elapsed = "error", "The detection process exited unexpectedly.", 0.0
+            self._deliver(status, value, elapsed)
+        elif not self._process.is_alive():
+            self._finish()
+            self.on_error("The detection process exited unexpectedly.")
+        else:
+            self._poll_id = self.window.after(POLL_MS, self._poll)
+
+    def _deliver(self, status, value, elapsed):
+        """Finishes the task and calls on_done or on_error."""
+        self._finish()
+        if status == "ok":
+            self.on_done(value, elapsed)
+        else:
+            self.on_error(value)
+
+    def _show_progress(self):
+        """Shows the progress dialog with a Cancel button."""
+        self._dialog_id = None
+        self.dialog = tk.Toplevel(self.window)
+        self.dialog.title(self.title)
+        self.dialog.resizable(False, False)
+        self.dialog.transient(self.window)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.cancel)
+        tk.Label(self.dialog, text="Analyzing the system state...", font=("Arial", 12)).pack(padx=20, pady=(15, 5))
+        progress = ttk.Progressbar(self.dialog, mode="indeterminate", length=260)
+        progress.pack(padx=20, pady=5)
+        progress.start(POLL_MS)
+        tk.Button(self.dialog, text="Cancel", font=("Arial", 11), command=self.cancel,
+                  bg="#FF9800", fg="white").pack(pady=(5, 15))
+
+    def _finish(self):
+        """Stops polling, closes the dialog and starts reaping the child process."""
+        self.running = False
+        self.window.after_cancel(self._poll_id)
+        if self._dialog_id is not None:
+            self.window.after_cancel(self._dialog_id)
+        if self.dialog is not None:
+            self.dialog.destroy()
+            self.dialog = None
+        if self._process is not None:
+            self._conn.close()
+            self._reap()
+
+    def _reap(self):
+        """Joins the child once it has exited, checking again on the next tick; never blocks the Tk thread."""
+        if not self._process.is_alive():
+            self._process.join()
+        elif self.window.winfo_exists():
+            self.window.after(POLL_MS, self._reap)
+        # Otherwise the window is gone; multiprocessing reaps the daemon child when it next starts one
@@ -0,0 +1,108 @@
+import os
+import time
+from collections import namedtuple
+from deadlock_algo import DeadlockDetector
+from multi_deadlock_algo import MultiInstanceDeadlockDetector
+
+# Structured outcome of one detection. Fields that do not apply to a mode are None.
+#   deadlocked (bool): True if a deadlock (single) or unsafe state (multi) was found; None on error.
+#   cycle (list): One deadlock cycle (single-instance).
+#   components (list): Every deadlocked set of nodes (single-instance).
+#   safe_sequence (list): The safe sequence found, possibly partial (multi-instance).
+#   unfinished (list): Processes that could not finish (multi-instance).
+#   elapsed (float): Detection time in seconds.
+#   error (str): The validation error message, if the state was invalid.
+DetectionResult = namedtuple("DetectionResult",
+                             ["deadlocked", "cycle", "components", "safe_sequence", "unfinished", "elapsed", "error"])
+
+
+def state_mode(state):
+    """Returns 'single' or 'multi' for a state dict.
+
+    A state is a dict that either names its mode explicitly ({"mode": "single"|"multi", ...}) or is
+    recognised by its keys: single-instance states have "resources_held"/"resources_wanted" and an
+    integer "total_resources"; multi-instance states have "allocation", "max" and a
+    "total_resources" dict ("available" is optional and derived when missing), or a "matrix_file"
+    (CSV/NPZ/.npy directory, see matrix_io.load_matrices) that each worker opens itself.
+    """
+    if not isinstance(state, dict):
+        raise ValueError(f"A state must be a dict, not {type(state).__name__}.")
+    mode = state.get("mode")
+    if mode in ("single", "multi"):
+        return mode
+    if mode is not None:
+        raise ValueError(f"Unknown detection mode: {mode}")
+    return "multi" if "allocation" in state or "matrix_file" in state else "single"
+
+
+def detect_state(state):
+    """Runs the matching detector on one state.
+
+    Args:
+        state (dict): A single- or multi-instance state (see state_mode).
+
+    Returns:
+        DetectionResult: The structured result.
+    """
+    start_time = time.perf_counter()
+    try:
+        if state_mode(state) == "single":
+            detector = DeadlockDetector(state.get("resources_held", {}), state.get("resources_wanted", {}),
+                                        state["total_resources"])
+            has_deadlock = detector.detect_cycle()
+            return DetectionResult(has_deadlock, detector.cycle, detector.deadlocked_components, None, None,
+                                   time.perf_counter() - start_time, None)
+
+        if "matrix_file" in state:
+            # Loaded (memory-mapped where possible) in this process, so large snapshots are never pickled.
+            from matrix_io import load_detector
+            detector = load_detector(state["matrix_file"])
+            has_deadlock, _ = detector.detect_deadlock()
+            return DetectionResult(has_deadlock, None, None, detector.safe_sequence, detector.unfinished,
+                                   time.perf_counter() - start_time, None)
+
+        allocation = state["allocation"]
+        total_resources = state["total_resources"]
+        available = state.get("available")
+        if available is None:
+            available = {}
+            for r in total_resources:
+                allocated = sum(allocation[p].get(r, 0) for p in allocation)
+                if allocated > total_resources[r]:
+                    raise ValueError(f"Invalid data: Allocation of {r} ({allocated}) exceeds Total ({total_resources[r]})")
+                available[r] = total_resources[r] - allocated
+        detector = MultiInstanceDeadlockDetector(allocation, state["max"], available, total_resources)
+        has_deadlock, _ = detector.detect_deadlock()
+        finished = set(detector.safe_sequence)
+        unfinished = [p for p in detector.processes if p not in finished]
+        return DetectionResult(has_deadlock, None, None, detector.safe_sequence, unfinished,
+                               time.perf_counter() - start_time, None)
+    except (ValueError, KeyError, TypeError, OSError) as e:
+        message = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+        return DetectionResult(None, None, None, None, None, time.perf_counter() - start_time, message)
+
+
+def detect_many(states, workers=None, chunksize=None):
+    """Detects deadlocks in many states, spreading them across a process pool.
+
+    States are sent to the workers in chunks to amortise pickling and scheduling overhead, and the
+    results come back in input order.
+
+    Args:
+        states (iterable): The states to check (see state_mode for the format).
+        workers (int, optional): Number of worker processes; defaults to the CPU count. Use 1 to run inline.
+        chunksize (int, optional): States per task; defaults to about four chunks per worker.
+
+    Returns:
+        list: One DetectionResult per state, in input order.
+    """
+    states = list(states)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(states) <= 1:
+        return [detect_state(state) for state in states]
+
+    from concurrent.futures import ProcessPoolExecutor  # Only pay for multiprocessing when it is used
+    if chunksize is None:
+        chunksize = max(1, len(states) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(detect_state, states, chunksize=chunksize))
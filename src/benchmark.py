@@ -0,0 +1,271 @@
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from deadlock_algo import DeadlockDetector
+from multi_deadlock_algo import MultiInstanceDeadlockDetector
+from incremental_deadlock_algo import IncrementalDeadlockDetector
+
+
+# --- Input families (each returns the state for roughly `size` nodes) ---
+
+def chain_state(size, seed=0):
+    """A long wait chain: P(i) holds R(i) and requests R(i+1). No deadlock."""
+    n = max(1, size // 2)
+    held = {f"P{i+1}": [f"R{i+1}"] for i in range(n)}
+    wanted = {f"P{i+1}": [f"R{i+2}"] if i + 1 < n else [] for i in range(n)}
+    return held, wanted, n
+
+
+def ring_state(size, seed=0):
+    """One big ring: the chain above with the last process requesting R1. Deadlocked."""
+    held, wanted, n = chain_state(size)
+    wanted[f"P{n}"] = ["R1"] if n > 1 else []
+    return held, wanted, n
+
+
+def random_sparse_state(size, seed=0):
+    """A random sparse RAG: most resources are held, and each process requests one or two resources."""
+    rng = random.Random(seed)
+    n = max(1, size // 2)
+    held = {f"P{i+1}": [] for i in range(n)}
+    wanted = {f"P{i+1}": [] for i in range(n)}
+    holder = {}
+    for r in range(n):
+        if rng.random() < 0.7:
+            p = rng.randrange(n)
+            held[f"P{p+1}"].append(f"R{r+1}")
+            holder[r] = p
+    for p in range(n):
+        for r in {rng.randrange(n) for _ in range(rng.choice((1, 2)))}:
+            if holder.get(r) != p:
+                wanted[f"P{p+1}"].append(f"R{r+1}")
+    return held, wanted, n
+
+
+# Random bytes are mapped to Allocation (0-2) and Max (Allocation + 0-3) cells by translate tables
+ALLOCATION_TABLE = bytes(b % 3 for b in range(256))
+MAX_TABLE = bytes(b % 3 + b // 3 % 4 for b in range(256))
+
+
+def dense_bankers_state(size, seed=0, num_resources=20):
+    """A dense Banker's state with `size` processes over a fixed number of resources.
+
+    The matrices are generated in bulk as flat row-major byte strings (one byte per cell), so even
+    10^6 processes take a fraction of a second and 20 MB per matrix; each benchmark converts them
+    to the form its detector takes in its (timed) setup.
+
+    Returns:
+        tuple: (allocation, max_matrix, available, num_processes, num_resources); the matrices are
+        bytes and available is a list.
+    """
+    rng = random.Random(seed)
+    num_processes = max(1, size)
+    cells = rng.randbytes(num_processes * num_resources)
+    allocation = cells.translate(ALLOCATION_TABLE)
+    max_matrix = cells.translate(MAX_TABLE)
+    available = [rng.randint(1, 3) for _ in range(num_resources)]  # Total = allocated + 1-3
+    return allocation, max_matrix, available, num_processes, num_resources
+
+
+SINGLE_FAMILIES = {"chain": chain_state, "ring": ring_state, "random_sparse": random_sparse_state}
+MULTI_FAMILIES = {"dense_bankers": dense_bankers_state}
+
+
+# --- Benchmarks: setup(state) -> callable to time ---
+
+def bench_detect_deadlock(state):
+    held, wanted, n = state
+    return lambda: DeadlockDetector(held, wanted, n).detect_deadlock()
+
+
+def bench_build_rag(state):
+    held, wanted, n = state
+    detector = DeadlockDetector(held, wanted, n)
+    return detector.build_rag
+
+
+def bench_incremental(state):
+    held, wanted, n = state
+    return lambda: IncrementalDeadlockDetector(held, wanted).has_deadlock()
+
+
+def bench_build_wait_for_graph(state):
+    from wait_for_graph import build_wait_for_graph
+    held, wanted, n = state
+    return lambda: build_wait_for_graph(held, wanted)
+
+
+def bench_compute_safe_sequence(state):
+    from visualization import compute_safe_sequence
+    held, wanted, n = state
+    processes = list(held)
+    return lambda: compute_safe_sequence(processes, held, wanted, n)
+
+
+def bench_multi_detect(state):
+    allocation, max_matrix, available, n, m = state
+    processes = [f"P{i+1}" for i in range(n)]
+    resources = [f"R{j+1}" for j in range(m)]
+    allocation = {p: dict(zip(resources, allocation[i * m:(i + 1) * m])) for i, p in enumerate(processes)}
+    max_matrix = {p: dict(zip(resources, max_matrix[i * m:(i + 1) * m])) for i, p in enumerate(processes)}
+    total = {r: available[j] + sum(state[0][j::m]) for j, r in enumerate(resources)}
+    available = dict(zip(resources, available))
+    return lambda: MultiInstanceDeadlockDetector(allocation, max_matrix, available, total).detect_deadlock()
+
+
+def bench_multi_detect_numpy(state):
+    import numpy as np
+    from multi_deadlock_numpy import VectorizedMultiInstanceDeadlockDetector
+    allocation, max_matrix, available, n, m = state
+    allocation = np.frombuffer(allocation, dtype=np.uint8).reshape(n, m).astype(np.int64)
+    max_matrix = np.frombuffer(max_matrix, dtype=np.uint8).reshape(n, m).astype(np.int64)
+    available = np.array(available, dtype=np.int64)
+    return lambda: VectorizedMultiInstanceDeadlockDetector.from_arrays(allocation, max_matrix,
+                                                                       available).detect_deadlock()
+
+
+BENCHMARKS = {
+    "detect_deadlock": (bench_detect_deadlock, SINGLE_FAMILIES),
+    "build_rag": (bench_build_rag, SINGLE_FAMILIES),
+    "incremental": (bench_incremental, SINGLE_FAMILIES),
+    "build_wait_for_graph": (bench_build_wait_for_graph, SINGLE_FAMILIES),
+    "compute_safe_sequence": (bench_compute_safe_sequence, SINGLE_FAMILIES),
+    "multi_detect_deadlock": (bench_multi_detect, MULTI_FAMILIES),
+    "multi_detect_numpy": (bench_multi_detect_numpy, MULTI_FAMILIES),
+}
+
+
+def measure(run, repeats):
+    """Times a callable (best of `repeats`) and then measures its peak traced memory in one more run.
+
+    Returns:
+        tuple: (seconds, peak_bytes)
+    """
+    best = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(benchmarks, sizes, time_limit, repeats, seed=0, log=None):
+    """Runs every selected benchmark over every family and size.
+
+    The time limit covers building the input and the benchmark's setup as well as the timed run.
+    Sizes of a (benchmark, family) pair stop growing once one size takes longer than time_limit, or
+    before a size that would exceed it when extrapolated linearly from the last size (a lower bound
+    for the superlinear baselines), so the largest default size never builds an input it cannot use.
+
+    Returns:
+        list: One result dict per (benchmark, family, size).
+    """
+    results = []
+    for name in benchmarks:
+        setup, families = BENCHMARKS[name]
+        for family, make_state in families.items():
+            skip_reason = None
+            previous = None  # (size, seconds including setup) of the last size that ran
+            for size in sizes:
+                result = {"benchmark": name, "family": family, "size": size}
+                if skip_reason is None and previous is not None and previous[1] * size / previous[0] > time_limit:
+                    skip_reason = f"projected to exceed {time_limit} s"
+                if skip_reason is not None:
+                    result["skipped"] = skip_reason
+                    results.append(result)
+                    continue
+                start_time = time.perf_counter()
+                try:
+                    run = setup(make_state(size, seed))
+                except ImportError as e:
+                    result["skipped"] = f"missing dependency: {e.name}"
+                    results.append(result)
+                    break
+                setup_seconds = time.perf_counter() - start_time
+                seconds, peak = measure(run, repeats if size <= 10000 else 1)
+                result["setup_seconds"] = setup_seconds
+                result["seconds"] = seconds
+                result["peak_bytes"] = peak
+                results.append(result)
+                del run  # Free this size's input before building the next one
+                if log:
+                    log(f"{name:<24} {family:<14} {size:>8}  {seconds:9.4f} s  {peak / 1e6:9.2f} MB"
+                        f"  (setup {setup_seconds:.2f} s)")
+                if setup_seconds + seconds > time_limit:
+                    skip_reason = f"previous size exceeded {time_limit} s"
+                previous = (size, setup_seconds + seconds)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Lists results that are more than `tolerance` times slower than the baseline run."""
+    previous = {(r["benchmark"], r["family"], r["size"]): r for r in baseline["results"] if "seconds" in r}
+    regressions = []
+    for r in results:
+        old = previous.get((r["benchmark"], r["family"], r["size"]))
+        # Very fast runs are dominated by timer noise, so they are not compared.
+        if old and "seconds" in r and old["seconds"] >= 0.001 and r["seconds"] > old["seconds"] * tolerance:
+            regressions.append(f"{r['benchmark']}/{r['family']}/{r['size']}: "
+                               f"{old['seconds']:.4f} s -> {r['seconds']:.4f} s")
+    return regressions
+
+
+def main(argv=None):
+    """Command-line entry point: runs the suite and writes the results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the deadlock detectors over scaling input families")
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=sorted(BENCHMARKS))
+    parser.add_argument("--min-size", type=int, default=10, help="Smallest input size (nodes)")
+    parser.add_argument("--max-size", type=int, default=10**6, help="Largest input size (nodes)")
+    parser.add_argument("--time-limit", type=float, default=10.0,
+                        help="Stop growing a benchmark once one size, setup included, takes longer than this (seconds)")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats for sizes up to 10,000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="With --baseline, fail if a result is this many times slower")
+    args = parser.parse_args(argv)
+
+    sizes = []
+    size = args.min_size
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+
+    results = run_suite(args.benchmarks, sizes, args.time_limit, args.repeats, args.seed,
+                        log=lambda line: print(line, file=sys.stderr))
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": sizes,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import tkinter as tk
+from collections import OrderedDict
+
+GRADIENT_TAG = "gradient"
+GRADIENT_STEPS = 100  # Color bands per gradient
+SIZE_BUCKET = 32  # Gradient images are rendered for sizes rounded up to this many pixels
+MAX_CACHED_GRADIENTS = 8  # A full-screen image takes a few MB, so only the recent sizes are kept
+FRAME_MS = 16  # Resize handlers run at most once per frame
+
+_gradients = OrderedDict()  # (interpreter, color_start, color_end, width, height) -> tk.PhotoImage
+
+
+def gradient_image(master, color_start, color_end, width, height):
+    """Returns a cached image of a vertical gradient at least width x height pixels large.
+
+    The image is painted once per size bucket, one `put` per color band, and reused by every canvas
+    of that size; a canvas that is slightly smaller than the bucket simply clips the bottom edge.
+
+    Args:
+        master (tk.Widget): Any widget of the application (images belong to its Tk interpreter).
+        color_start (str): Top color as '#rrggbb'.
+        color_end (str): Bottom color as '#rrggbb'.
+        width (int): Minimum width in pixels.
+        height (int): Minimum height in pixels.
+
+    Returns:
+        tk.PhotoImage: The gradient image. It may be evicted from the cache later, so whoever displays it
+        must keep a reference (draw_gradient does).
+    """
+    width = max(1, -(-int(width) // SIZE_BUCKET)) * SIZE_BUCKET
+    height = max(1, -(-int(height) // SIZE_BUCKET)) * SIZE_BUCKET
+    key = (master.tk, color_start, color_end, width, height)
+    image = _gradients.get(key)
+    if image is not None:
+        _gradients.move_to_end(key)
+        return image
+
+    r1, g1, b1 = (int(color_start[i:i + 2], 16) for i in (1, 3, 5))
+    r2, g2, b2 = (int(color_end[i:i + 2], 16) for i in (1, 3, 5))
+    image = tk.PhotoImage(master=master, width=width, height=height)
+    for i in range(GRADIENT_STEPS):
+        r = int(r1 + (r2 - r1) * i / GRADIENT_STEPS)
+        g = int(g1 + (g2 - g1) * i / GRADIENT_STEPS)
+        b = int(b1 + (b2 - b1) * i / GRADIENT_STEPS)
+        y_start = i * height // GRADIENT_STEPS
+        y_end = (i + 1) * height // GRADIENT_STEPS
+        if y_end > y_start:
+            image.put(f"#{r:02x}{g:02x}{b:02x}", to=(0, y_start, width, y_end))
+    _gradients[key] = image
+    if len(_gradients) > MAX_CACHED_GRADIENTS:
+        _gradients.popitem(last=False)
+    return image
+
+
+def draw_gradient(canvas, color_start, color_end, width, height):
+    """Shows a gradient background on a canvas as a single image item.
+
+    A canvas that already shows a gradient gets its image swapped instead of a new item, so the
+    number of canvas items stays the same however often the window is resized.
+
+    Returns:
+        int: The canvas item of the gradient.
+    """
+    image = gradient_image(canvas, color_start, color_end, width, height)
+    canvas.gradient_image = image  # Tk drops an image as soon as Python no longer references it
+    items = canvas.find_withtag(GRADIENT_TAG)
+    if items:
+        canvas.itemconfigure(items[0], image=image)
+        return items[0]
+    item = canvas.create_image(0, 0, anchor="nw", image=image, tags=GRADIENT_TAG)
+    canvas.tag_lower(item)
+    return item
+
+
+class ResizeCoalescer:
+    """Runs a resize handler at most once per frame for a burst of <Configure> events.
+
+    Dragging a window edge fires <Configure> many times per frame, and a binding on a window also
+    receives the <Configure> events of every child widget. This class only looks at the events of
+    the widget itself, waits FRAME_MS after the first one, and then calls the handler once with the
+    latest event if the size actually changed.
+
+    Args:
+        widget (tk.Widget): The widget whose size is watched.
+        handler (callable): Called with the latest <Configure> event.
+        delay_ms (int): How long to collect events before relaying out.
+    """
+    def __init__(self, widget, handler, delay_ms=FRAME_MS):
+        self.widget = widget
+        self.handler = handler
+        self.delay_ms = delay_ms
+        self.pending = None
+        self.event = None
+        self.size = None
+        widget.bind("<Configure>", self._on_configure, add="+")
+
+    def _on_configure(self, event):
+        if event.widget is not self.widget:
+            return
+        self.event = event
+        if self.pending is None:
+            self.pending = self.widget.after(self.delay_ms, self._run)
+
+    def _run(self):
+        self.pending = None
+        size = (self.event.width, self.event.height)
+        if size != self.size:  # Moving a window also fires <Configure>
+            self.size = size
+            self.handler(self.event)
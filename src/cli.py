@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import argparse
+
+# Only the detection modules are imported by these commands (never Tkinter, pygame or matplotlib),
+# so scripted and CI runs start in milliseconds.
+
+
+def load_states(path):
+    """Loads the states stored in a state file.
+
+    A state file holds one state dict (see batch_detection.state_mode) or a JSON list of them. Matrix
+    files (CSV, NPZ or a directory of .npy files, see matrix_io) become a single multi-instance state
+    that is loaded by the detecting process.
+
+    Returns:
+        list: The states in the file.
+
+    Raises:
+        ValueError: If the file is not valid JSON or holds something other than state objects.
+    """
+    if path != "-" and (path.lower().endswith((".csv", ".npz", ".npy")) or os.path.isdir(path)):
+        return [{"mode": "multi", "matrix_file": path}]
+    if path == "-":
+        data = json.load(sys.stdin)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    states = data if isinstance(data, list) else [data]
+    for i, state in enumerate(states):
+        if not isinstance(state, dict):
+            where = f"Item {i}" if isinstance(data, list) else "The file"
+            raise ValueError(f"{where} is not a state object (got {type(state).__name__}).")
+    return states
+
+
+def format_result(result):
+    """Formats a DetectionResult the same way the GUI messages read."""
+    if result.error is not None:
+        return f"Error: {result.error}"
+    if result.cycle is not None or result.components is not None:
+        if not result.deadlocked:
+            return "No deadlock detected in the system."
+        message = f"A deadlock has been detected involving: {result.cycle}"
+        if len(result.components) > 1:
+            message += f"\n{len(result.components)} deadlocked sets found: {result.components}"
+        return message
+    if not result.deadlocked:
+        return f"Safe sequence: {result.safe_sequence}"
+    return f"No safe sequence found. System MAY be in an unsafe state or deadlocked. Unfinished processes: {result.unfinished}"
+
+
+def detect_command(args):
+    """Runs detection on every state in the given files.
+
+    Returns:
+        int: 0 if every state is deadlock-free, 1 if any deadlock/unsafe state was found, 2 on invalid input.
+    """
+    from batch_detection import detect_many
+
+    labels = []
+    states = []
+    for path in args.state_files:
+        try:
+            file_states = load_states(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: Error: {e}", file=sys.stderr)
+            return 2
+        for i, state in enumerate(file_states):
+            labels.append(path if len(file_states) == 1 else f"{path}[{i}]")
+            states.append(state)
+
+    results = detect_many(states, workers=args.workers)
+    for label, result in zip(labels, results):
+        if args.json:
+            print(json.dumps(dict(result._asdict(), source=label)))
+        else:
+            prefix = f"{label}: " if len(results) > 1 else ""
+            print(prefix + format_result(result) + f" ({result.elapsed:.3f} s)")
+
+    if any(result.error is not None for result in results):
+        return 2
+    return 1 if any(result.deadlocked for result in results) else 0
+
+
+def export_command(args):
+    """Renders the diagram of every state in the given files to an image file.
+
+    Files are named after their state file (with -N appended for each state of a list) and written to
+    the output directory.
+
+    Returns:
+        int: 0 if every diagram was written, 2 if any state could not be loaded or rendered.
+    """
+    from diagram_export import export_many
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    labels = []
+    jobs = []
+    used_names = set()
+    for path in args.state_files:
+        try:
+            file_states = load_states(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: Error: {e}", file=sys.stderr)
+            return 2
+        stem = "stdin" if path == "-" else os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+        for i, state in enumerate(file_states):
+            name = stem if len(file_states) == 1 else f"{stem}-{i}"
+            unique_name, n = name, 2
+            while unique_name in used_names:  # Same stem in different directories
+                unique_name, n = f"{name}_{n}", n + 1
+            used_names.add(unique_name)
+            labels.append(path if len(file_states) == 1 else f"{path}[{i}]")
+            jobs.append((state, os.path.join(args.output_dir, f"{unique_name}.{args.format}")))
+
+    results = export_many(jobs, workers=args.workers, detail=args.detail, dpi=args.dpi)
+    for label, result in zip(labels, results):
+        if result.error is not None:
+            print(f"{label}: Error: {result.error}", file=sys.stderr)
+        else:
+            print(f"{label} -> {result.output_path} ({result.elapsed:.3f} s)")
+    return 2 if any(result.error is not None for result in results) else 0
+
+
+def main(argv=None):
+    """Entry point for the headless subcommands.
+
+    Usage:
+        python main.py detect state.json [more.json | matrices.npz ...] [--json] [--workers N]
+        python main.py export state.json [more.json ...] [--output-dir DIR] [--format png|svg] [--workers N]
+        python main.py monitor events.jsonl [--follow]
+    """
+    parser = argparse.ArgumentParser(prog="main.py", description="Headless deadlock detection")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    detect_parser = subcommands.add_parser("detect", help="Detect deadlocks in saved state files")
+    detect_parser.add_argument("state_files", nargs="+",
+                               help="JSON state file(s), '-' for stdin, or Banker's matrices as CSV/NPZ/.npy directory")
+    detect_parser.add_argument("--json", action="store_true", help="Print one JSON result per state")
+    detect_parser.add_argument("--workers", type=int, default=1,
+                               help="Worker processes for many states (default: 1, run inline)")
+    detect_parser.set_defaults(handler=detect_command)
+
+    export_parser = subcommands.add_parser("export", help="Render RAG/WFG diagrams of saved states to PNG/SVG")
+    export_parser.add_argument("state_files", nargs="+",
+                               help="JSON state file(s), '-' for stdin, or Banker's matrices as CSV/NPZ/.npy directory")
+    export_parser.add_argument("--output-dir", default=".", help="Directory for the image files (default: .)")
+    export_parser.add_argument("--format", choices=("png", "svg"), default="png", help="Image format (default: png)")
+    export_parser.add_argument("--workers", type=int, default=None,
+                               help="Worker processes (default: one per CPU; 1 runs inline)")
+    export_parser.add_argument("--detail", choices=("auto", "full", "lod"), default="auto",
+                               help="Draw every node, the level-of-detail view, or pick by graph size (default: auto)")
+    export_parser.add_argument("--dpi", type=int, default=100, help="Resolution of PNG files (default: 100)")
+    export_parser.set_defaults(handler=export_command)
+
+    # Listed for --help only; the monitor parses its own arguments.
+    subcommands.add_parser("monitor", help="Watch a JSON-lines event stream for deadlocks", add_help=False)
+
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "monitor":
+        from monitor import main as monitor_main
+        return monitor_main(argv[1:])
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
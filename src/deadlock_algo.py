@@ -1,6 +1,13 @@
+from rag_graph import RAGGraph
+from wait_for_graph import WaitForGraph
+
+
 class DeadlockDetector:
     """A class to detect deadlocks in a system with single-instance resources using a Resource Allocation Graph (RAG).
 
+    The state is interned into an integer-indexed CSR graph (see rag_graph.RAGGraph) once, and all
+    detection runs on that graph. Use from_arrays() to skip the string layer entirely.
+
     Args:
         resources_held (dict): A dictionary mapping processes (e.g., 'P1') to a list of resources they hold (e.g., ['R1']).
         resources_wanted (dict): A dictionary mapping processes to a list of resources they are requesting.
@@ -16,37 +23,38 @@ class DeadlockDetector:
         self.resources_wanted = resources_wanted
         self.total_resources = total_resources
         self.cycle = None  # To store the detected cycle
-        self._validate_input()
-
-    def _validate_input(self):
-        """Validates the input data for consistency and correctness."""
-        valid_resources = {f"R{i+1}" for i in range(self.total_resources)}
-        # Validate resources_held
-        for process, resources in self.resources_held.items():
-            if not process.startswith("P"):
-                raise ValueError(f"Invalid process name: {process}")
-            for resource in resources:
-                if resource not in valid_resources:
-                    raise ValueError(f"Invalid resource {resource} in resources_held for {process}")
-        # Validate resources_wanted
-        for process, resources in self.resources_wanted.items():
-            if not process.startswith("P"):
-                raise ValueError(f"Invalid process name: {process}")
-            for resource in resources:
-                if resource not in valid_resources:
-                    raise ValueError(f"Invalid resource {resource} in resources_wanted for {process}")
-        # Check for duplicate allocations
-        allocated_resources = set()
-        for process, resources in self.resources_held.items():
-            for resource in resources:
-                if resource in allocated_resources:
-                    raise ValueError(f"Resource {resource} is allocated to multiple processes")
-                allocated_resources.add(resource)
-        # Check for invalid requests (requesting a resource that is already held)
-        for process in self.resources_wanted:
-            for resource in self.resources_wanted[process]:
-                if resource in self.resources_held.get(process, []):
-                    raise ValueError(f"Invalid state: {process} requests {resource} which it already holds.")
+        self.deadlocked_components = []  # Every deadlocked set found by the last detection
+        self.graph = RAGGraph.from_state(resources_held, resources_wanted, total_resources)  # Also validates the input
+
+    @classmethod
+    def from_arrays(cls, num_processes, num_resources, alloc_resources, alloc_processes,
+                    request_processes, request_resources, process_labels=None, resource_labels=None):
+        """Creates a detector directly from integer edge arrays (0-based indices).
+
+        Args:
+            num_processes (int): Number of processes.
+            num_resources (int): Number of resources.
+            alloc_resources (sequence of int): Resource of every allocation edge.
+            alloc_processes (sequence of int): Holding process of every allocation edge.
+            request_processes (sequence of int): Requesting process of every request edge.
+            request_resources (sequence of int): Requested resource of every request edge.
+            process_labels (list, optional): Process names used in messages.
+            resource_labels (list, optional): Resource names used in messages.
+
+        Returns:
+            DeadlockDetector: A detector whose resources_held/resources_wanted are None.
+        """
+        if num_resources <= 0:
+            raise ValueError("Total resources must be positive.")
+        detector = cls.__new__(cls)
+        detector.resources_held = None
+        detector.resources_wanted = None
+        detector.total_resources = num_resources
+        detector.cycle = None
+        detector.deadlocked_components = []
+        detector.graph = RAGGraph(num_processes, num_resources, alloc_resources, alloc_processes,
+                                  request_processes, request_resources, process_labels, resource_labels)
+        return detector
 
     def build_rag(self):
         """Builds a Resource Allocation Graph (RAG) as an adjacency list.
@@ -54,66 +62,56 @@ class DeadlockDetector:
         Returns:
             dict: A graph where keys are nodes (processes or resources) and values are lists of neighboring nodes.
         """
-        graph = {}
-        # Initialize nodes for processes
-        for process in self.resources_held:
-            graph[process] = []
-        # Initialize nodes for resources
-        for i in range(self.total_resources):
-            resource = f"R{i+1}"
-            graph[resource] = []
-        # Add edges: Resource -> Process (allocation)
-        for process, resources in self.resources_held.items():
-            for resource in resources:
-                if resource in graph:
-                    graph[resource].append(process)
-        # Add edges: Process -> Resource (request)
-        for process, resources in self.resources_wanted.items():
-            for resource in resources:
-                if resource in graph:
-                    graph[process].append(resource)
-        return graph
-
-    def detect_cycle(self, graph):
+        return self.graph.to_adjacency()
+
+    def find_deadlocked_components(self, graph=None):
+        """Finds every deadlocked set of nodes in the RAG in a single linear pass.
+
+        Uses an iterative (explicit-stack) version of Tarjan's strongly connected components
+        algorithm, so long wait chains do not hit Python's recursion limit. Every strongly
+        connected component with more than one node contains a cycle and is therefore deadlocked.
+
+        Args:
+            graph (RAGGraph, optional): The graph to search; defaults to this detector's graph.
+
+        Returns:
+            list: A list of deadlocked components, each a list of node labels.
+        """
+        graph = self._as_graph(graph)
+        return [[graph.label(n) for n in component] for component in graph.strongly_connected_components()]
+
+    def build_wait_for_graph(self, graph=None):
+        """Projects the RAG onto its processes (P waits for Q if P requests a resource Q holds).
+
+        Args:
+            graph (RAGGraph or dict, optional): The RAG; defaults to this detector's graph.
+
+        Returns:
+            WaitForGraph: The process-only Wait-For Graph.
+        """
+        return WaitForGraph(self._as_graph(graph))
+
+    def detect_cycle(self, graph=None):
         """Detects if there is a cycle in the RAG, indicating a deadlock.
 
+        With single-instance resources a RAG cycle is exactly a cycle of the Wait-For Graph, so the
+        search runs on the smaller process-only graph and the result is expanded back to RAG nodes.
+
         Args:
-            graph (dict): The RAG as an adjacency list.
+            graph (RAGGraph or dict, optional): The RAG; defaults to this detector's graph.
 
         Returns:
             bool: True if a cycle is found, False otherwise.
         """
-        visited = set()
-        recursion_stack = set()
-        parent = {}  # To reconstruct the cycle
-
-        def dfs(node):
-            visited.add(node)
-            recursion_stack.add(node)
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    parent[neighbor] = node
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in recursion_stack:
-                    # Found a cycle, reconstruct it
-                    cycle = []
-                    current = node
-                    while current != neighbor:
-                        cycle.append(current)
-                        current = parent[current]
-                    cycle.append(neighbor)
-                    cycle.append(node)  # Close the cycle
-                    self.cycle = cycle
-                    return True
-            recursion_stack.remove(node)
-            return False
-
+        graph = self._as_graph(graph)
+        wfg = WaitForGraph(graph)
+        components = wfg.strongly_connected_components()
+        self.deadlocked_components = [[graph.label(n) for n in wfg.expand_component(component)]
+                                      for component in components]
         self.cycle = None
-        for node in graph:
-            if node.startswith("P") and node not in visited:
-                if dfs(node):
-                    return True
+        if components:
+            self.cycle = [graph.label(n) for n in wfg.extract_cycle(components[0])]
+            return True
         return False
 
     def detect_deadlock(self):
@@ -122,15 +120,41 @@ class DeadlockDetector:
         Returns:
             tuple: (bool, str) where the bool indicates if a deadlock was found, and the str is a message.
         """
-        if not self.resources_held and not self.resources_wanted:
+        if self.resources_held is not None:
+            nothing_held = not self.resources_held
+            nothing_wanted = not self.resources_wanted
+        else:
+            nothing_held = self.graph.num_allocations == 0
+            nothing_wanted = self.graph.num_requests == 0
+        if nothing_held and nothing_wanted:
             return False, "Please allocate and request resources before detecting deadlock."
-        if not self.resources_held:
+        if nothing_held:
             return False, "No resources are allocated. Please allocate resources before detecting deadlock."
-        if not self.resources_wanted:
+        if nothing_wanted:
             return False, "No resources are requested. Please request resources before detecting deadlock."
-        rag = self.build_rag()
-        has_deadlock = self.detect_cycle(rag)
+        has_deadlock = self.detect_cycle()
         if has_deadlock:
-            return True, f"A deadlock has been detected involving: {self.cycle}"
+            message = f"A deadlock has been detected involving: {self.cycle}"
+            if len(self.deadlocked_components) > 1:
+                message += f"\n{len(self.deadlocked_components)} deadlocked sets found: {self.deadlocked_components}"
+            return True, message
         else:
-            return False, "No deadlock detected in the system."
\ No newline at end of file
+            return False, "No deadlock detected in the system."
+
+    def _as_graph(self, graph):
+        """Returns a RAGGraph for the given graph, interning a dict adjacency list if needed."""
+        if graph is None:
+            return self.graph
+        if isinstance(graph, RAGGraph):
+            return graph
+        # A labelled adjacency list: split the edges back into allocations and requests.
+        held = {node: [] for node in graph if node.startswith("P")}
+        wanted = {node: [] for node in held}
+        for node, neighbors in graph.items():
+            for neighbor in neighbors:
+                if node.startswith("P"):
+                    wanted[node].append(neighbor)
+                else:
+                    held.setdefault(neighbor, []).append(node)
+                    wanted.setdefault(neighbor, [])
+        return RAGGraph.from_state(held, wanted, self.total_resources)
@@ -0,0 +1,138 @@
+import os
+import time
+from collections import namedtuple
+from functools import partial
+
+# Outcome of one export: the file written, render time in seconds, and the error message (None on success).
+ExportResult = namedtuple("ExportResult", ["output_path", "elapsed", "error"])
+
+
+def render_state(state, output_path, detail="auto", dpi=100):
+    """Detects deadlocks in one state and renders its diagram to a file, without any GUI backend.
+
+    Single-instance states get the RAG and Wait-For Graph figure of visualize_rag() with the deadlock
+    cycle highlighted; multi-instance states (including matrix files) get the figure of
+    visualize_multi_rag() with the safe sequence or the unfinished processes.
+
+    Args:
+        state (dict): A single- or multi-instance state (see batch_detection.state_mode).
+        output_path (str): The image file; the format follows the extension (.png, .svg, ...).
+        detail (str): "auto", "full" or "lod" (see visualize_rag).
+        dpi (int): Resolution of raster formats.
+
+    Raises:
+        ValueError: If the state is invalid.
+    """
+    from batch_detection import detect_state, state_mode
+    result = detect_state(state)
+    if result.error is not None:
+        raise ValueError(result.error)
+
+    if state_mode(state) == "single":
+        from rag_graph import RAGGraph
+        from graph_layout import BipartiteLayout, CircularLayout
+        from visualization import RAGView
+        resources_held = state.get("resources_held", {})
+        resources_wanted = state.get("resources_wanted", {})
+        total_resources = state["total_resources"]
+        graph = RAGGraph.from_state(resources_held, resources_wanted, total_resources)
+        # Fresh layouts: every file is laid out on its own, whatever the worker rendered before
+        view = RAGView(rag_layout=BipartiteLayout(scale=2.0), wfg_layout=CircularLayout(scale=1.0))
+        view.update(graph, resources_held, resources_wanted, result.cycle, total_resources, detail)
+    else:
+        from graph_lod import LOD_THRESHOLD
+        from multi_visualization import MultiRAGView
+        processes, resources, allocation_rows, need_rows = _multi_rows(state)
+        full = detail == "full" or (detail == "auto" and len(processes) + len(resources) <= LOD_THRESHOLD)
+        rag, flat_allocation, need = multi_diagram_inputs(processes, resources, allocation_rows, need_rows, full)
+        view = MultiRAGView()
+        if result.deadlocked:
+            view.update(rag, flat_allocation, need, [], result.unfinished, detail, processes)
+        else:
+            view.update(rag, flat_allocation, need, result.safe_sequence, None, detail, processes)
+    view.save(output_path, dpi=dpi)
+
+
+def multi_diagram_inputs(processes, resources, allocation_rows, need_rows, full=True):
+    """Builds the rag/flat_allocation/need arguments of visualize_multi_rag from matrix rows.
+
+    Args:
+        processes (list): Process names.
+        resources (list): Resource names.
+        allocation_rows (iterable): Allocation row (a sequence of ints) of every process.
+        need_rows (iterable): Need row of every process.
+        full (bool): Also build flat_allocation and need; the level-of-detail view only needs the rag.
+
+    Returns:
+        tuple: (rag, flat_allocation, need); the last two are None unless full.
+    """
+    rag = {p: [] for p in processes}
+    rag.update({r: [] for r in resources})
+    flat_allocation = {} if full else None
+    need = {} if full else None
+    for p, allocation_row, need_row in zip(processes, allocation_rows, need_rows):
+        allocation_row = list(allocation_row)
+        need_row = list(need_row)
+        rag[p] = [r for r, n in zip(resources, need_row) if n > 0]  # Request edges
+        for r, n in zip(resources, allocation_row):
+            if n > 0:
+                rag[r].append(p)  # Allocation edges
+        if full:
+            need[p] = dict(zip(resources, need_row))
+            flat_allocation[p] = [r for r, n in zip(resources, allocation_row) for _ in range(n)]
+    return rag, flat_allocation, need
+
+
+def export_many(jobs, workers=None, chunksize=1, detail="auto", dpi=100):
+    """Renders many diagrams, spreading them across a process pool.
+
+    Args:
+        jobs (iterable): (state, output_path) pairs.
+        workers (int, optional): Number of worker processes; defaults to the CPU count. Use 1 to run inline.
+        chunksize (int): Jobs per task. Renders are slow and uneven, so one per task balances best.
+        detail (str): "auto", "full" or "lod" (see visualize_rag).
+        dpi (int): Resolution of raster formats.
+
+    Returns:
+        list: One ExportResult per job, in input order.
+    """
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    export = partial(_export_job, detail=detail, dpi=dpi)
+    if workers == 1 or len(jobs) <= 1:
+        return [export(job) for job in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor  # Only pay for multiprocessing when it is used
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(export, jobs, chunksize=chunksize))
+
+
+def _export_job(job, detail, dpi):
+    """Worker entry point: renders one (state, output_path) job and reports instead of raising."""
+    state, output_path = job
+    start_time = time.perf_counter()
+    try:
+        render_state(state, output_path, detail, dpi)
+    except (ValueError, TypeError, OSError) as e:  # detect_state() already reported missing fields
+        return ExportResult(output_path, time.perf_counter() - start_time, str(e))
+    return ExportResult(output_path, time.perf_counter() - start_time, None)
+
+
+def _multi_rows(state):
+    """Returns (processes, resources, allocation_rows, need_rows) of a multi-instance state."""
+    if "matrix_file" in state:
+        from matrix_io import load_matrices
+        matrices = load_matrices(state["matrix_file"])
+        num_processes, num_resources = matrices.allocation.shape
+        processes = matrices.processes or [f"P{i+1}" for i in range(num_processes)]
+        resources = matrices.resources or [f"R{j+1}" for j in range(num_resources)]
+        allocation_rows = (row.tolist() for row in matrices.allocation)
+        need_rows = ((m - a).tolist() for a, m in zip(matrices.allocation, matrices.max))
+        return processes, resources, allocation_rows, need_rows
+    allocation = state["allocation"]
+    max_matrix = state["max"]
+    processes = list(allocation)
+    resources = list(state["total_resources"])
+    allocation_rows = [[allocation[p].get(r, 0) for r in resources] for p in processes]
+    need_rows = [[max_matrix[p].get(r, 0) - allocation[p].get(r, 0) for r in resources] for p in processes]
+    return processes, resources, allocation_rows, need_rows
@@ -0,0 +1,163 @@
+class EdgeList:
+    """A keyed, virtualized list of text rows on a canvas, for the allocation/request side panels.
+
+    Rows are stored by key (e.g., a (process, resource) edge) in a linked list, so adding or removing
+    one edge only touches that edge and its neighbours instead of rebuilding or shifting the panel.
+    Only the rows that fit in the viewport are drawn, as a fixed pool of canvas text items that is
+    relabelled when the list scrolls or changes (the same scheme as matrix_grid.MatrixGrid), so the
+    work per change is bounded by the number of visible rows however many edges there are.
+
+    Args:
+        canvas (tk.Canvas): The canvas to draw on; items above `top` (e.g., a heading) are left alone.
+        scrollbar (tk.Scrollbar): The vertical scrollbar of the canvas; its command is taken over.
+        top (int): Canvas y of the first row.
+        row_height (int): Height of a row in pixels.
+        font (tuple): Font of the rows.
+        fill (str): Text color of the rows.
+    """
+    def __init__(self, canvas, scrollbar, top=45, row_height=27, font=("Arial", 10), fill="#2E3A59"):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.top = top
+        self.row_height = row_height
+        self.font = font
+        self.fill = fill
+        self.texts = {}  # key -> row text
+        # Row order as a doubly linked list, so removing a row does not shift the rows after it
+        self._prev = {}
+        self._next = {}
+        self._head = self._tail = None
+        self._seq = {}  # key -> append counter: compares the positions of two rows in O(1)
+        self._counter = 0
+        self.first_row = 0
+        self._top_key = None  # Key of the row at first_row
+        self.items = []  # Pool of canvas text items, one per visible row
+        self.shown = []  # Text currently displayed by each pooled item, to skip unchanged updates
+
+        scrollbar.config(command=self.yview)
+        canvas.bind("<Configure>", self._on_resize, add="+")
+        canvas.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __contains__(self, key):
+        return key in self.texts
+
+    def add(self, key, text):
+        """Appends a row, or changes the text of an existing one, and scrolls it into view."""
+        if key not in self.texts:
+            self._append(key)
+        self.texts[key] = text
+        visible = max(1, len(self.items) - 1)  # The last pooled row may be cut off by the viewport edge
+        if self._top_key is None:
+            self._top_key = self._head
+        if len(self.texts) - 1 >= self.first_row + visible:
+            self._scroll_to(len(self.texts) - visible)
+        self.refresh()
+
+    def remove(self, key):
+        """Removes a row; rows below it move up. Costs O(visible rows) however many rows there are."""
+        if self._seq[key] <= self._seq[self._top_key]:
+            # The rows from here on move up one, so first_row now shows the row after the old top row
+            self._top_key = self._next[self._top_key]
+        self._unlink(key)
+        del self.texts[key]
+        self._scroll_to(max(0, min(self.first_row, len(self.texts) - max(1, len(self.items) - 1))))
+        self.refresh()
+
+    def set_rows(self, rows):
+        """Replaces every row with rows, an iterable of (key, text) pairs."""
+        self.texts = dict(rows)
+        self._prev, self._next, self._seq = {}, {}, {}
+        self._head = self._tail = None
+        for key in self.texts:
+            self._append(key)
+        self.first_row = 0
+        self._top_key = self._head
+        self.refresh()
+
+    def clear(self):
+        """Removes every row."""
+        self.set_rows(())
+
+    def yview(self, *args):
+        """Scrollbar/wheel handler (same protocol as tk.Canvas.yview)."""
+        visible = max(1, len(self.items) - 1)
+        first = self.first_row
+        if args[0] == "moveto":
+            first = int(float(args[1]) * len(self.texts))
+        elif args[0] == "scroll":
+            first += int(args[1]) * (visible if args[2] == "pages" else 1)
+        self._scroll_to(max(0, min(first, len(self.texts) - visible)))
+        self.refresh()
+
+    def refresh(self):
+        """Redraws the visible rows."""
+        canvas = self.canvas
+        texts, shown, following = self.texts, self.shown, self._next
+        key = self._top_key
+        for slot, item in enumerate(self.items):
+            text = texts[key] if key is not None else ""
+            if key is not None:
+                key = following[key]
+            if shown[slot] != text:
+                shown[slot] = text
+                canvas.itemconfigure(item, text=text)
+        total = max(1, len(texts))
+        self.scrollbar.set(self.first_row / total, min(1.0, (self.first_row + len(self.items)) / total))
+
+    def _on_resize(self, event):
+        """Rebuilds the item pool for the new viewport size."""
+        count = max(1, (event.height - self.top) // self.row_height + 1)
+        center = event.width // 2
+        if count == len(self.items) and self.items and self.canvas.coords(self.items[0])[0] == center:
+            return
+        for item in self.items:
+            self.canvas.delete(item)
+        self.items = [self.canvas.create_text(center, self.top + slot * self.row_height + self.row_height // 2,
+                                              font=self.font, fill=self.fill)
+                      for slot in range(count)]
+        self.shown = [""] * count
+        self._scroll_to(max(0, min(self.first_row, len(self.texts) - max(1, count - 1))))
+        self.refresh()
+
+    def _append(self, key):
+        self._prev[key] = self._tail
+        self._next[key] = None
+        if self._tail is None:
+            self._head = key
+        else:
+            self._next[self._tail] = key
+        self._tail = key
+        self._seq[key] = self._counter
+        self._counter += 1
+
+    def _unlink(self, key):
+        prev, following = self._prev.pop(key), self._next.pop(key)
+        del self._seq[key]
+        if prev is None:
+            self._head = following
+        else:
+            self._next[prev] = following
+        if following is None:
+            self._tail = prev
+        else:
+            self._prev[following] = prev
+
+    def _scroll_to(self, first):
+        """Moves the viewport to row `first`, walking the list from the nearest of the head, the tail and
+        the current top row, so small scrolls (and every add/remove) cost O(rows moved)."""
+        count = len(self.texts)
+        if not count:
+            self.first_row, self._top_key = 0, None
+            return
+        row, key = min(((0, self._head), (count - 1, self._tail), (self.first_row, self._top_key)),
+                       key=lambda start: abs(start[0] - first) if start[1] is not None else count)
+        while row < first:
+            key, row = self._next[key], row + 1
+        while row > first:
+            key, row = self._prev[key], row - 1
+        self.first_row, self._top_key = first, key
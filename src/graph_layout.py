@@ -0,0 +1,103 @@
+import math
+
+
+class BipartiteLayout:
+    """A RAG layout (processes on one row, resources on the other) that remembers node positions.
+
+    Positions are keyed by node label. The first call lays out every node with
+    networkx.bipartite_layout; later calls reuse the stored positions and only place nodes that
+    have not been seen before, at the end of their row. Pictures stay stable across renders and
+    repeat renders cost no layout work. Positions of nodes that disappear are kept, so a node that
+    comes back returns to its old place.
+
+    Args:
+        scale (float): Scale passed to networkx.bipartite_layout for the first layout.
+    """
+    def __init__(self, scale=2.0):
+        self.scale = scale
+        self.positions = {}
+        self.rows = {}  # True (processes) / False (resources) -> (y, last x, step)
+
+    def layout(self, nodes, process_set):
+        """Returns {node: (x, y)} for nodes, placing the new ones.
+
+        Args:
+            nodes (list): The nodes to place, in drawing order.
+            process_set (set): The nodes that are processes (the others are resources).
+
+        Returns:
+            dict: Positions of the given nodes.
+        """
+        positions = self.positions
+        new_nodes = [node for node in nodes if node not in positions]
+        if new_nodes and not positions:
+            import networkx as nx
+            graph = nx.DiGraph()
+            graph.add_nodes_from(nodes)
+            processes = [node for node in nodes if node in process_set]
+            pos = nx.bipartite_layout(graph, processes, align='horizontal', scale=self.scale, center=(0, 0))
+            for is_process in (True, False):
+                row = [(float(x), float(y)) for node, (x, y) in pos.items() if (node in process_set) == is_process]
+                if row:
+                    xs = sorted(x for x, _ in row)
+                    step = (xs[-1] - xs[0]) / (len(xs) - 1) if len(xs) > 1 else self.scale / 1.6
+                    self.rows[is_process] = (row[0][1], xs[-1], step)
+            positions.update((node, (float(x), float(y))) for node, (x, y) in pos.items())
+        elif new_nodes:
+            for node in new_nodes:
+                is_process = node in process_set
+                if is_process in self.rows:
+                    y, last_x, step = self.rows[is_process]
+                    x = last_x + step
+                else:
+                    # First node of this kind: one row distance (as in networkx) from the other row
+                    other_y = self.rows[not is_process][0]
+                    gap = self.scale * 5 / 3
+                    x, y, step = 0.0, other_y - gap if is_process else other_y + gap, self.scale / 1.6
+                positions[node] = (x, y)
+                self.rows[is_process] = (y, x, step)
+        return {node: positions[node] for node in nodes}
+
+
+class CircularLayout:
+    """A WFG layout (nodes on a circle) that remembers node positions.
+
+    The first call places every node with networkx.circular_layout; later calls keep the stored
+    positions and put each new node in the middle of the widest free arc of the circle.
+
+    Args:
+        scale (float): Radius of the circle.
+    """
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.positions = {}
+
+    def layout(self, nodes):
+        """Returns {node: (x, y)} for nodes, placing the new ones.
+
+        Args:
+            nodes (list): The nodes to place, in drawing order.
+
+        Returns:
+            dict: Positions of the given nodes.
+        """
+        positions = self.positions
+        new_nodes = [node for node in nodes if node not in positions]
+        if new_nodes and not positions:
+            import networkx as nx
+            graph = nx.DiGraph()
+            graph.add_nodes_from(nodes)
+            positions.update((node, (float(x), float(y)))
+                             for node, (x, y) in nx.circular_layout(graph, scale=self.scale).items())
+        elif new_nodes:
+            angles = sorted(math.atan2(y, x) % (2 * math.pi) for x, y in positions.values())
+            for node in new_nodes:
+                # Widest gap between neighbouring angles, including the wrap-around gap
+                gaps = [(angles[(i + 1) % len(angles)] - a) % (2 * math.pi) or 2 * math.pi
+                        for i, a in enumerate(angles)]
+                i = max(range(len(gaps)), key=gaps.__getitem__)
+                angle = (angles[i] + gaps[i] / 2) % (2 * math.pi)
+                angles.insert(i + 1, angle)
+                angles.sort()
+                positions[node] = (self.scale * math.cos(angle), self.scale * math.sin(angle))
+        return {node: positions[node] for node in nodes}
@@ -0,0 +1,196 @@
+import math
+from collections import Counter, deque, namedtuple
+
+LOD_THRESHOLD = 300  # Graphs with more nodes are drawn in level-of-detail mode by default
+LOD_HOPS = 1  # Neighbourhood (in hops) of the deadlocked nodes that is drawn in full detail
+MAX_DETAIL_NODES = 150  # More individually drawn nodes than this would not be readable anyway
+MAX_GROUPS = 10
+
+# detail: node labels drawn individually, focus nodes first.
+# groups: (name, member_count, process_count, internal_edge_count) for the aggregated rest.
+# edges: (source, target, kind, count), where source/target are detail labels or group names and
+#        kind is "request" (process -> resource) or "allocation" (resource -> process).
+LODGraph = namedtuple("LODGraph", ["detail", "groups", "edges"])
+
+
+def build_lod(adjacency, process_set, focus, hops=LOD_HOPS, max_detail=MAX_DETAIL_NODES, max_groups=MAX_GROUPS):
+    """Reduces a RAG to its focus nodes, their neighbourhood and a few aggregate nodes.
+
+    The focus nodes (e.g., every deadlocked process and resource) and the nodes within `hops`
+    edges of them (in either direction) are kept, up to max_detail nodes. Every other node is
+    collapsed into the weakly connected component of the remaining graph it belongs to; the
+    largest components become groups of their own and the rest share one "Other" group. Edges
+    are merged per (source, target, kind) with a count. Runs in O(nodes + edges).
+
+    Args:
+        adjacency (dict): The RAG as {node: [neighbors]}.
+        process_set (set): The process nodes (edges leaving them are requests).
+        focus (iterable): Nodes to show in full detail.
+        hops (int): Size of the neighbourhood around the focus nodes.
+        max_detail (int): Maximum number of individually drawn nodes.
+        max_groups (int): Maximum number of aggregate nodes.
+
+    Returns:
+        LODGraph: The reduced graph.
+    """
+    undirected = {node: list(neighbors) for node, neighbors in adjacency.items()}
+    for node, neighbors in adjacency.items():
+        for neighbor in neighbors:
+            undirected.setdefault(neighbor, []).append(node)
+
+    # Breadth-first from the focus nodes, so the nearest neighbours win when the budget runs out
+    detail = {}
+    queue = deque()
+    for node in focus:
+        if node in undirected and node not in detail and len(detail) < max_detail:
+            detail[node] = 0
+            queue.append(node)
+    while queue:
+        node = queue.popleft()
+        distance = detail[node]
+        if distance == hops:
+            continue
+        for neighbor in undirected[node]:
+            if neighbor not in detail:
+                if len(detail) == max_detail:
+                    queue.clear()
+                    break
+                detail[neighbor] = distance + 1
+                queue.append(neighbor)
+
+    # Weakly connected components of the rest
+    component_of = {}
+    components = []
+    for start in undirected:
+        if start in detail or start in component_of:
+            continue
+        index = len(components)
+        members = [start]
+        component_of[start] = index
+        for node in members:  # The list grows while it is scanned
+            for neighbor in undirected[node]:
+                if neighbor not in detail and neighbor not in component_of:
+                    component_of[neighbor] = index
+                    members.append(neighbor)
+        components.append(members)
+
+    order = sorted(range(len(components)), key=lambda i: -len(components[i]))
+    names = {}
+    for rank, i in enumerate(order):
+        names[i] = f"G{rank + 1}" if rank < max_groups - 1 or len(order) == max_groups else "Other"
+    sizes = Counter()
+    process_counts = Counter()
+    for node, index in component_of.items():
+        name = names[index]
+        sizes[name] += 1
+        process_counts[name] += node in process_set
+
+    edges = Counter()
+    internal = Counter()
+    for node, neighbors in adjacency.items():
+        source = node if node in detail else names[component_of[node]]
+        kind = "request" if node in process_set else "allocation"
+        for neighbor in neighbors:
+            target = neighbor if neighbor in detail else names[component_of[neighbor]]
+            if source == target and node not in detail:
+                internal[source] += 1
+            else:
+                edges[(source, target, kind)] += 1
+
+    group_names = list(dict.fromkeys(names[i] for i in order))
+    groups = tuple((name, sizes[name], process_counts[name], internal[name]) for name in group_names)
+    return LODGraph(tuple(detail), groups,
+                    tuple((source, target, kind, count) for (source, target, kind), count in edges.items()))
+
+
+def lod_positions(lod, process_set):
+    """Places the detail processes and resources on two rows and the groups on a third row below."""
+    processes = [node for node in lod.detail if node in process_set]
+    resources = [node for node in lod.detail if node not in process_set]
+    width = max(len(processes), len(resources), 1)
+    pos = {}
+    for row, y in ((processes, 0.0), (resources, 2.0)):
+        offset = (width - len(row)) / 2
+        for i, node in enumerate(row):
+            pos[node] = (offset + i, y)
+    if lod.groups:
+        step = max(width / len(lod.groups), 4.0)  # Room for the group captions
+        start = (width - 1 - step * (len(lod.groups) - 1)) / 2
+        for i, (name, _, _, _) in enumerate(lod.groups):
+            pos[name] = (start + i * step, -2.5)
+    return pos
+
+
+def draw_lod(ax, lod, process_set, pos, highlight_nodes=(), highlight_edges=(), colors=None, label_pos=None):
+    """Draws a reduced graph with one collection per kind of element.
+
+    Edges are a single LineCollection per style (requests, allocations, highlighted) whose line
+    widths grow with the number of merged edges, and nodes are one scatter per kind, so the
+    artist count stays constant however large the original graph is.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axes to draw on.
+        lod (LODGraph): The reduced graph.
+        process_set (set): The process nodes.
+        pos (dict): Positions of the detail nodes and groups (see lod_positions).
+        highlight_nodes (set): Detail nodes to highlight (e.g., deadlocked ones).
+        highlight_edges (set): (source, target) pairs to highlight.
+        colors (dict, optional): Overrides for the default colors ("process", "resource",
+            "process_highlight", "resource_highlight", "request", "allocation", "highlight", "group").
+        label_pos (dict, optional): Positions of the node labels; by default process labels go below
+            and resource labels above their node (turned vertical when there are many).
+
+    Returns:
+        list: The created artists.
+    """
+    from matplotlib.collections import LineCollection
+    palette = {"process": "#add8e6", "resource": "#90ee90", "process_highlight": "#ff9999",
+               "resource_highlight": "#ffcc99", "request": "black", "allocation": "#555555",
+               "highlight": "red", "group": "#d3d3d3"}
+    palette.update(colors or {})
+    artists = []
+
+    segments = {"request": [], "allocation": [], "highlight": []}
+    widths = {"request": [], "allocation": [], "highlight": []}
+    for source, target, kind, count in lod.edges:
+        style = "highlight" if (source, target) in highlight_edges else kind
+        segments[style].append((pos[source], pos[target]))
+        widths[style].append(min(0.8 + math.log10(count) * 1.5, 6.0))
+    for style, linestyle in (("allocation", "dashed"), ("request", "solid"), ("highlight", "solid")):
+        if segments[style]:
+            lines = LineCollection(segments[style], colors=palette[style], linewidths=widths[style],
+                                   linestyles=linestyle, alpha=0.9 if style == "highlight" else 0.5,
+                                   zorder=3 if style == "highlight" else 1)
+            artists.append(ax.add_collection(lines))
+
+    for is_process, marker, size in ((True, 'o', 200), (False, 's', 150)):
+        for highlighted in (False, True):
+            nodes = [node for node in lod.detail
+                     if (node in process_set) == is_process and (node in highlight_nodes) == highlighted]
+            if nodes:
+                key = ("process" if is_process else "resource") + ("_highlight" if highlighted else "")
+                artists.append(ax.scatter([pos[n][0] for n in nodes], [pos[n][1] for n in nodes], s=size,
+                                          marker=marker, c=palette[key], edgecolors='black', linewidths=0.5,
+                                          zorder=4))
+    if lod.groups:
+        artists.append(ax.scatter([pos[name][0] for name, _, _, _ in lod.groups],
+                                  [pos[name][1] for name, _, _, _ in lod.groups],
+                                  s=[200 + 150 * math.log10(size + 1) for _, size, _, _ in lod.groups], marker='h',
+                                  c=palette["group"], edgecolors='black', linewidths=0.5, zorder=4))
+
+    label_size = 9 if len(lod.detail) <= 60 else 6
+    vertical = label_pos is None and len(lod.detail) > 20
+    for node in lod.detail:
+        if label_pos is not None:
+            x, y = label_pos[node]
+            artists.append(ax.text(x, y, node, fontsize=label_size, ha='center', va='center', zorder=5))
+            continue
+        x, y = pos[node]
+        below = node in process_set
+        artists.append(ax.text(x, y - 0.25 if below else y + 0.25, node, fontsize=label_size, ha='center',
+                               va='top' if below else 'bottom', rotation=90 if vertical else 0, zorder=5))
+    for name, size, processes, internal in lod.groups:
+        x, y = pos[name]
+        artists.append(ax.text(x, y - 0.6, f"{name}\n{processes}P/{size - processes}R",
+                               fontsize=7, ha='center', va='top', zorder=5))
+    return artists
@@ -2,9 +2,19 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import tkinter.font as tkfont
-import time
-from deadlock_algo import DeadlockDetector
-from visualization import visualize_rag  # Import visualization module
+import threading
+from background_task import BackgroundTask, detect_single, build_single_graph
+from app_logging import get_logger, log_event
+from edge_list import EdgeList
+from spatial_index import GridIndex
+from canvas_background import ResizeCoalescer, draw_gradient
+from state_timeline import StateTimeline
+from incremental_deadlock_algo import IncrementalDeadlockDetector
+# The plotting stack (matplotlib, networkx, numpy) is imported on first use, see warm_visualization()
+
+logger = get_logger(__name__)
+
+SOUND_POLL_MS = 200  # How often the sound checkbox checks whether the sounds finished loading
 
 class DeadlockDetectionGUI:
     """A GUI for detecting deadlocks in a system with single-instance resources.
@@ -21,6 +31,9 @@ class DeadlockDetectionGUI:
         self.window.minsize(400, 300)
 
         self.dark_mode_on = False
+        self.background_task = None  # The running detection/visualization task, if any
+        self.last_cycle = None  # Deadlock cycle of the current state, highlighted when visualizing
+        self.rag_window = None  # The embedded RAG/WFG view; kept open and updated in place
 
         # Background canvas with gradient
         self.background_canvas = tk.Canvas(self.window, highlightthickness=0)
@@ -81,22 +94,49 @@ class DeadlockDetectionGUI:
 
         # Sound toggle
         self.sound_checkbox = ttk.Checkbutton(self.background_canvas, 
-                                              text="Sound On" if sound_manager.sounds_loaded else "Sound Off",
+                                              text="Sound On" if sound_manager.sound_enabled else "Sound Off",
                                               command=self.toggle_sound)
         self.sound_checkbox.place(relx=0.5, rely=0.85, anchor="center")
-        print(f"Initial sound state: enabled={sound_manager.sound_enabled}, sounds_loaded={sound_manager.sounds_loaded}")
+        log_event(logger, "initial_sound_state", enabled=sound_manager.sound_enabled, loaded=sound_manager.sounds_loaded)
+        self.sync_sound_checkbox()
 
         self.resources_held = {}
         self.resources_wanted = {}
 
-        self.window.bind("<Configure>", self.on_window_resize)
+        self.resize_handler = ResizeCoalescer(self.window, self.on_window_resize)
         self.on_window_resize(None)
 
+        # Load the plotting stack in the background once the first frame is on screen
+        self.window.after(500, self.warm_visualization)
+
+    def warm_visualization(self):
+        """Imports the visualization modules on a background thread so the first "Visualize" click is fast."""
+        def load():
+            try:
+                import visualization
+                import multi_visualization
+                import networkx  # Used by the first layout (graph_layout)
+                import matplotlib.backends.backend_tkagg  # The embedded view canvas
+            except ImportError as e:
+                logger.warning("Visualization unavailable: %s", e)
+        threading.Thread(target=load, name="visualization-warmup", daemon=True).start()
+
+    def sync_sound_checkbox(self):
+        """Shows the sound state on the checkbox, polling until the background loader is done.
+
+        If the sounds cannot be loaded, the checkbox shows "Sound Off" and is disabled.
+        """
+        if self.sound_manager.load_failed:
+            self.sound_checkbox.config(text="Sound Off", state="disabled")
+            return
+        self.sound_checkbox.config(text="Sound On" if self.sound_manager.sound_enabled else "Sound Off")
+        if not self.sound_manager.sounds_loaded:
+            self.window.after(SOUND_POLL_MS, self.sync_sound_checkbox)
+
     def toggle_sound(self):
         """Toggles sound on or off and updates the checkbox label."""
         sound_on = self.sound_manager.toggle_sound()
         self.sound_checkbox.config(text="Sound On" if sound_on else "Sound Off")
-        print(f"Sound checkbox updated: text={'Sound On' if sound_on else 'Sound Off'}")
 
     def on_window_resize(self, event):
         """Handles window resizing by updating the canvas and font sizes."""
@@ -104,7 +144,6 @@ class DeadlockDetectionGUI:
         new_height = self.window.winfo_height()
 
         self.background_canvas.config(width=new_width, height=new_height)
-        self.background_canvas.delete("all")
         if self.dark_mode_on:
             self.add_gradient(self.background_canvas, "#2E3A59", "#121212", new_width, new_height)
         else:
@@ -123,22 +162,8 @@ class DeadlockDetectionGUI:
             self.gear_label.config(font=("Helvetica", gear_font_size))
 
     def add_gradient(self, canvas, color_start, color_end, width, height):
-        """Adds a gradient background to the canvas."""
-        steps = 100
-        for i in range(steps):
-            r1 = int(color_start[1:3], 16)
-            g1 = int(color_start[3:5], 16)
-            b1 = int(color_start[5:7], 16)
-            r2 = int(color_end[1:3], 16)
-            g2 = int(color_end[3:5], 16)
-            b2 = int(color_end[5:7], 16)
-            r = int(r1 + (r2 - r1) * i / steps)
-            g = int(g1 + (g2 - g1) * i / steps)
-            b = int(b1 + (b2 - b1) * i / steps)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            y_start = i * (height / steps)
-            y_end = (i + 1) * (height / steps)
-            canvas.create_rectangle(0, y_start, width, y_end, fill=color, outline="")
+        """Adds a gradient background to the canvas (one cached image item, see canvas_background)."""
+        draw_gradient(canvas, color_start, color_end, width, height)
 
     def fade_in_title(self, step):
         """Animates the title by fading in the color."""
@@ -167,7 +192,6 @@ class DeadlockDetectionGUI:
     def switch_mode(self):
         """Toggles between light and dark mode."""
         if self.dark_mode_on:
-            self.background_canvas.delete("all")
             new_width = self.window.winfo_width()
             new_height = self.window.winfo_height()
             self.add_gradient(self.background_canvas, "#A3BFFA", "#F3F4F6", new_width, new_height)
@@ -179,7 +203,6 @@ class DeadlockDetectionGUI:
             self.button_multi_label.config(bg="#2196F3")
             self.dark_mode_on = False
         else:
-            self.background_canvas.delete("all")
             new_width = self.window.winfo_width()
             new_height = self.window.winfo_height()
             self.add_gradient(self.background_canvas, "#2E3A59", "#121212", new_width, new_height)
@@ -228,6 +251,19 @@ class DeadlockDetectionGUI:
         self.button_undo.bind("<Enter>", lambda e: self.button_undo.config(bg="#E64A19"))
         self.button_undo.bind("<Leave>", lambda e: self.button_undo.config(bg="#FF5722"))
 
+        self.button_redo = tk.Button(input_area, text="Redo", font=("Arial", 12),
+                                     command=self.redo_last_action, bg="#8D6E63", fg="white")
+        self.button_redo.pack(side=tk.LEFT, padx=5)
+        self.button_redo.bind("<Enter>", lambda e: self.button_redo.config(bg="#6D4C41"))
+        self.button_redo.bind("<Leave>", lambda e: self.button_redo.config(bg="#8D6E63"))
+
+        self.button_history = tk.Button(input_area, text="History", font=("Arial", 12),
+                                        command=self.show_history, bg="#607D8B", fg="white")
+        self.button_history.pack(side=tk.LEFT, padx=5)
+        self.button_history.bind("<Enter>", lambda e: self.button_history.config(bg="#455A64"))
+        self.button_history.bind("<Leave>", lambda e: self.button_history.config(bg="#607D8B"))
+        self.history_list = None  # Listbox of the open History window
+
     def make_canvas(self):
         """Creates the canvas for drag-and-drop interaction."""
         try:
@@ -254,17 +290,15 @@ class DeadlockDetectionGUI:
         self.left_scroll = tk.Scrollbar(self.left_area, orient=tk.VERTICAL, command=self.left_canvas.yview)
         self.left_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.left_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.left_canvas.configure(yscrollcommand=self.left_scroll.set)
-        self.left_inner_area = tk.Frame(self.left_canvas, bg="#E6F0FA")
-        self.left_canvas.create_window((0, 0), window=self.left_inner_area, anchor="nw")
-        self.left_inner_area.bind("<Configure>", lambda event: self.left_canvas.configure(scrollregion=self.left_canvas.bbox("all")))
         self.left_canvas.create_text(100, 20, text="Allocations", font=("Arial", 12, "bold"), fill="#2E3A59")
+        self.allocation_list = EdgeList(self.left_canvas, self.left_scroll)
 
         # Center canvas for drag-and-drop (expandable)
         self.center_canvas = tk.Canvas(main_area, width=500, height=500)
         self.center_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)  # Expand to fill available space
         self.add_gradient(self.center_canvas, "#A3BFFA", "#F3F4F6", 500, 500)
-        self.center_canvas.create_text(250, 20, text="Drag and Drop", font=("Arial", 12, "bold"), fill="#2E3A59")
+        self.canvas_title = self.center_canvas.create_text(250, 20, text="Drag and Drop", font=("Arial", 12, "bold"),
+                                                           fill="#2E3A59")
         self.phase_label = self.center_canvas.create_text(250, 40, text="Allocation Phase: Drag resources to processes",
                                                          font=("Arial", 10), fill="#2E3A59")
 
@@ -275,11 +309,8 @@ class DeadlockDetectionGUI:
         self.right_scroll = tk.Scrollbar(self.right_area, orient=tk.VERTICAL, command=self.right_canvas.yview)
         self.right_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.right_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.right_canvas.configure(yscrollcommand=self.right_scroll.set)
-        self.right_inner_area = tk.Frame(self.right_canvas, bg="#E6F0FA")
-        self.right_canvas.create_window((0, 0), window=self.right_inner_area, anchor="nw")
-        self.right_inner_area.bind("<Configure>", lambda event: self.right_canvas.configure(scrollregion=self.right_canvas.bbox("all")))
         self.right_canvas.create_text(100, 20, text="Requests", font=("Arial", 12, "bold"), fill="#2E3A59")
+        self.request_list = EdgeList(self.right_canvas, self.right_scroll)
 
         self.main_canvas = self.center_canvas
 
@@ -288,7 +319,7 @@ class DeadlockDetectionGUI:
         self.right_part_width = 200
 
         # Bind configure event to resize gradient
-        self.center_canvas.bind("<Configure>", self.resize_center_canvas)
+        self.center_resize_handler = ResizeCoalescer(self.center_canvas, self.resize_center_canvas)
 
         # Initialize resources_held and resources_wanted
         self.resources_held = {}
@@ -301,14 +332,19 @@ class DeadlockDetectionGUI:
         self.process_icon = "🤖"
         self.resource_icon = "🖥️"
 
-        self.process_locations = {}
-        self.resource_locations = {}
+        self.process_index = GridIndex()  # Node positions on the canvas, for constant-time drop hit tests
+        self.resource_index = GridIndex()
+        self.home_positions = {}  # Laid-out position of every node, where failed drops and undos put it back
+        self.resource_holder = {}  # Reverse indexes of resources_held/resources_wanted, for the tooltips
+        self.resource_requesters = {}
         self.process_items = {}
         self.resource_items = {}
-        self.allocation_labels = []
-        self.request_labels = []
-        self.history_of_actions = []
+        self.timeline = StateTimeline(self.resources_held)  # Undo/redo history, with cached detection results
+        self.live_detector = self.new_live_detector()
+        self.last_cycle = None
         self.center_items = []
+        self.new_window.bind("<Control-z>", lambda e: self.undo_last_action())
+        self.new_window.bind("<Control-y>", lambda e: self.redo_last_action())
 
         self.current_phase = "allocation"
         self.show_allocation_phase(self.total_processes, self.total_resources)
@@ -350,91 +386,160 @@ class DeadlockDetectionGUI:
         self.button_visualize.bind("<Leave>", lambda e: self.visualize_frame.config(bg="#4CAF50"))
 
     def resize_center_canvas(self, event):
-        """Resizes the center canvas gradient when the window size changes."""
+        """Fits the center canvas to a new size: swaps the gradient image and moves the existing items."""
         new_width = event.width
         new_height = event.height
         self.center_part_width = new_width
-        self.main_canvas.delete("all")
         self.add_gradient(self.main_canvas, "#A3BFFA", "#F3F4F6", new_width, new_height)
-        self.main_canvas.create_text(new_width // 2, 20, text="Drag and Drop", font=("Arial", 12, "bold"), fill="#2E3A59")
-        self.phase_label = self.main_canvas.create_text(new_width // 2, 40, 
-                                                        text="Allocation Phase: Drag resources to processes" if self.current_phase == "allocation" else "Request Phase: Drag processes to resources",
-                                                        font=("Arial", 10), fill="#2E3A59")
-        # Redraw items based on current phase
-        if self.current_phase == "allocation":
-            self.show_allocation_phase(self.total_processes, self.total_resources)
-        else:
-            self.show_request_phase(self.total_processes, self.total_resources)
+        self.main_canvas.coords(self.canvas_title, new_width // 2, 20)
+        self.main_canvas.coords(self.phase_label, new_width // 2, 40)
+        self.relayout_nodes()
+
+    def relayout_nodes(self):
+        """Moves every node to its position for the current canvas width (same spacing as the phase layouts)."""
+        for items, index, y_position in ((self.process_items, self.process_index, 100),
+                                         (self.resource_items, self.resource_index, 200)):
+            if not items:
+                continue
+            space_between = min(80, (self.center_part_width - 100) / len(items))
+            for name, item in items.items():
+                x_position = 50 + (int(name[1:]) - 1) * space_between
+                self.home_positions[name] = (x_position, y_position)
+                self.main_canvas.coords(item, x_position, y_position)
+                if name in index:  # Hidden (dropped) nodes are not indexed
+                    index.move(name, x_position, y_position)
 
     def visualize_rag(self):
-        """Visualizes the Resource Allocation Graph using the visualization module."""
-        detector = DeadlockDetector(self.resources_held, self.resources_wanted, self.total_resources)
-        rag = detector.build_rag()
-        if hasattr(self, "last_detector") and self.last_detector.cycle:
-            visualize_rag(rag, self.resources_held, self.resources_wanted, self.last_detector.cycle, self.total_resources)
-        else:
-            visualize_rag(rag, self.resources_held, self.resources_wanted, total_resources=self.total_resources)
+        """Visualizes the Resource Allocation Graph using the visualization module.
+
+        The state is validated and interned in a background process; plotting happens on the Tk thread.
+        """
+        if self.background_task is not None and self.background_task.running:
+            return
+        args = (self.resources_held, self.resources_wanted, self.total_resources)
+        self.background_task = BackgroundTask(self.new_window, build_single_graph, args, self.show_visualization,
+                                              self.show_task_error, title="Preparing Visualization",
+                                              size=self.total_processes + self.total_resources)
+
+    def show_visualization(self, rag, elapsed_time):
+        """Plots a graph prepared by visualize_rag() in the embedded view, opening it if needed."""
+        from visualization import RAGView, visualize_rag  # Usually already loaded by warm_visualization()
+        if self.rag_window is None or not self.rag_window.is_open():
+            from rag_view import ViewWindow
+            self.rag_window = ViewWindow(self.new_window, "Resource Allocation Graph", RAGView())
+        visualize_rag(rag, self.resources_held, self.resources_wanted, self.last_cycle, self.total_resources,
+                      view=self.rag_window)
+        self.rag_window.show()
+
+    def refresh_visualization(self):
+        """Updates the open RAG view after an allocation, request or undo; only the changed edges are redrawn.
+
+        The graph comes from the live incremental detector, so the state is not interned again.
+        """
+        if self.rag_window is None or not self.rag_window.is_open():
+            return
+        self.rag_window.update(self.live_detector.adjacency(), self.resources_held, self.resources_wanted,
+                               self.last_cycle, self.total_resources)
+
+    def new_live_detector(self):
+        """Returns an incremental detector of the current state, with every resource registered."""
+        detector = IncrementalDeadlockDetector(self.resources_held, self.resources_wanted)
+        for i in range(self.total_resources):
+            detector.add_resource(f"R{i+1}")
+        return detector
 
     def detect_deadlock(self):
-        """Detects a deadlock and displays the result, including performance metrics."""
-        try:
-            start_time = time.time()
-            detector = DeadlockDetector(self.resources_held, self.resources_wanted, self.total_resources)
-            has_deadlock, message = detector.detect_deadlock()
-            elapsed_time = time.time() - start_time
+        """Starts deadlock detection in a background process; show_detection_result() reports it.
+
+        A state that was already detected (e.g., after undo/redo) reuses the result cached on its snapshot.
+        """
+        snapshot = self.timeline.current
+        if snapshot.result is not None:
+            self.show_detection_result(snapshot.result, None)
+            return
+        if self.background_task is not None and self.background_task.running:
+            return
+        args = self.timeline.state(snapshot) + (self.total_resources,)
+        self.background_task = BackgroundTask(self.new_window, detect_single, args,
+                                              lambda result, elapsed_time: self.show_detection_result(
+                                                  result, elapsed_time, snapshot),
+                                              self.show_task_error, size=self.total_processes + self.total_resources)
+
+    def show_detection_result(self, result, elapsed_time, snapshot=None):
+        """Displays a detection result, including performance metrics.
+
+        Args:
+            result (tuple): (has_deadlock, message, cycle) as returned by background_task.detect_single.
+            elapsed_time (float): Detection time in seconds; None for a result reused from the timeline.
+            snapshot (state_timeline.Snapshot, optional): The detected state, to cache the result on.
+        """
+        if snapshot is not None:
+            snapshot.result = result
+        has_deadlock, message, cycle = result
+        if elapsed_time is None:
+            message += "\nState unchanged since the last detection; result reused."
+        else:
             message += f"\nDetection took {elapsed_time:.3f} seconds."
-            self.last_detector = detector
-            if has_deadlock:
-                self.sound_manager.play_deadlock_sound()
-                messagebox.showwarning("Deadlock Detected", message, parent=self.new_window)
-            else:
-                messagebox.showinfo("Deadlock Info", message, parent=self.new_window)
-        except ValueError as e:
-            messagebox.showerror("Error", str(e), parent=self.new_window)
+        if snapshot is None or snapshot is self.timeline.current:  # Not for a state that was left meanwhile
+            self.last_cycle = cycle
+        if has_deadlock:
+            self.sound_manager.play_deadlock_sound()
+            messagebox.showwarning("Deadlock Detected", message, parent=self.new_window)
+        else:
+            messagebox.showinfo("Deadlock Info", message, parent=self.new_window)
+
+    def show_task_error(self, message):
+        """Displays an error raised by a background task (e.g., an invalid state)."""
+        messagebox.showerror("Error", message, parent=self.new_window)
 
     def reset_everything(self):
         """Resets the canvas and all data to the initial state."""
-        print("Resetting everything...")
         self.resources_held = {}
         self.resources_wanted = {}
         for i in range(self.total_processes):
             process_name = f"P{i+1}"
             self.resources_held[process_name] = []
             self.resources_wanted[process_name] = []
-        print(f"Resources reset: held={self.resources_held}, wanted={self.resources_wanted}")
+        log_event(logger, "reset", processes=self.total_processes, resources=self.total_resources)
 
-        self.history_of_actions = []
+        self.timeline = StateTimeline(self.resources_held)
+        self.live_detector = self.new_live_detector()
+        self.last_cycle = None
+        self.refresh_history()
         self.current_phase = "allocation"
         self.center_items = []
 
-        for label in self.left_inner_area.winfo_children():
-            label.destroy()
-        for label in self.right_inner_area.winfo_children():
-            label.destroy()
-        self.allocation_labels = []
-        self.request_labels = []
+        self.allocation_list.clear()
+        self.request_list.clear()
 
-        self.process_locations = {}
-        self.resource_locations = {}
+        self.process_index.clear()
+        self.resource_index.clear()
+        self.home_positions = {}
+        self.resource_holder = {}
+        self.resource_requesters = {}
         self.process_items = {}
         self.resource_items = {}
         self.main_canvas.delete("all")
         self.add_gradient(self.main_canvas, "#A3BFFA", "#F3F4F6", self.center_part_width, 500)
-        self.main_canvas.create_text(self.center_part_width // 2, 20, text="Drag and Drop", font=("Arial", 12, "bold"), fill="#2E3A59")
+        self.canvas_title = self.main_canvas.create_text(self.center_part_width // 2, 20, text="Drag and Drop",
+                                                         font=("Arial", 12, "bold"), fill="#2E3A59")
         self.phase_label = self.main_canvas.create_text(self.center_part_width // 2, 40, text="Allocation Phase: Drag resources to processes",
                                                        font=("Arial", 10), fill="#2E3A59")
 
-        print("Showing allocation phase...")
         self.show_allocation_phase(self.total_processes, self.total_resources)
         self.button_finish.config(text="Finish Allocation", command=self.go_to_request_phase)
+        self.refresh_visualization()
 
     def show_allocation_phase(self, num_processes, num_resources):
         """Displays the allocation phase where resources can be dragged to processes."""
-        print(f"Center items before: {self.center_items}")
         if hasattr(self, "center_items"):
             for item in self.center_items:
                 self.main_canvas.delete(item)
         self.center_items = []
+        self.process_items = {}  # The items are re-created below
+        self.resource_items = {}
+        self.process_index.clear()
+        self.resource_index.clear()
 
         start_x = self.left_part_width
         if num_processes > 0:
@@ -445,10 +550,11 @@ class DeadlockDetectionGUI:
                 y_position = 100
                 process_text = self.main_canvas.create_text(x_position, y_position, text=f"{process_name} {self.process_icon}",
                                                            font=("Arial", 14), tags=process_name, fill="#1A3C34")
-                self.process_locations[process_name] = (x_position, y_position)
+                self.process_index.move(process_name, x_position, y_position)
+                self.home_positions[process_name] = (x_position, y_position)
                 self.process_items[process_name] = process_text
                 self.center_items.append(process_text)
-                self.main_canvas.tag_bind(process_name, "<Motion>", lambda event, p=process_name: self.show_info(event, p))
+                self.bind_node(process_name)
 
         if num_resources > 0:
             space_between = min(80, (self.center_part_width - 100) / num_resources)
@@ -458,20 +564,23 @@ class DeadlockDetectionGUI:
                 y_position = 200
                 resource_text = self.main_canvas.create_text(x_position, y_position, text=f"{resource_name} {self.resource_icon}",
                                                             font=("Arial", 14), tags=resource_name, fill="#1A3C34")
-                self.resource_locations[resource_name] = (x_position, y_position)
+                self.resource_index.move(resource_name, x_position, y_position)
+                self.home_positions[resource_name] = (x_position, y_position)
                 self.resource_items[resource_name] = resource_text
                 self.center_items.append(resource_text)
-                self.main_canvas.tag_bind(resource_name, "<Button-1>", lambda event, r=resource_name: self.start_dragging(event, r))
-                self.main_canvas.tag_bind(resource_name, "<B1-Motion>", lambda event, r=resource_name: self.drag_item(event, r))
-                self.main_canvas.tag_bind(resource_name, "<ButtonRelease-1>", lambda event, r=resource_name: self.drop_for_allocation(event, r))
-                self.main_canvas.tag_bind(resource_name, "<Motion>", lambda event, r=resource_name: self.show_info(event, r))
-        print(f"Center items after: {self.center_items}")
+                self.bind_node(resource_name, self.drop_for_allocation)
+                if resource_name in self.resource_holder:
+                    self.hide_node(resource_name)  # Already dropped on a process
 
     def show_request_phase(self, num_processes, num_resources):
         """Displays the request phase where processes can be dragged to resources."""
         for item in self.center_items:
             self.main_canvas.delete(item)
         self.center_items = []
+        self.process_items = {}  # The items are re-created below
+        self.resource_items = {}
+        self.process_index.clear()
+        self.resource_index.clear()
 
         self.main_canvas.delete(self.phase_label)
         self.phase_label = self.main_canvas.create_text(self.center_part_width // 2, 40, text="Request Phase: Drag processes to resources",
@@ -486,13 +595,13 @@ class DeadlockDetectionGUI:
                 y_position = 100
                 process_text = self.main_canvas.create_text(x_position, y_position, text=f"{process_name} {self.process_icon}",
                                                            font=("Arial", 14), tags=process_name, fill="#1A3C34")
-                self.process_locations[process_name] = (x_position, y_position)
+                self.process_index.move(process_name, x_position, y_position)
+                self.home_positions[process_name] = (x_position, y_position)
                 self.process_items[process_name] = process_text
                 self.center_items.append(process_text)
-                self.main_canvas.tag_bind(process_name, "<Button-1>", lambda event, p=process_name: self.start_dragging(event, p))
-                self.main_canvas.tag_bind(process_name, "<B1-Motion>", lambda event, p=process_name: self.drag_item(event, p))
-                self.main_canvas.tag_bind(process_name, "<ButtonRelease-1>", lambda event, p=process_name: self.drop_for_request(event, p))
-                self.main_canvas.tag_bind(process_name, "<Motion>", lambda event, p=process_name: self.show_info(event, p))
+                self.bind_node(process_name, self.drop_for_request)
+                if self.resources_wanted[process_name]:
+                    self.hide_node(process_name)  # Already dropped on a resource
 
         if num_resources > 0:
             space_between = min(80, (self.center_part_width - 100) / num_resources)
@@ -510,21 +619,16 @@ class DeadlockDetectionGUI:
                     color = "green"
                 resource_text = self.main_canvas.create_text(x_position, y_position, text=f"{resource_name} {self.resource_icon}",
                                                             font=("Arial", 14), tags=resource_name, fill=color)
-                self.resource_locations[resource_name] = (x_position, y_position)
+                self.resource_index.move(resource_name, x_position, y_position)
+                self.home_positions[resource_name] = (x_position, y_position)
                 self.resource_items[resource_name] = resource_text
                 self.center_items.append(resource_text)
-                self.main_canvas.tag_unbind(resource_name, "<Button-1>")
-                self.main_canvas.tag_unbind(resource_name, "<B1-Motion>")
-                self.main_canvas.tag_unbind(resource_name, "<ButtonRelease-1>")
-                self.main_canvas.tag_bind(resource_name, "<Motion>", lambda event, r=resource_name: self.show_info(event, r))
+                self.bind_node(resource_name)
 
     def show_info(self, event, item):
         """Shows a tooltip with information about a process or resource."""
         x = event.x
         y = event.y
-        if hasattr(self, "tooltip"):
-            self.tooltip.destroy()
-
         if item.startswith("P"):
             process = item
             held = self.resources_held.get(process, [])
@@ -532,22 +636,22 @@ class DeadlockDetectionGUI:
             tooltip_text = f"{process}: Holds {held}, Requests {wanted}"
         else:
             resource = item
-            holder = None
-            for proc in self.resources_held:
-                if resource in self.resources_held[proc]:
-                    holder = proc
-                    break
-            requesters = []
-            for proc in self.resources_wanted:
-                if resource in self.resources_wanted[proc]:
-                    requesters.append(proc)
+            holder = self.resource_holder.get(resource)
+            requesters = self.resource_requesters.get(resource, [])
             tooltip_text = f"{resource}: Held by {holder if holder else 'None'}, Requested by {requesters}"
 
+        geometry = f"+{self.main_canvas.winfo_rootx() + x + 20}+{self.main_canvas.winfo_rooty() + y}"
+        if hasattr(self, "tooltip"):
+            # Reuse the tooltip while the pointer moves instead of rebuilding it on every <Motion>
+            if self.tooltip_label.cget("text") != tooltip_text:
+                self.tooltip_label.config(text=tooltip_text)
+            self.tooltip.wm_geometry(geometry)
+            return
         self.tooltip = tk.Toplevel(self.main_canvas)
         self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{self.main_canvas.winfo_rootx() + x + 20}+{self.main_canvas.winfo_rooty() + y}")
-        label = tk.Label(self.tooltip, text=tooltip_text, background="yellow", relief="solid", borderwidth=1)
-        label.pack()
+        self.tooltip.wm_geometry(geometry)
+        self.tooltip_label = tk.Label(self.tooltip, text=tooltip_text, background="yellow", relief="solid", borderwidth=1)
+        self.tooltip_label.pack()
         self.main_canvas.bind("<Leave>", lambda e: self.hide_info())
 
     def hide_info(self):
@@ -555,6 +659,7 @@ class DeadlockDetectionGUI:
         if hasattr(self, "tooltip"):
             self.tooltip.destroy()
             del self.tooltip
+            del self.tooltip_label
 
     def start_dragging(self, event, item):
         """Starts dragging an item (process or resource)."""
@@ -569,54 +674,33 @@ class DeadlockDetectionGUI:
         self.main_canvas.move(item, dx, dy)
         self.start_x = event.x
         self.start_y = event.y
-        if item.startswith("P"):
-            old_x, old_y = self.process_locations[item]
-            self.process_locations[item] = (old_x + dx, old_y + dy)
-        else:
-            old_x, old_y = self.resource_locations[item]
-            self.resource_locations[item] = (old_x + dx, old_y + dy)
+        index = self.process_index if item.startswith("P") else self.resource_index
+        old_x, old_y = index.get(item)
+        index.move(item, old_x + dx, old_y + dy)
 
     def drop_for_allocation(self, event, resource):
         """Handles dropping a resource onto a process during the allocation phase."""
-        drop_x = event.x
-        drop_y = event.y
-        target_process = None
-
-        for process in self.process_locations:
-            px, py = self.process_locations[process]
-            if abs(drop_x - px) < 40 and abs(drop_y - py) < 40:
-                target_process = process
-                break
+        target_process = self.process_index.hit(event.x, event.y, 40)
 
         if target_process:
-            for proc in self.resources_held:
-                if resource in self.resources_held[proc]:
-                    messagebox.showerror("Error", f"{resource} is already allocated to {proc}.", parent=self.new_window)
-                    self.reset_resource_position(resource)
-                    return
-
-            self.resources_held[target_process].append(resource)
-            print(f"Allocation: {target_process} <- {resource}, History: {self.history_of_actions}")
-            self.history_of_actions.append(("allocation", target_process, resource))
+            holder = self.resource_holder.get(resource)
+            if holder is not None:
+                messagebox.showerror("Error", f"{resource} is already allocated to {holder}.", parent=self.new_window)
+                self.reset_resource_position(resource)
+                return
+
+            self.apply_allocation(target_process, resource)
+            self.timeline.record("allocation", target_process, resource)
+            log_event(logger, "allocation", process=target_process, resource=resource, position=self.timeline.position)
+            self.restore_detection_result()
             self.sound_manager.play_allocate_sound()
-            self.main_canvas.delete(self.resource_items[resource])
-            self.center_items.remove(self.resource_items[resource])
-            del self.resource_items[resource]
-            self.show_allocations()
+            self.refresh_visualization()
         else:
             self.reset_resource_position(resource)
 
     def drop_for_request(self, event, process):
         """Handles dropping a process onto a resource during the request phase."""
-        drop_x = event.x
-        drop_y = event.y
-        target_resource = None
-
-        for resource in self.resource_locations:
-            rx, ry = self.resource_locations[resource]
-            if abs(drop_x - rx) < 40 and abs(drop_y - ry) < 40:
-                target_resource = resource
-                break
+        target_resource = self.resource_index.hit(event.x, event.y, 40)
 
         if target_resource:
             if target_resource in self.resources_held[process]:
@@ -628,118 +712,216 @@ class DeadlockDetectionGUI:
                 self.reset_process_position(process)
                 return
 
-            self.resources_wanted[process].append(target_resource)
-            print(f"Request: {process} -> {target_resource}, History: {self.history_of_actions}")
-            self.history_of_actions.append(("request", process, target_resource))
+            self.apply_request(process, target_resource)
+            self.timeline.record("request", process, target_resource)
+            log_event(logger, "request", process=process, resource=target_resource, position=self.timeline.position)
+            self.restore_detection_result()
             self.sound_manager.play_request_sound()
-            self.main_canvas.delete(self.process_items[process])
-            self.center_items.remove(self.process_items[process])
-            del self.process_items[process]
-            self.show_requests()
+            self.refresh_visualization()
         else:
             self.reset_process_position(process)
 
     def reset_resource_position(self, resource):
         """Resets a resource to its original position."""
         if resource in self.resource_items:
-            original_x = self.left_part_width + 50 + (int(resource[1:]) - 1) * 80 - self.left_part_width
-            original_y = 200
+            original_x, original_y = self.home_positions[resource]
             self.main_canvas.coords(self.resource_items[resource], original_x, original_y)
-            self.resource_locations[resource] = (original_x, original_y)
+            self.resource_index.move(resource, original_x, original_y)
 
     def reset_process_position(self, process):
         """Resets a process to its original position."""
         if process in self.process_items:
-            original_x = self.left_part_width + 50 + (int(process[1:]) - 1) * 80 - self.left_part_width
-            original_y = 100
+            original_x, original_y = self.home_positions[process]
             self.main_canvas.coords(self.process_items[process], original_x, original_y)
-            self.process_locations[process] = (original_x, original_y)
-
-    def show_allocations(self):
-        """Displays the current allocations in the left panel."""
-        for widget in self.left_inner_area.winfo_children():
-            widget.destroy()
-        self.allocation_labels = []
-
-        for process in self.resources_held:
-            for resource in self.resources_held[process]:
-                text = f"{self.process_icon} <------- {self.resource_icon} ({process} <- {resource})"
-                label = tk.Label(self.left_inner_area, text=text, font=("Arial", 10), bg="#E6F0FA", fg="#2E3A59")
-                label.pack(anchor="center", pady=5)
-                self.allocation_labels.append(label)
-
-        self.left_inner_area.update_idletasks()
-        self.left_canvas.configure(scrollregion=self.left_canvas.bbox("all"))
-
-    def show_requests(self):
-        """Displays the current requests in the right panel."""
-        for widget in self.right_inner_area.winfo_children():
-            widget.destroy()
-        self.request_labels = []
-
-        for process in self.resources_wanted:
-            for resource in self.resources_wanted[process]:
-                text = f"{self.process_icon} -------> {self.resource_icon} ({process} -> {resource})"
-                label = tk.Label(self.right_inner_area, text=text, font=("Arial", 10), bg="#E6F0FA", fg="#2E3A59")
-                label.pack(anchor="center", pady=5)
-                self.request_labels.append(label)
-
-        self.right_inner_area.update_idletasks()
-        self.right_canvas.configure(scrollregion=self.right_canvas.bbox("all"))
+            self.process_index.move(process, original_x, original_y)
+
+    def allocation_text(self, process, resource):
+        """Returns the allocation panel row of an edge."""
+        return f"{self.process_icon} <------- {self.resource_icon} ({process} <- {resource})"
+
+    def request_text(self, process, resource):
+        """Returns the request panel row of an edge."""
+        return f"{self.process_icon} -------> {self.resource_icon} ({process} -> {resource})"
+
+    def bind_node(self, name, drop_handler=None):
+        """Binds the tooltip of a canvas node and, with a drop handler, makes it draggable.
+
+        Canvas bindings belong to the node's tag, so they survive hiding, moving and re-creating its item.
+        """
+        canvas = self.main_canvas
+        if drop_handler is not None:
+            canvas.tag_bind(name, "<Button-1>", lambda event: self.start_dragging(event, name))
+            canvas.tag_bind(name, "<B1-Motion>", lambda event: self.drag_item(event, name))
+            canvas.tag_bind(name, "<ButtonRelease-1>", lambda event: drop_handler(event, name))
+        else:
+            for sequence in ("<Button-1>", "<B1-Motion>", "<ButtonRelease-1>"):
+                canvas.tag_unbind(name, sequence)
+        canvas.tag_bind(name, "<Motion>", lambda event: self.show_info(event, name))
+
+    def hide_node(self, name):
+        """Hides a node that was dropped; it keeps its item and bindings for undo/redo."""
+        items, index = (self.process_items, self.process_index) if name.startswith("P") else \
+            (self.resource_items, self.resource_index)
+        self.main_canvas.itemconfigure(items[name], state="hidden")
+        index.remove(name)
+
+    def show_node(self, name):
+        """Shows a hidden node again at its laid-out position."""
+        items, index = (self.process_items, self.process_index) if name.startswith("P") else \
+            (self.resource_items, self.resource_index)
+        x, y = self.home_positions[name]
+        self.main_canvas.coords(items[name], x, y)
+        self.main_canvas.itemconfigure(items[name], state="normal")
+        index.move(name, x, y)
+
+    def apply_allocation(self, process, resource):
+        """Allocates a resource to a process: state, reverse index, panel and canvas."""
+        self.resources_held[process].append(resource)
+        self.resource_holder[resource] = process
+        self.live_detector.add_allocation(process, resource)
+        self.allocation_list.add((process, resource), self.allocation_text(process, resource))
+        if self.current_phase == "allocation":
+            self.hide_node(resource)
+        else:
+            self.main_canvas.itemconfigure(self.resource_items[resource], fill="red")  # As drawn by show_request_phase
+
+    def revert_allocation(self, process, resource):
+        """Undoes apply_allocation()."""
+        self.resources_held[process].remove(resource)
+        del self.resource_holder[resource]
+        self.live_detector.release(process, resource)
+        self.allocation_list.remove((process, resource))
+        if self.current_phase == "allocation":
+            self.show_node(resource)
+        else:
+            self.main_canvas.itemconfigure(self.resource_items[resource], fill="green")
+
+    def apply_request(self, process, resource):
+        """Makes a process request a resource: state, reverse index, panel and canvas."""
+        self.resources_wanted[process].append(resource)
+        self.resource_requesters.setdefault(resource, []).append(process)
+        self.live_detector.add_request(process, resource)
+        self.request_list.add((process, resource), self.request_text(process, resource))
+        if self.current_phase == "request":
+            self.hide_node(process)
+
+    def revert_request(self, process, resource):
+        """Undoes apply_request()."""
+        self.resources_wanted[process].remove(resource)
+        self.resource_requesters[resource].remove(process)
+        self.live_detector.withdraw_request(process, resource)
+        self.request_list.remove((process, resource))
+        if self.current_phase == "request":
+            self.show_node(process)
 
     def undo_last_action(self):
         """Undoes the last allocation or request action."""
-        if not self.history_of_actions:
+        if not self.timeline.can_undo():
             messagebox.showinfo("Info", "Nothing to undo.", parent=self.new_window)
             return
 
-        action_type, process, resource = self.history_of_actions.pop()
-        print(f"Undoing: {action_type}, {process}, {resource}")
+        action_type, process, resource = self.timeline.undo()
+        log_event(logger, "undo", action=action_type, process=process, resource=resource, position=self.timeline.position)
         if action_type == "allocation":
-            self.resources_held[process].remove(resource)
-            self.show_allocations()
-            original_x = self.left_part_width + 50 + (int(resource[1:]) - 1) * 80 - self.left_part_width
-            original_y = 200
-            resource_text = self.main_canvas.create_text(original_x, original_y, text=f"{resource} {self.resource_icon}",
-                                                        font=("Arial", 14), tags=resource, fill="#1A3C34")
-            self.resource_locations[resource] = (original_x, original_y)
-            self.resource_items[resource] = resource_text
-            self.center_items.append(resource_text)
-            if self.current_phase == "allocation":
-                self.main_canvas.tag_bind(resource, "<Button-1>", lambda event, r=resource: self.start_dragging(event, r))
-                self.main_canvas.tag_bind(resource, "<B1-Motion>", lambda event, r=resource: self.drag_item(event, r))
-                self.main_canvas.tag_bind(resource, "<ButtonRelease-1>", lambda event, r=resource: self.drop_for_allocation(event, r))
-                self.main_canvas.tag_bind(resource, "<Motion>", lambda event, r=resource: self.show_info(event, r))
+            self.revert_allocation(process, resource)
         else:
-            self.resources_wanted[process].remove(resource)
-            self.show_requests()
-            original_x = self.left_part_width + 50 + (int(process[1:]) - 1) * 80 - self.left_part_width
-            original_y = 100
-            process_text = self.main_canvas.create_text(original_x, original_y, text=f"{process} {self.process_icon}",
-                                                       font=("Arial", 14), tags=process, fill="#1A3C34")
-            self.process_locations[process] = (original_x, original_y)
-            self.process_items[process] = process_text
-            self.center_items.append(process_text)
-            if self.current_phase == "request":
-                self.main_canvas.tag_bind(process, "<Button-1>", lambda event, p=process: self.start_dragging(event, p))
-                self.main_canvas.tag_bind(process, "<B1-Motion>", lambda event, p=process: self.drag_item(event, p))
-                self.main_canvas.tag_bind(process, "<ButtonRelease-1>", lambda event, p=process: self.drop_for_request(event, p))
-                self.main_canvas.tag_bind(process, "<Motion>", lambda event, p=process: self.show_info(event, p))
-        print(f"After undo: held={self.resources_held}, wanted={self.resources_wanted}")
+            self.revert_request(process, resource)
+        self.restore_detection_result()
+        self.refresh_visualization()
+
+    def redo_last_action(self):
+        """Redoes the last undone allocation or request action."""
+        if not self.timeline.can_redo():
+            messagebox.showinfo("Info", "Nothing to redo.", parent=self.new_window)
+            return
+
+        action_type, process, resource = self.timeline.redo()
+        log_event(logger, "redo", action=action_type, process=process, resource=resource, position=self.timeline.position)
+        if action_type == "allocation":
+            self.apply_allocation(process, resource)
+        else:
+            self.apply_request(process, resource)
+        self.restore_detection_result()
+        self.refresh_visualization()
+
+    def restore_detection_result(self):
+        """Brings the highlighted deadlock cycle up to date after the state changed.
+
+        A state that was already detected shows the cycle of that detection; otherwise the cycle comes
+        from the live incremental detector (None when the state is deadlock-free).
+        """
+        result = self.timeline.current.result
+        self.last_cycle = result[2] if result is not None else self.live_detector.cycle
+        self.refresh_history()
+
+    def jump_to(self, position):
+        """Moves to any state of the timeline in one step, from its snapshot instead of replaying the actions."""
+        self.timeline.goto(position)
+        log_event(logger, "jump", position=position)
+        held, wanted = self.timeline.state()
+        self.resources_held.update(held)
+        self.resources_wanted.update(wanted)
+        self.resource_holder = {r: p for p, resources in held.items() for r in resources}
+        self.resource_requesters = {}
+        for process, resources in wanted.items():
+            for resource in resources:
+                self.resource_requesters.setdefault(resource, []).append(process)
+        self.allocation_list.set_rows(((p, r), self.allocation_text(p, r)) for p, resources in held.items()
+                                      for r in resources)
+        self.request_list.set_rows(((p, r), self.request_text(p, r)) for p, resources in wanted.items()
+                                   for r in resources)
+        self.live_detector = self.new_live_detector()
+        if self.current_phase == "allocation":
+            self.show_allocation_phase(self.total_processes, self.total_resources)
+        else:
+            self.show_request_phase(self.total_processes, self.total_resources)
+        self.restore_detection_result()
+        self.refresh_visualization()
+
+    def show_history(self):
+        """Opens a list of every state of the timeline; selecting one jumps to it."""
+        if not hasattr(self, "timeline"):
+            return  # No canvas yet
+        if self.history_list is not None and self.history_list.winfo_exists():
+            self.history_list.winfo_toplevel().lift()
+            return
+        window = tk.Toplevel(self.new_window)
+        window.title("History")
+        window.geometry("320x400")
+        scrollbar = tk.Scrollbar(window, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.history_list = tk.Listbox(window, font=("Arial", 11), activestyle="none", yscrollcommand=scrollbar.set)
+        self.history_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.history_list.yview)
+        self.history_list.bind("<<ListboxSelect>>", self._on_history_select)
+        self.refresh_history()
+
+    def refresh_history(self):
+        """Updates the open History window to the timeline."""
+        if self.history_list is None or not self.history_list.winfo_exists():
+            return
+        history = self.history_list
+        history.delete(0, tk.END)
+        for i, snapshot in enumerate(self.timeline.snapshots):
+            if snapshot.action is None:
+                history.insert(tk.END, "0. Start")
+            else:
+                action, process, resource = snapshot.action
+                arrow = "<-" if action == "allocation" else "->"
+                history.insert(tk.END, f"{i}. {action.capitalize()}: {process} {arrow} {resource}")
+        history.selection_set(self.timeline.position)
+        history.see(self.timeline.position)
+
+    def _on_history_select(self, event):
+        selection = self.history_list.curselection()
+        if selection and selection[0] != self.timeline.position:
+            self.jump_to(selection[0])
 
     def go_to_request_phase(self):
         """Switches to the request phase."""
         self.current_phase = "request"
-        num_processes = len(self.resources_held)
-        all_resources = set()
-        for resources in self.resources_held.values():
-            for r in resources:
-                all_resources.add(r)
-        for resources in self.resources_wanted.values():
-            for r in resources:
-                all_resources.add(r)
-        num_resources = len(all_resources)
-        self.show_request_phase(num_processes, num_resources)
+        # Every resource is laid out, so undo/redo of any allocation finds its item
+        self.show_request_phase(self.total_processes, self.total_resources)
         self.button_finish.config(text="Finish Request Allocation", command=self.finish_all)
 
     def finish_all(self):
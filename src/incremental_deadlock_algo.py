@@ -0,0 +1,239 @@
+class IncrementalDeadlockDetector:
+    """An online deadlock detector for single-instance resources.
+
+    Instead of rebuilding the Resource Allocation Graph (RAG) and running a full DFS on every
+    check, this detector keeps the RAG alive and maintains a dynamic topological order of it
+    (Pearce-Kelly). Inserting an edge that respects the current order costs O(1); otherwise only
+    the region of the graph between the two endpoints is searched and reordered. A cycle, and
+    therefore a deadlock, is reported the moment an edge closes one.
+
+    Edges that would close a cycle are kept aside as "blocked" edges so the order stays valid for
+    the rest of the graph. When an edge is released or withdrawn, only the blocked edges whose
+    recorded cycle ran through it are retried. The system is deadlocked exactly when at least one
+    blocked edge remains.
+
+    Args:
+        resources_held (dict, optional): Initial mapping of processes to the resources they hold.
+        resources_wanted (dict, optional): Initial mapping of processes to the resources they request.
+
+    Raises:
+        ValueError: If the initial state is invalid (e.g., a resource allocated to two processes).
+    """
+    def __init__(self, resources_held=None, resources_wanted=None):
+        self.resources_held = {}
+        self.resources_wanted = {}
+        self.holder = {}  # resource -> process holding it
+        self.cycle = None  # The most recently detected cycle
+        self._order = {}  # node -> position in the topological order
+        self._next_order = 0
+        self._successors = {}
+        self._predecessors = {}
+        self._blocked_edges = {}  # (u, v) -> cycle closed by the edge
+        self._dependents = {}  # inserted edge -> blocked edges whose recorded cycle uses it
+        for process, resources in (resources_held or {}).items():
+            self.add_process(process)
+            for resource in resources:
+                self.add_allocation(process, resource)
+        for process, resources in (resources_wanted or {}).items():
+            self.add_process(process)
+            for resource in resources:
+                self.add_request(process, resource)
+
+    def add_process(self, process):
+        """Registers a process with no allocations or requests."""
+        if process not in self.resources_held:
+            self.resources_held[process] = []
+            self.resources_wanted[process] = []
+            self._add_node(process)
+
+    def add_resource(self, resource):
+        """Registers a resource that is not held or requested yet."""
+        self._add_node(resource)
+
+    def add_allocation(self, process, resource):
+        """Allocates a resource to a process (edge Resource -> Process).
+
+        If the process was requesting the resource, the request is granted and withdrawn.
+
+        Returns:
+            list: The deadlock cycle closed by this allocation, or None.
+
+        Raises:
+            ValueError: If the resource is already allocated.
+        """
+        holder = self.holder.get(resource)
+        if holder is not None:
+            raise ValueError(f"Resource {resource} is allocated to multiple processes")
+        self.add_process(process)
+        self.add_resource(resource)
+        if resource in self.resources_wanted[process]:
+            self.withdraw_request(process, resource)
+        self.resources_held[process].append(resource)
+        self.holder[resource] = process
+        return self._insert_edge(resource, process)
+
+    def add_request(self, process, resource):
+        """Records that a process requests a resource (edge Process -> Resource).
+
+        Returns:
+            list: The deadlock cycle closed by this request, or None.
+
+        Raises:
+            ValueError: If the process already holds or already requested the resource.
+        """
+        self.add_process(process)
+        self.add_resource(resource)
+        if self.holder.get(resource) == process:
+            raise ValueError(f"Invalid state: {process} requests {resource} which it already holds.")
+        if resource in self.resources_wanted[process]:
+            raise ValueError(f"{process} already requested {resource}.")
+        self.resources_wanted[process].append(resource)
+        return self._insert_edge(process, resource)
+
+    def release(self, process, resource):
+        """Releases a resource held by a process.
+
+        Returns:
+            list: A cycle that is still present after the release, or None.
+
+        Raises:
+            ValueError: If the process does not hold the resource.
+        """
+        if self.holder.get(resource) != process:
+            raise ValueError(f"{process} does not hold {resource}.")
+        self.resources_held[process].remove(resource)
+        del self.holder[resource]
+        return self._remove_edge(resource, process)
+
+    def withdraw_request(self, process, resource):
+        """Withdraws a pending request of a process.
+
+        Returns:
+            list: A cycle that is still present after the withdrawal, or None.
+
+        Raises:
+            ValueError: If the process is not requesting the resource.
+        """
+        if resource not in self.resources_wanted.get(process, []):
+            raise ValueError(f"{process} is not requesting {resource}.")
+        self.resources_wanted[process].remove(resource)
+        return self._remove_edge(process, resource)
+
+    def has_deadlock(self):
+        """Returns True if the current graph contains a cycle."""
+        return bool(self._blocked_edges)
+
+    def detect_deadlock(self):
+        """Reports the current deadlock status without rebuilding anything.
+
+        Returns:
+            tuple: (bool, str) where the bool indicates if a deadlock was found, and the str is a message.
+        """
+        if self._blocked_edges:
+            return True, f"A deadlock has been detected involving: {self.cycle}"
+        return False, "No deadlock detected in the system."
+
+    def adjacency(self):
+        """Returns the current RAG as an adjacency list ({'P1': ['R2'], 'R1': ['P1'], ...}).
+
+        Built from the live graph, including the edges held aside as blocked, so nothing is
+        validated or interned again.
+        """
+        graph = {node: list(successors) for node, successors in self._successors.items()}
+        for u, v in self._blocked_edges:
+            graph[u].append(v)
+        return graph
+
+    def _add_node(self, node):
+        if node not in self._order:
+            self._order[node] = self._next_order
+            self._next_order += 1
+            self._successors[node] = set()
+            self._predecessors[node] = set()
+
+    def _insert_edge(self, u, v):
+        """Inserts u -> v, keeping the topological order, or blocks the edge if it closes a cycle."""
+        cycle = self._try_insert_edge(u, v)
+        if cycle is not None:
+            self._blocked_edges[(u, v)] = cycle
+            for edge in zip(cycle[1:], cycle[2:]):
+                self._dependents.setdefault(edge, set()).add((u, v))
+            self.cycle = cycle
+        return cycle
+
+    def _remove_edge(self, u, v):
+        cycle = self._blocked_edges.pop((u, v), None)
+        if cycle is not None:
+            self._forget_dependencies((u, v), cycle)
+        else:
+            # Removing an edge never invalidates a topological order, and blocked edges whose
+            # recorded cycle does not use this edge are still blocked.
+            self._successors[u].discard(v)
+            self._predecessors[v].discard(u)
+            for blocked in self._dependents.pop((u, v), ()):
+                self._forget_dependencies(blocked, self._blocked_edges.pop(blocked))
+                self._insert_edge(*blocked)
+        # Cycles of the remaining blocked edges only use inserted edges, so they are still valid.
+        self.cycle = next(reversed(self._blocked_edges.values()), None)
+        return self.cycle
+
+    def _forget_dependencies(self, blocked, cycle):
+        for edge in zip(cycle[1:], cycle[2:]):
+            dependents = self._dependents.get(edge)
+            if dependents is not None:
+                dependents.discard(blocked)
+                if not dependents:
+                    del self._dependents[edge]
+
+    def _try_insert_edge(self, u, v):
+        """Pearce-Kelly insertion. Returns the closed cycle, or None if the edge was inserted."""
+        order = self._order
+        lower, upper = order[v], order[u]
+        if lower > upper:
+            self._successors[u].add(v)
+            self._predecessors[v].add(u)
+            return None
+
+        # Forward search from v over nodes that sit before u in the order.
+        parent = {v: None}
+        forward = [v]
+        stack = [v]
+        while stack:
+            node = stack.pop()
+            for neighbor in self._successors[node]:
+                position = order[neighbor]
+                if position == upper:
+                    # Reached u again: u -> v -> ... -> node -> u is a cycle.
+                    path = [node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return [u] + path + [u]
+                if position < upper and neighbor not in parent:
+                    parent[neighbor] = node
+                    forward.append(neighbor)
+                    stack.append(neighbor)
+
+        # Backward search from u over nodes that sit after v in the order.
+        seen = {u}
+        backward = [u]
+        stack = [u]
+        while stack:
+            node = stack.pop()
+            for neighbor in self._predecessors[node]:
+                if order[neighbor] > lower and neighbor not in seen:
+                    seen.add(neighbor)
+                    backward.append(neighbor)
+                    stack.append(neighbor)
+
+        # Reorder: everything that reaches u must come before everything reachable from v.
+        backward.sort(key=order.__getitem__)
+        forward.sort(key=order.__getitem__)
+        affected = backward + forward
+        positions = sorted(order[node] for node in affected)
+        for node, position in zip(affected, positions):
+            order[node] = position
+
+        self._successors[u].add(v)
+        self._predecessors[v].add(u)
+        return None
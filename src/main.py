@@ -1,17 +1,32 @@
-import tkinter as tk
 import os
+import sys
 import argparse
-from gui import DeadlockDetectionGUI
-from sound_manager import SoundManager
 
-def main():
-    """Entry point for the Deadlock Detection Tool."""
-    parser = argparse.ArgumentParser(description="Deadlock Detection Tool")
+HEADLESS_COMMANDS = ("detect", "export", "monitor")
+
+
+def run_gui(argv):
+    """Starts the Tkinter application with sound effects."""
+    import tkinter as tk
+    from gui import DeadlockDetectionGUI
+    from sound_manager import SoundManager
+    from app_logging import LOG_LEVEL_ENV, configure_logging, get_logger, log_event
+
+    parser = argparse.ArgumentParser(description="Deadlock Detection Tool",
+                                     epilog="Headless use: main.py detect STATE.json | main.py export STATE.json | "
+                                            "main.py monitor EVENTS.jsonl")
     parser.add_argument("--allocate-sound", default="assets/allocate_sound.wav", help="Path to allocate sound")
     parser.add_argument("--request-sound", default="assets/request_sound.wav", help="Path to request sound")
     parser.add_argument("--deadlock-sound", default="assets/deadlock_sound.wav", help="Path to deadlock sound")
     parser.add_argument("--safe-sound", default="assets/safe_sound.wav", help="Path to safe state sound")
-    args = parser.parse_args()
+    parser.add_argument("--log-level", choices=("debug", "info", "warning", "error"),
+                        default=os.environ.get(LOG_LEVEL_ENV, "").lower() or None,
+                        help=f"Log to stderr from this level on (default: ${LOG_LEVEL_ENV}, otherwise warnings only)")
+    parser.add_argument("--log-file", help="Also append the log to this file")
+    args = parser.parse_args(argv)
+    if args.log_level or args.log_file:
+        configure_logging(args.log_level or "warning", args.log_file)
+    logger = get_logger(__name__)
 
     base_dir = os.path.dirname(os.path.abspath(__file__))
     allocate_sound_path = os.path.join(base_dir, "..", args.allocate_sound)
@@ -19,17 +34,13 @@ def main():
     deadlock_sound_path = os.path.join(base_dir, "..", args.deadlock_sound)
     safe_sound_path = os.path.join(base_dir, "..", args.safe_sound)
 
-    # Print paths for debugging
-    print(f"Base directory: {base_dir}")
-    print(f"Allocate sound path: {allocate_sound_path}")
-    print(f"Request sound path: {request_sound_path}")
-    print(f"Deadlock sound path: {deadlock_sound_path}")
-    print(f"Safe sound path: {safe_sound_path}")
+    log_event(logger, "sound_paths", base_dir=base_dir, allocate=allocate_sound_path, request=request_sound_path,
+              deadlock=deadlock_sound_path, safe=safe_sound_path)
 
     # Verify files exist
     for path in [allocate_sound_path, request_sound_path, deadlock_sound_path, safe_sound_path]:
         if not os.path.exists(path):
-            print(f"Warning: File not found at {path}")
+            logger.warning("File not found at %s", path)
 
     sound_manager = SoundManager(allocate_sound_path, request_sound_path, deadlock_sound_path, safe_sound_path)
 
@@ -37,5 +48,18 @@ def main():
     app = DeadlockDetectionGUI(main_window, sound_manager)
     main_window.mainloop()
 
+
+def main():
+    """Entry point for the Deadlock Detection Tool.
+
+    'detect', 'export' and 'monitor' run headless and never import the GUI or sound modules ('export'
+    renders with matplotlib's non-interactive Agg/SVG backends); anything else starts the GUI.
+    """
+    argv = sys.argv[1:]
+    if argv and argv[0] in HEADLESS_COMMANDS:
+        from cli import main as cli_main
+        sys.exit(cli_main(argv))
+    run_gui(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
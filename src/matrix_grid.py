@@ -0,0 +1,321 @@
+import tkinter as tk
+from array import array
+
+
+class MatrixGrid(tk.Frame):
+    """A virtualized integer matrix editor.
+
+    The values live in one flat row-major array ('l'); only the cells that fit in the viewport are
+    drawn, as a fixed pool of canvas items that is relabelled when the view scrolls, so a
+    5,000 x 500 matrix costs the same to draw as a 10 x 10 one. Editing uses a single tk.Entry that
+    is placed over the clicked cell.
+
+    Keys while editing: Return/Down and Up move vertically, Tab/Shift-Tab move horizontally,
+    Escape cancels. Only non-negative integers are accepted.
+
+    Args:
+        parent (tk.Widget): The parent widget.
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        title (str): Heading shown above the grid.
+        bg (str): Background color of the frame and headers.
+        cell_bg (str or callable): Cell color, or a function col -> color.
+        row_label (callable, optional): row -> header text; defaults to 'P1', 'P2', ...
+        col_label (callable, optional): col -> header text; defaults to 'R1', 'R2', ...
+        describe (callable, optional): (row, col) -> hint shown while the pointer is over a cell.
+        cell_value (callable, optional): (row, col) -> value for a read-only computed grid; the grid
+            then has no backing array and cannot be edited.
+        default (int): Initial value of every cell.
+        on_change (callable, optional): (row, col) -> None, called after an edit changes a cell.
+    """
+    CELL_WIDTH = 56
+    CELL_HEIGHT = 26
+    HEADER_WIDTH = 64
+
+    def __init__(self, parent, rows, cols, title="", bg="#F3F4F6", cell_bg="white", row_label=None,
+                 col_label=None, describe=None, cell_value=None, default=0, on_change=None):
+        super().__init__(parent, bg=bg, bd=2, relief="groove")
+        self.rows = rows
+        self.cols = cols
+        self.bg = bg
+        self.cell_bg = cell_bg if callable(cell_bg) else (lambda col: cell_bg)
+        self.row_label = row_label or (lambda i: f"P{i+1}")
+        self.col_label = col_label or (lambda j: f"R{j+1}")
+        self.describe = describe
+        self.on_change = on_change
+        self.cell_value = cell_value
+        self.editable = cell_value is None
+        self.values = array("l", [default]) * (rows * cols) if self.editable else None
+        self.first_row = 0
+        self.first_col = 0
+        self.visible_rows = 0
+        self.visible_cols = 0
+        self.cells = []  # Pool of (rect, text) canvas items, visible_rows x visible_cols
+        self.row_headers = []
+        self.col_headers = []
+        self.shown = []  # Text currently displayed by each pooled cell, to skip unchanged updates
+        self.editor = None
+        self.edit_cell = None
+
+        if title:
+            tk.Label(self, text=title, font=("Helvetica", 14, "bold"), bg=bg, fg="#2E3A59").pack(side=tk.TOP, pady=5)
+        self.status = tk.Label(self, text="", font=("Arial", 9), bg=bg, fg="#2E3A59", anchor="w")
+        self.status.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+        self.hbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.xview)
+        self.hbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.vbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.vbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0,
+                                height=min(rows, 8) * self.CELL_HEIGHT + self.CELL_HEIGHT)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", lambda e: self.status.config(text=""))
+        self.canvas.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self.xview("scroll", -1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        self.canvas.bind("<Shift-Button-4>", lambda e: self.xview("scroll", -1, "units"))
+        self.canvas.bind("<Shift-Button-5>", lambda e: self.xview("scroll", 1, "units"))
+
+    # --- Data access ---
+
+    def get(self, row, col):
+        """Returns the value of a cell."""
+        if self.editable:
+            return self.values[row * self.cols + col]
+        return self.cell_value(row, col)
+
+    def set(self, row, col, value):
+        """Sets the value of a cell and redraws it if it is visible."""
+        self.values[row * self.cols + col] = value
+        self.refresh()
+
+    def row(self, row):
+        """Returns a copy of one row of the backing array."""
+        return self.values[row * self.cols:(row + 1) * self.cols]
+
+    def column_sums(self):
+        """Returns the sum of every column."""
+        return [sum(self.values[j::self.cols]) for j in range(self.cols)]
+
+    def fill(self, value):
+        """Sets every cell to the same value."""
+        self.cancel_edit()
+        self.values = array("l", [value]) * (self.rows * self.cols)
+        self.refresh()
+
+    def load(self, values):
+        """Replaces every cell with values (row-major, rows * cols integers)."""
+        values = array("l", values)
+        if len(values) != self.rows * self.cols:
+            raise ValueError(f"Expected {self.rows * self.cols} values, got {len(values)}.")
+        self.cancel_edit()
+        self.values = values
+        self.refresh()
+
+    # --- Scrolling ---
+
+    def yview(self, *args):
+        """Scrollbar/wheel handler for rows (same protocol as tk.Canvas.yview)."""
+        self.first_row = self._scroll(args, self.first_row, self.rows, self.visible_rows)
+        self.refresh()
+
+    def xview(self, *args):
+        """Scrollbar/wheel handler for columns (same protocol as tk.Canvas.xview)."""
+        self.first_col = self._scroll(args, self.first_col, self.cols, self.visible_cols)
+        self.refresh()
+
+    def see(self, row, col):
+        """Scrolls so that a cell is visible."""
+        self.first_row = self._reveal(self.first_row, row, self.visible_rows, self.rows)
+        self.first_col = self._reveal(self.first_col, col, self.visible_cols, self.cols)
+        self.refresh()
+
+    @staticmethod
+    def _reveal(first, index, visible, total):
+        full = max(1, visible - 1)  # The last pooled row/column may be cut off by the viewport edge
+        if index < first:
+            first = index
+        elif index >= first + full:
+            first = index - full + 1
+        return max(0, min(first, total - full))
+
+    def _scroll(self, args, first, total, visible):
+        if args[0] == "moveto":
+            first = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            step = int(args[1]) * (max(1, visible - 1) if args[2] == "pages" else 1)
+            first += step
+        if not self.commit_edit():
+            self.cancel_edit()  # The editor would no longer sit over its cell
+        return max(0, min(first, total - max(1, visible - 1)))
+
+    # --- Drawing ---
+
+    def _on_resize(self, event):
+        """Rebuilds the item pool for the new viewport size."""
+        visible_rows = min(self.rows, max(1, (event.height - self.CELL_HEIGHT) // self.CELL_HEIGHT + 1))
+        visible_cols = min(self.cols, max(1, (event.width - self.HEADER_WIDTH) // self.CELL_WIDTH + 1))
+        if (visible_rows, visible_cols) == (self.visible_rows, self.visible_cols):
+            return
+        if not self.commit_edit():
+            self.cancel_edit()
+        self.visible_rows = visible_rows
+        self.visible_cols = visible_cols
+        canvas = self.canvas
+        canvas.delete("all")
+        w, h, hw = self.CELL_WIDTH, self.CELL_HEIGHT, self.HEADER_WIDTH
+        self.col_headers = [canvas.create_text(hw + c * w + w // 2, h // 2, font=("Arial", 11, "bold"))
+                            for c in range(self.visible_cols)]
+        self.row_headers = [canvas.create_text(hw // 2, h + r * h + h // 2, font=("Arial", 11, "bold"))
+                            for r in range(self.visible_rows)]
+        self.cells = []
+        for r in range(self.visible_rows):
+            y = h + r * h
+            for c in range(self.visible_cols):
+                x = hw + c * w
+                rect = canvas.create_rectangle(x + 2, y + 2, x + w - 2, y + h - 2, outline="#9E9E9E")
+                text = canvas.create_text(x + w // 2, y + h // 2, font=("Arial", 11))
+                self.cells.append((rect, text))
+        self.shown = [None] * len(self.cells)
+        self.first_row = min(self.first_row, max(0, self.rows - self.visible_rows))
+        self.first_col = min(self.first_col, max(0, self.cols - self.visible_cols))
+        self.refresh()
+
+    def refresh(self):
+        """Redraws the visible cells from the backing data."""
+        canvas = self.canvas
+        first_row, first_col = self.first_row, self.first_col
+        for c, item in enumerate(self.col_headers):
+            col = first_col + c
+            canvas.itemconfigure(item, text=self.col_label(col) if col < self.cols else "")
+        for r, item in enumerate(self.row_headers):
+            row = first_row + r
+            canvas.itemconfigure(item, text=self.row_label(row) if row < self.rows else "")
+        shown = self.shown
+        index = 0
+        for r in range(self.visible_rows):
+            row = first_row + r
+            for c in range(self.visible_cols):
+                col = first_col + c
+                inside = row < self.rows and col < self.cols
+                text = str(self.get(row, col)) if inside else ""
+                key = (text, col if inside else -1)
+                if shown[index] != key:
+                    shown[index] = key
+                    rect, text_item = self.cells[index]
+                    canvas.itemconfigure(text_item, text=text)
+                    canvas.itemconfigure(rect, fill=self.cell_bg(col) if inside else self.bg,
+                                         state="normal" if inside else "hidden")
+                index += 1
+        self.vbar.set(*self._fractions(first_row, self.visible_rows, self.rows))
+        self.hbar.set(*self._fractions(first_col, self.visible_cols, self.cols))
+
+    @staticmethod
+    def _fractions(first, visible, total):
+        return first / total, min(1.0, (first + visible) / total)
+
+    def _cell_at(self, x, y):
+        """Returns the (row, col) under a canvas position, or None over the headers or outside the data."""
+        if x < self.HEADER_WIDTH or y < self.CELL_HEIGHT:
+            return None
+        row = self.first_row + int((y - self.CELL_HEIGHT) // self.CELL_HEIGHT)
+        col = self.first_col + int((x - self.HEADER_WIDTH) // self.CELL_WIDTH)
+        if row >= self.rows or col >= self.cols:
+            return None
+        return row, col
+
+    def _on_motion(self, event):
+        cell = self._cell_at(event.x, event.y)
+        if cell is None:
+            self.status.config(text="")
+        elif self.describe is not None:
+            self.status.config(text=self.describe(*cell))
+        else:
+            self.status.config(text=f"{self.row_label(cell[0])}, {self.col_label(cell[1])}")
+
+    # --- Editing ---
+
+    def _on_click(self, event):
+        cell = self._cell_at(event.x, event.y)
+        if cell is not None and self.editable:
+            self.commit_edit()
+            self.begin_edit(*cell)
+
+    def begin_edit(self, row, col):
+        """Places the editor over a cell (scrolling it into view first)."""
+        self.see(row, col)
+        if self.editor is None:
+            self.editor = tk.Entry(self.canvas, width=5, justify="center", font=("Arial", 11))
+            self.editor.bind("<Return>", lambda e: self._move(1, 0))
+            self.editor.bind("<Down>", lambda e: self._move(1, 0))
+            self.editor.bind("<Up>", lambda e: self._move(-1, 0))
+            self.editor.bind("<Tab>", lambda e: self._move(0, 1))
+            self.editor.bind("<Shift-Tab>", lambda e: self._move(0, -1))
+            self.editor.bind("<ISO_Left_Tab>", lambda e: self._move(0, -1))
+            self.editor.bind("<Escape>", lambda e: self.cancel_edit())
+            self.editor.bind("<KeyRelease>", lambda e: self._validate())
+            self.editor.bind("<FocusOut>", lambda e: self.commit_edit())
+        x = self.HEADER_WIDTH + (col - self.first_col) * self.CELL_WIDTH
+        y = self.CELL_HEIGHT + (row - self.first_row) * self.CELL_HEIGHT
+        self.editor.place(x=x + 2, y=y + 2, width=self.CELL_WIDTH - 4, height=self.CELL_HEIGHT - 4)
+        self.editor.delete(0, tk.END)
+        self.editor.insert(0, str(self.get(row, col)))
+        self.editor.select_range(0, tk.END)
+        self.editor.config(bg="white")
+        self.editor.focus_set()
+        self.edit_cell = (row, col)
+
+    def commit_edit(self):
+        """Stores the editor's value. Returns False (and keeps editing) if it is not a non-negative integer."""
+        if self.edit_cell is None:
+            return True
+        value = self._parse(self.editor.get())
+        if value is None:
+            self.editor.config(bg="#FFCDD2")
+            self.bell()
+            return False
+        row, col = self.edit_cell
+        self.edit_cell = None
+        self.editor.place_forget()
+        index = row * self.cols + col
+        if self.values[index] != value:
+            self.values[index] = value
+            self.refresh()
+            if self.on_change is not None:
+                self.on_change(row, col)
+        return True
+
+    def cancel_edit(self):
+        """Closes the editor without storing its value."""
+        if self.edit_cell is not None:
+            self.edit_cell = None
+            self.editor.place_forget()
+
+    def _move(self, d_row, d_col):
+        """Commits the edit and moves the editor to a neighbouring cell."""
+        if self.edit_cell is None:
+            return "break"  # The hidden editor can keep the focus after a commit or cancel
+        row, col = self.edit_cell
+        if self.commit_edit():
+            self.begin_edit(min(max(row + d_row, 0), self.rows - 1), min(max(col + d_col, 0), self.cols - 1))
+        return "break"
+
+    def _validate(self):
+        """Colors the editor red while its text is not a non-negative integer."""
+        text = self.editor.get()
+        self.editor.config(bg="white" if text == "" or self._parse(text) is not None else "#FFCDD2")
+
+    @staticmethod
+    def _parse(text):
+        text = text.strip()
+        if text == "":
+            return 0  # Empty cells count as 0, as before
+        try:
+            value = int(text)
+        except ValueError:
+            return None
+        return value if 0 <= value < 2**31 else None
@@ -0,0 +1,181 @@
+import os
+import numpy as np
+from collections import namedtuple
+
+# A multi-instance state as arrays: allocation and max are (processes x resources), total is (resources,).
+# processes/resources are name lists, or None for the default 'P1', 'R1', ... names.
+MatrixState = namedtuple("MatrixState", ["allocation", "max", "total", "processes", "resources"])
+
+MATRIX_NAMES = ("allocation", "max", "total")
+
+
+def load_matrices(path, mmap=True):
+    """Loads the Allocation, Max and Total data of a multi-instance state.
+
+    Formats:
+        - CSV (.csv): a header "matrix,process,R1,...,Rn", then one "total," row, the
+          "allocation,P..." rows and the "max,P..." rows.
+        - NPZ (.npz): arrays "allocation", "max" and "total" (plus optional "processes"/"resources").
+        - NPY directory: allocation.npy, max.npy and total.npy (plus optional processes.npy and
+          resources.npy). These are opened memory-mapped (read-only), so snapshots of any size load
+          instantly and are paged in as the detector reads them. Passing one of the files selects
+          its directory.
+
+    Args:
+        path (str): The file or directory.
+        mmap (bool): Memory-map .npy files instead of reading them.
+
+    Returns:
+        MatrixState: The loaded matrices.
+
+    Raises:
+        ValueError: If the data is missing a matrix or the shapes do not match.
+        OSError: If the file cannot be read.
+    """
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        state = _load_csv(path)
+    elif lower.endswith(".npz"):
+        with np.load(path) as data:
+            state = MatrixState(*(_require(data, name) for name in MATRIX_NAMES),
+                                _labels(data.get("processes")), _labels(data.get("resources")))
+    else:
+        directory = os.path.dirname(path) if lower.endswith(".npy") else path
+        mmap_mode = "r" if mmap else None
+
+        def read(name, required=True):
+            file_path = os.path.join(directory, f"{name}.npy")
+            if not os.path.exists(file_path):
+                if required:
+                    raise ValueError(f"Missing {name}.npy in {directory}")
+                return None
+            return np.load(file_path, mmap_mode=mmap_mode)
+        state = MatrixState(read("allocation"), read("max"), read("total"),
+                            _labels(read("processes", False)), _labels(read("resources", False)))
+    _check_shapes(state)
+    return state
+
+
+def save_matrices(path, allocation, max_matrix, total, processes=None, resources=None):
+    """Saves a multi-instance state in the format given by the path (see load_matrices).
+
+    A path ending in .csv or .npz writes that file; any other path is used as a directory of .npy files.
+
+    Args:
+        path (str): The output file or directory.
+        allocation (array-like): Allocation matrix, (processes x resources).
+        max_matrix (array-like): Max matrix, (processes x resources).
+        total (array-like): Total instances per resource.
+        processes (list, optional): Process names.
+        resources (list, optional): Resource names.
+    """
+    state = MatrixState(np.asarray(allocation), np.asarray(max_matrix), np.asarray(total), processes, resources)
+    _check_shapes(state)
+    lower = path.lower()
+    if lower.endswith(".csv"):
+        _save_csv(path, state)
+        return
+    arrays = {"allocation": state.allocation, "max": state.max, "total": state.total}
+    if processes is not None:
+        arrays["processes"] = np.array(processes)
+    if resources is not None:
+        arrays["resources"] = np.array(resources)
+    if lower.endswith(".npz"):
+        np.savez(path, **arrays)  # Uncompressed: loading is a straight read
+    else:
+        if lower.endswith(".npy"):
+            path = os.path.dirname(path)
+        os.makedirs(path, exist_ok=True)
+        for name, values in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), values)
+
+
+def load_detector(path):
+    """Loads a matrix file straight into a VectorizedMultiInstanceDeadlockDetector.
+
+    Available is derived as Total minus the column sums of Allocation; the matrices themselves are
+    used as loaded (memory-mapped for .npy directories), without building any dicts.
+
+    Returns:
+        VectorizedMultiInstanceDeadlockDetector: The detector.
+
+    Raises:
+        ValueError: If the file is invalid or more instances of a resource are allocated than exist.
+    """
+    from multi_deadlock_numpy import VectorizedMultiInstanceDeadlockDetector
+    state = load_matrices(path)
+    allocated = state.allocation.sum(axis=0)
+    available = state.total - allocated
+    over = np.flatnonzero(available < 0)
+    if over.size:
+        j = over[0]
+        resource = state.resources[j] if state.resources is not None else f"R{j+1}"
+        raise ValueError(f"Invalid data: Allocation of {resource} ({allocated[j]}) exceeds Total ({state.total[j]})")
+    return VectorizedMultiInstanceDeadlockDetector.from_arrays(state.allocation, state.max, available,
+                                                               state.processes, state.resources)
+
+
+def _load_csv(path):
+    """Reads the long-table CSV format in one pass of NumPy's C parser."""
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().strip().split(",")
+    if header[:2] != ["matrix", "process"] or len(header) < 3:
+        raise ValueError(f"{path}: expected a 'matrix,process,R1,...' header")
+    resources = header[2:]
+    # One record per row: the two name columns as str objects and the counts as one int64 subarray
+    row = np.dtype([("matrix", object), ("process", object), ("values", np.int64, (len(resources),))])
+    table = np.loadtxt(path, delimiter=",", skiprows=1, dtype=row, ndmin=1)
+    values = table["values"]
+    keys = np.stack([table["matrix"], table["process"]], axis=1) if len(table) else np.empty((0, 2), dtype=object)
+    kinds = keys[:, 0]
+    unknown = set(kinds.tolist()) - set(MATRIX_NAMES)
+    if unknown:
+        raise ValueError(f"{path}: unknown matrix name(s) {sorted(unknown)}")
+    is_total = kinds == "total"
+    if is_total.sum() != 1:
+        raise ValueError(f"{path}: expected exactly one 'total' row")
+    alloc_rows = kinds == "allocation"
+    max_rows = kinds == "max"
+    processes = keys[alloc_rows, 1].tolist()
+    if keys[max_rows, 1].tolist() != processes:
+        raise ValueError(f"{path}: the allocation and max rows must list the same processes in the same order")
+    return MatrixState(values[alloc_rows], values[max_rows], values[is_total][0],
+                       processes if processes != _default_names("P", len(processes)) else None,
+                       resources if resources != _default_names("R", len(resources)) else None)
+
+
+def _save_csv(path, state):
+    num_processes, num_resources = state.allocation.shape
+    processes = state.processes or _default_names("P", num_processes)
+    resources = state.resources or _default_names("R", num_resources)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(",".join(["matrix", "process"] + list(resources)) + "\n")
+        f.write("total,," + ",".join(map(str, state.total.tolist())) + "\n")
+        for name, matrix in (("allocation", state.allocation), ("max", state.max)):
+            for process, row in zip(processes, matrix.tolist()):
+                f.write(f"{name},{process}," + ",".join(map(str, row)) + "\n")
+
+
+def _require(data, name):
+    if name not in data:
+        raise ValueError(f"Missing '{name}' array")
+    return data[name]
+
+
+def _labels(values):
+    return None if values is None else [str(v) for v in values.tolist()]
+
+
+def _default_names(prefix, count):
+    return [f"{prefix}{i+1}" for i in range(count)]
+
+
+def _check_shapes(state):
+    allocation, max_matrix, total = state.allocation, state.max, state.total
+    if allocation.ndim != 2 or max_matrix.shape != allocation.shape or total.shape != (allocation.shape[1],):
+        raise ValueError("Allocation and Max must be (processes x resources) matrices of the same shape and "
+                         "Total must have one entry per resource.")
+    if state.processes is not None and len(state.processes) != allocation.shape[0]:
+        raise ValueError("The number of process names does not match the matrices.")
+    if state.resources is not None and len(state.resources) != allocation.shape[1]:
+        raise ValueError("The number of resource names does not match the matrices.")
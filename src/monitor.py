@@ -0,0 +1,141 @@
+import sys
+import json
+import time
+import argparse
+from incremental_deadlock_algo import IncrementalDeadlockDetector
+
+
+class DeadlockMonitor:
+    """Keeps a single-instance system up to date from a stream of events and reports deadlocks.
+
+    Each event is a dict such as {"op": "request", "process": "P1", "resource": "R2"} where op is
+    one of "allocate", "request", "release" or "withdraw". The state is updated in place through an
+    IncrementalDeadlockDetector, so each event only costs the work needed to keep the graph ordered,
+    and a deadlock is reported as soon as the event that closes the cycle arrives.
+
+    Args:
+        strict (bool): If True, invalid events raise ValueError instead of being reported as errors.
+    """
+    def __init__(self, strict=False):
+        self.detector = IncrementalDeadlockDetector()
+        self.resources_held = self.detector.resources_held  # Updated in place as events arrive
+        self.resources_wanted = self.detector.resources_wanted
+        self.strict = strict
+        self.events_seen = 0
+        self._handlers = {
+            "allocate": self.detector.add_allocation,
+            "request": self.detector.add_request,
+            "release": self.detector.release,
+            "withdraw": self.detector.withdraw_request,
+        }
+
+    def apply(self, event):
+        """Applies one event to the state.
+
+        Args:
+            event (dict): The event to apply.
+
+        Returns:
+            dict: An alert if the event created or resolved a deadlock or was invalid, otherwise None.
+        """
+        self.events_seen += 1
+        was_deadlocked = self.detector.has_deadlock()
+        try:
+            if not isinstance(event, dict):
+                raise ValueError(f"Event must be a JSON object, got {type(event).__name__}")
+            op = event.get("op")
+            handler = self._handlers.get(op) if isinstance(op, str) else None
+            if handler is None:
+                raise ValueError(f"Unknown event op: {op}")
+            process, resource = event["process"], event["resource"]
+            if not isinstance(process, str) or not isinstance(resource, str):
+                raise ValueError(f"Event process and resource must be strings, got {process!r} and {resource!r}")
+            cycle = handler(process, resource)
+        except (ValueError, KeyError, AttributeError) as e:
+            if self.strict:
+                raise ValueError(f"Invalid event {self.events_seen}: {e}") from e
+            return {"event": self.events_seen, "status": "error", "message": str(e)}
+
+        if cycle is not None and event["op"] in ("allocate", "request"):
+            # Only inserts can close a cycle; after a release the cycle returned is one that remains.
+            return {"event": self.events_seen, "status": "deadlock", "cycle": cycle}
+        if was_deadlocked and not self.detector.has_deadlock():
+            return {"event": self.events_seen, "status": "resolved"}
+        return None
+
+    def process_lines(self, lines):
+        """Applies a stream of JSON-lines events, parsing each line only when it is reached.
+
+        Args:
+            lines (iterable): Lines of text, one JSON event per line. Blank lines are skipped.
+
+        Yields:
+            dict: Alerts, in the order their events arrived.
+        """
+        # raw_decode skips the whitespace checks of json.loads; anything after the object must be whitespace.
+        decode = json.JSONDecoder().raw_decode
+        apply = self.apply
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                event, end = decode(line)
+                if end < len(line) and not line[end:].isspace():
+                    raise ValueError("Extra data")
+            except ValueError:
+                try:
+                    event = json.loads(line)  # Leading whitespace, or a genuinely invalid line
+                except ValueError as e:
+                    self.events_seen += 1
+                    if self.strict:
+                        raise ValueError(f"Invalid event {self.events_seen}: {e}") from e
+                    yield {"event": self.events_seen, "status": "error", "message": f"Invalid JSON: {e}"}
+                    continue
+            alert = apply(event)
+            if alert is not None:
+                yield alert
+
+
+def follow(file, poll_interval=0.1):
+    """Yields lines appended to a file, like `tail -f`, waiting for new data when it reaches the end."""
+    pending = ""
+    while True:
+        chunk = file.readline()
+        if not chunk:
+            time.sleep(poll_interval)
+            continue
+        pending += chunk
+        if pending.endswith("\n"):
+            yield pending
+            pending = ""
+
+
+def main(argv=None):
+    """Command-line entry point: reads JSON-lines events and writes JSON-lines alerts to stdout."""
+    parser = argparse.ArgumentParser(description="Monitor an allocate/request/release event stream for deadlocks")
+    parser.add_argument("events", nargs="?", default="-", help="Event log (JSON lines); '-' reads stdin")
+    parser.add_argument("--follow", action="store_true", help="Keep reading as the file grows, like tail -f")
+    parser.add_argument("--strict", action="store_true", help="Stop at the first invalid event")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.events == "-" else open(args.events, encoding="utf-8")
+    monitor = DeadlockMonitor(strict=args.strict)
+    lines = follow(source) if args.follow else source
+    out = sys.stdout
+    try:
+        for alert in monitor.process_lines(lines):
+            out.write(json.dumps(alert) + "\n")
+            out.flush()  # Alerts must not wait behind a buffer
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,6 @@
+import heapq
+
+
 class MultiInstanceDeadlockDetector:
     """A class to detect deadlocks in a multi-instance resource system using the Banker's Algorithm.
 
@@ -54,6 +57,12 @@ class MultiInstanceDeadlockDetector:
     def detect_deadlock(self):
         """Detects if the system is in a deadlock or unsafe state using the Banker's Algorithm.
 
+        Uses a worklist instead of rescanning every remaining process after each one finishes:
+        each process tracks how many resources it is still short on, and blocked processes are
+        indexed by resource (sorted by how much they need), so releasing a resource only re-checks
+        the processes waiting on it. Runnable processes stay runnable as work only grows, so they
+        are kept in a min-heap by position, which yields the same safe sequence as a rescan.
+
         Returns:
             tuple: (bool, str) where bool is True if there's a deadlock/unsafe state, and str is the message.
         """
@@ -62,22 +71,42 @@ class MultiInstanceDeadlockDetector:
         finish = {p: False for p in self.processes}
         self.safe_sequence = []
 
-        remaining_processes = self.processes.copy()
-        while remaining_processes:
-            found = False
-            for p in remaining_processes[:]:  # Copy to avoid modifying during iteration
-                if not finish[p] and self.can_process_run(p, need, work):
-                    # Simulate running the process by releasing its allocated resources
-                    for r in self.resources:
-                        work[r] += self.allocation[p].get(r, 0)
-                    finish[p] = True
-                    self.safe_sequence.append(p)
-                    remaining_processes.remove(p)
-                    found = True
-                    break
-            if not found:
-                # No process can run with current resources
-                break
+        shortfall = {}  # process -> number of resources it is still short on
+        waiting = {r: [] for r in self.resources}  # resource -> [(needed, position, process)]
+        ready = []
+        for position, p in enumerate(self.processes):
+            short = 0
+            for r in self.resources:
+                if need[p][r] > work[r]:
+                    waiting[r].append((need[p][r], position, p))
+                    short += 1
+            shortfall[p] = short
+            if short == 0:
+                ready.append(position)
+        for r in self.resources:
+            waiting[r].sort()
+        next_waiting = {r: 0 for r in self.resources}  # Waiters before this index are satisfied
+
+        heapq.heapify(ready)
+        while ready:
+            p = self.processes[heapq.heappop(ready)]
+            # Simulate running the process by releasing its allocated resources
+            finish[p] = True
+            self.safe_sequence.append(p)
+            for r in self.resources:
+                released = self.allocation[p].get(r, 0)
+                if not released:
+                    continue
+                work[r] += released
+                waiters = waiting[r]
+                i = next_waiting[r]
+                while i < len(waiters) and waiters[i][0] <= work[r]:
+                    _, position, q = waiters[i]
+                    shortfall[q] -= 1
+                    if shortfall[q] == 0:
+                        heapq.heappush(ready, position)
+                    i += 1
+                next_waiting[r] = i
 
         if len(self.safe_sequence) == len(self.processes):
             self.has_deadlock = False
@@ -85,4 +114,4 @@ class MultiInstanceDeadlockDetector:
         else:
             self.has_deadlock = True
             unfinished = [p for p in self.processes if not finish[p]]
-            return True, f"No safe sequence found. System MAY be in an unsafe state or deadlocked. Unfinished processes: {unfinished}"
\ No newline at end of file
+            return True, f"No safe sequence found. System MAY be in an unsafe state or deadlocked. Unfinished processes: {unfinished}"
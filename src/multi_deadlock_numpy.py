@@ -0,0 +1,133 @@
+import heapq
+import numpy as np
+from multi_deadlock_algo import MultiInstanceDeadlockDetector
+
+
+class VectorizedMultiInstanceDeadlockDetector(MultiInstanceDeadlockDetector):
+    """A NumPy-backed Banker's Algorithm for large multi-instance systems.
+
+    Allocation, Max and Need are held as 2-D integer arrays (processes x resources). Each
+    "which processes can run now" test is one batched comparison of the blocked rows of Need
+    against work, and finishing a process releases its allocation with a single vector add.
+    It produces the same safe sequence and unfinished set as MultiInstanceDeadlockDetector.
+
+    Args:
+        allocation (dict): Dict of process -> resource -> allocated instances.
+        max_matrix (dict): Dict of process -> resource -> maximum required instances.
+        available (dict): Dict of resource -> available instances.
+        total_resources (dict): Dict of resource -> total instances in the system.
+    """
+    def __init__(self, allocation, max_matrix, available, total_resources):
+        super().__init__(allocation, max_matrix, available, total_resources)
+        self.allocation_array = np.array([[allocation[p].get(r, 0) for r in self.resources] for p in self.processes],
+                                         dtype=np.int64).reshape(len(self.processes), len(self.resources))
+        self.max_array = np.array([[max_matrix[p].get(r, 0) for r in self.resources] for p in self.processes],
+                                  dtype=np.int64).reshape(len(self.processes), len(self.resources))
+        self.available_array = np.array([available[r] for r in self.resources], dtype=np.int64)
+        self.unfinished = []
+
+    @classmethod
+    def from_arrays(cls, allocation, max_matrix, available, processes=None, resources=None):
+        """Creates a detector directly from arrays, without building any dicts.
+
+        Args:
+            allocation (array-like): Allocation matrix of shape (processes, resources).
+            max_matrix (array-like): Max matrix of shape (processes, resources).
+            available (array-like): Available vector of shape (resources,).
+            processes (list, optional): Process names; defaults to 'P1', 'P2', ...
+            resources (list, optional): Resource names; defaults to 'R1', 'R2', ...
+
+        Returns:
+            VectorizedMultiInstanceDeadlockDetector: The detector.
+
+        Raises:
+            ValueError: If the array shapes do not match.
+        """
+        allocation = np.asarray(allocation)
+        max_matrix = np.asarray(max_matrix)
+        available = np.asarray(available)
+        if allocation.ndim != 2 or allocation.shape != max_matrix.shape or available.shape != (allocation.shape[1],):
+            raise ValueError("Allocation and Max must be (processes x resources) and Available must have one entry per resource.")
+        num_processes, num_resources = allocation.shape
+        detector = cls.__new__(cls)
+        detector.processes = list(processes) if processes is not None else [f"P{i+1}" for i in range(num_processes)]
+        detector.resources = list(resources) if resources is not None else [f"R{j+1}" for j in range(num_resources)]
+        detector.allocation_array = allocation
+        detector.max_array = max_matrix
+        detector.available_array = available
+        # Array-backed detectors have no dict views of the state.
+        detector.allocation = None
+        detector.max_matrix = None
+        detector.available = None
+        detector.total_resources = None
+        detector.has_deadlock = False
+        detector.safe_sequence = []
+        detector.unfinished = []
+        return detector
+
+    def get_need_array(self):
+        """Computes the Need matrix (Max - Allocation) as an array.
+
+        Returns:
+            numpy.ndarray: Need matrix of shape (processes, resources).
+
+        Raises:
+            ValueError: If an allocation exceeds the declared maximum.
+        """
+        need = self.max_array - self.allocation_array
+        negative = np.argwhere(need < 0)
+        if negative.size:
+            i, j = negative[0]
+            p, r = self.processes[i], self.resources[j]
+            raise ValueError(f"Invalid data: Allocation ({self.allocation_array[i, j]}) exceeds Max ({self.max_array[i, j]}) for {p} and {r}")
+        return need
+
+    def get_need(self):
+        """Computes the Need matrix (Max - Allocation).
+
+        Returns:
+            dict: Dict of process -> resource -> needed instances.
+        """
+        need = self.get_need_array()
+        return {p: dict(zip(self.resources, row)) for p, row in zip(self.processes, need.tolist())}
+
+    def detect_deadlock(self):
+        """Detects if the system is in a deadlock or unsafe state using the Banker's Algorithm.
+
+        Returns:
+            tuple: (bool, str) where bool is True if there's a deadlock/unsafe state, and str is the message.
+        """
+        need = self.get_need_array()
+        allocation = self.allocation_array
+        work = np.array(self.available_array, dtype=np.int64)
+
+        # A process that can run stays runnable as work only grows, so the runnable set is kept
+        # in a min-heap; popping the smallest index reproduces the scalar algorithm's order.
+        runnable = (need <= work).all(axis=1)
+        ready = np.flatnonzero(runnable).tolist()
+        heapq.heapify(ready)
+        blocked = np.flatnonzero(~runnable)
+        order = []
+        while ready:
+            i = heapq.heappop(ready)
+            order.append(i)
+            released = allocation[i]
+            if not released.any():
+                continue
+            work += released
+            if blocked.size:
+                now_runnable = (need[blocked] <= work).all(axis=1)
+                if now_runnable.any():
+                    for j in blocked[now_runnable].tolist():
+                        heapq.heappush(ready, j)
+                    blocked = blocked[~now_runnable]
+
+        self.safe_sequence = [self.processes[i] for i in order]
+        if len(order) == len(self.processes):
+            self.has_deadlock = False
+            self.unfinished = []
+            return False, f"Safe sequence: {self.safe_sequence}"
+        else:
+            self.has_deadlock = True
+            self.unfinished = [self.processes[i] for i in sorted(blocked.tolist())]
+            return True, f"No safe sequence found. System MAY be in an unsafe state or deadlocked. Unfinished processes: {self.unfinished}"
@@ -1,9 +1,14 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-import time
-from multi_deadlock_algo import MultiInstanceDeadlockDetector
-from multi_visualization import visualize_multi_rag  # Import the new visualization
+from tkinter import filedialog
+from background_task import BackgroundTask, detect_multi_arrays
+from matrix_grid import MatrixGrid
+from canvas_background import ResizeCoalescer, draw_gradient
+
+MATRIX_FILE_TYPES = [("CSV files", "*.csv"), ("NumPy archives", "*.npz"), ("NumPy arrays", "*.npy"),
+                     ("All files", "*.*")]
+
 
 class MultiInstanceDeadlockGUI:
     """A GUI for detecting deadlocks in a system with multi-instance resources.
@@ -52,39 +57,25 @@ class MultiInstanceDeadlockGUI:
         self.max_matrix = {}
         self.available = {}
         self.total_resources = {}
-        self.tooltips = []
-        self.last_detector = None  # Store the last detector for visualization
+        self.last_result = None  # The last detection result, reused for visualization
+        self.background_task = None  # The running detection task, if any
+        self.rag_window = None  # The embedded RAG view; kept open and updated in place
 
         # Bind window resize
-        self.window.bind("<Configure>", self.on_window_resize)
+        self.resize_handler = ResizeCoalescer(self.window, self.on_window_resize)
 
     def on_window_resize(self, event):
         """Handles window resizing by updating the canvas."""
         new_width = self.window.winfo_width()
         new_height = self.window.winfo_height()
         self.background_canvas.config(width=new_width, height=new_height)
-        self.background_canvas.delete("all")
         self.add_gradient(self.background_canvas, "#A3BFFA", "#F3F4F6", new_width, new_height)
         self.title_text.place(relx=0.5, rely=0.15, anchor="center")
         self.input_frame.place(relx=0.5, rely=0.5, anchor="center")
 
     def add_gradient(self, canvas, color_start, color_end, width, height):
-        """Adds a gradient background to the canvas."""
-        steps = 100
-        for i in range(steps):
-            r1 = int(color_start[1:3], 16)
-            g1 = int(color_start[3:5], 16)
-            b1 = int(color_start[5:7], 16)
-            r2 = int(color_end[1:3], 16)
-            g2 = int(color_end[3:5], 16)
-            b2 = int(color_end[5:7], 16)
-            r = int(r1 + (r2 - r1) * i / steps)
-            g = int(g1 + (g2 - g1) * i / steps)
-            b = int(b1 + (b2 - b1) * i / steps)
-            color = f"#{r:02x}{g:02x}{b:02x}"
-            y_start = i * (height / steps)
-            y_end = (i + 1) * (height / steps)
-            canvas.create_rectangle(0, y_start, width, y_end, fill=color, outline="")
+        """Adds a gradient background to the canvas (one cached image item, see canvas_background)."""
+        draw_gradient(canvas, color_start, color_end, width, height)
 
     def fade_in_title(self, step):
         """Animates the title by fading in the color."""
@@ -107,8 +98,6 @@ class MultiInstanceDeadlockGUI:
             self.num_resources = int(self.entry_resources.get())
             if self.num_processes <= 0 or self.num_resources <= 0:
                 raise ValueError("Please enter positive numbers.")
-            if self.num_processes > 10 or self.num_resources > 10:
-                raise ValueError("Maximum 10 processes and resources allowed.")
         except ValueError as e:
             messagebox.showerror("Error", str(e), parent=self.window)
             return
@@ -131,83 +120,17 @@ class MultiInstanceDeadlockGUI:
         self.input_title.place(relx=0.5, rely=0.05, anchor="center")
         self.fade_in_title(0)
 
-        # Main frame with scrollable canvas
+        # Main frame holding the virtualized input grids
         self.main_frame = tk.Frame(self.input_canvas, bg="#F3F4F6")
         self.main_frame.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.9, relheight=0.75)
 
-        self.canvas = tk.Canvas(self.main_frame, bg="#F3F4F6", highlightthickness=0)
-        self.scrollbar = tk.Scrollbar(self.main_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg="#F3F4F6")
-
-        self.scrollable_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        # Total resources input
-        self.total_frame = tk.Frame(self.scrollable_frame, bg="#E6F0FA", bd=2, relief="groove")
-        self.total_frame.pack(fill=tk.X, padx=10, pady=10)
-        tk.Label(self.total_frame, text="Total Resources", font=("Helvetica", 14, "bold"), bg="#E6F0FA", fg="#2E3A59").grid(row=0, column=0, columnspan=self.num_resources*2, pady=5)
-        self.total_entries = {}
-        for j in range(self.num_resources):
-            r = f"R{j+1}"
-            tk.Label(self.total_frame, text=f"{r}:", font=("Arial", 12), bg="#E6F0FA").grid(row=1, column=j*2, padx=10, pady=5)
-            entry = tk.Entry(self.total_frame, width=5)
-            entry.grid(row=1, column=j*2+1, padx=10, pady=5)
-            entry.bind("<Enter>", lambda e, t=f"Enter total instances for {r}": self.show_tooltip(e, t))
-            entry.bind("<Leave>", self.hide_tooltip)
-            entry.bind("<KeyRelease>", lambda e: self.validate_entry(e.widget))
-            self.total_entries[r] = entry
-
-        # Allocation table
-        self.alloc_frame = tk.Frame(self.scrollable_frame, bg="#C8E6C9", bd=2, relief="groove")
-        self.alloc_frame.pack(fill=tk.X, padx=10, pady=10)
-        tk.Label(self.alloc_frame, text="Allocation", font=("Helvetica", 14, "bold"), bg="#C8E6C9", fg="#2E3A59").grid(row=0, column=0, columnspan=self.num_resources+1, pady=5)
-        self.alloc_entries = {}
-        for j in range(self.num_resources):
-            r = f"R{j+1}"
-            tk.Label(self.alloc_frame, text=f"{r}", font=("Arial", 12), bg="#C8E6C9").grid(row=1, column=j+1, padx=10, pady=5)
-        for i in range(self.num_processes):
-            p = f"P{i+1}"
-            tk.Label(self.alloc_frame, text=f"{p}", font=("Arial", 12), bg="#C8E6C9").grid(row=i+2, column=0, padx=10, pady=5)
-            self.alloc_entries[p] = {}
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                entry = tk.Entry(self.alloc_frame, width=5)
-                entry.grid(row=i+2, column=j+1, padx=10, pady=5)
-                entry.insert(0, "0")
-                entry.bind("<Enter>", lambda e, t=f"Enter allocated instances of {r} for {p}": self.show_tooltip(e, t))
-                entry.bind("<Leave>", self.hide_tooltip)
-                entry.bind("<KeyRelease>", lambda e: self.validate_entry(e.widget))
-                self.alloc_entries[p][r] = entry
-
-        # Max table
-        self.max_frame = tk.Frame(self.scrollable_frame, bg="#BBDEFB", bd=2, relief="groove")
-        self.max_frame.pack(fill=tk.X, padx=10, pady=10)
-        tk.Label(self.max_frame, text="Max", font=("Helvetica", 14, "bold"), bg="#BBDEFB", fg="#2E3A59").grid(row=0, column=0, columnspan=self.num_resources+1, pady=5)
-        self.max_entries = {}
-        for j in range(self.num_resources):
-            r = f"R{j+1}"
-            tk.Label(self.max_frame, text=f"{r}", font=("Arial", 12), bg="#BBDEFB").grid(row=1, column=j+1, padx=10, pady=5)
-        for i in range(self.num_processes):
-            p = f"P{i+1}"
-            tk.Label(self.max_frame, text=f"{p}", font=("Arial", 12), bg="#BBDEFB").grid(row=i+2, column=0, padx=10, pady=5)
-            self.max_entries[p] = {}
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                entry = tk.Entry(self.max_frame, width=5)
-                entry.grid(row=i+2, column=j+1, padx=10, pady=5)
-                entry.insert(0, "0")
-                entry.bind("<Enter>", lambda e, t=f"Enter maximum instances of {r} for {p}": self.show_tooltip(e, t))
-                entry.bind("<Leave>", self.hide_tooltip)
-                entry.bind("<KeyRelease>", lambda e: self.validate_entry(e.widget))
-                self.max_entries[p][r] = entry
+        # The matrices live in flat arrays and only their visible cells are drawn, so there is no size limit
+        self.input_area = tk.Frame(self.main_frame, bg="#F3F4F6")
+        self.input_area.pack(fill=tk.BOTH, expand=True)
+        self._create_grids()
 
         # Unified table (initially hidden)
-        self.unified_frame = tk.Frame(self.scrollable_frame, bg="#F3F4F6", bd=2, relief="groove")
-        self.unified_labels = {}
+        self.unified_frame = tk.Frame(self.main_frame, bg="#F3F4F6")
 
         # Buttons
         self.button_frame = tk.Frame(self.input_canvas, bg="#F3F4F6")
@@ -237,215 +160,250 @@ class MultiInstanceDeadlockGUI:
         self.reset_button.bind("<Enter>", lambda e: self.reset_button.config(bg="#F57C00"))
         self.reset_button.bind("<Leave>", lambda e: self.reset_button.config(bg="#FF9800"))
 
+        self.import_button = tk.Button(self.button_frame, text="📂 Import", font=("Arial", 12, "bold"),
+                                       command=self.import_matrices, bg="#607D8B", fg="white", padx=15, pady=5)
+        self.import_button.pack(side=tk.LEFT, padx=10)
+        self.import_button.bind("<Enter>", lambda e: self.import_button.config(bg="#455A64"))
+        self.import_button.bind("<Leave>", lambda e: self.import_button.config(bg="#607D8B"))
+
+        self.export_button = tk.Button(self.button_frame, text="💾 Export", font=("Arial", 12, "bold"),
+                                       command=self.export_matrices, bg="#607D8B", fg="white", padx=15, pady=5)
+        self.export_button.pack(side=tk.LEFT, padx=10)
+        self.export_button.bind("<Enter>", lambda e: self.export_button.config(bg="#455A64"))
+        self.export_button.bind("<Leave>", lambda e: self.export_button.config(bg="#607D8B"))
+
         # Bind resize for the new window
-        self.input_window.bind("<Configure>", self.on_input_window_resize)
+        self.input_resize_handler = ResizeCoalescer(self.input_window, self.on_input_window_resize)
+
+    def _create_grids(self):
+        """Creates the Total, Allocation and Max input grids for the current dimensions."""
+        self.total_grid = MatrixGrid(self.input_area, 1, self.num_resources, title="Total Resources", bg="#E6F0FA",
+                                     row_label=lambda i: "Total",
+                                     describe=lambda i, j: f"Enter total instances for R{j+1}",
+                                     on_change=self._on_grid_change)
+        self.total_grid.pack(fill=tk.X, padx=10, pady=5)
+        self.alloc_grid = MatrixGrid(self.input_area, self.num_processes, self.num_resources, title="Allocation",
+                                     bg="#C8E6C9",
+                                     describe=lambda i, j: f"Enter allocated instances of R{j+1} for P{i+1}",
+                                     on_change=self._on_grid_change)
+        self.alloc_grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.max_grid = MatrixGrid(self.input_area, self.num_processes, self.num_resources, title="Max",
+                                   bg="#BBDEFB",
+                                   describe=lambda i, j: f"Enter maximum instances of R{j+1} for P{i+1}",
+                                   on_change=self._on_grid_change)
+        self.max_grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
     def on_input_window_resize(self, event):
         """Handles resizing of the input window."""
         new_width = self.input_window.winfo_width()
         new_height = self.input_window.winfo_height()
         self.input_canvas.config(width=new_width, height=new_height)
-        self.input_canvas.delete("all")
         self.add_gradient(self.input_canvas, "#A3BFFA", "#F3F4F6", new_width, new_height)
         self.input_title.place(relx=0.5, rely=0.05, anchor="center")
         self.main_frame.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.9, relheight=0.75)
         self.button_frame.place(relx=0.5, rely=0.95, anchor="center")
 
-    def show_tooltip(self, event, text):
-        """Shows a tooltip with the given text."""
-        x = event.widget.winfo_rootx() + 20
-        y = event.widget.winfo_rooty() + 20
-        self.tooltip = tk.Toplevel(event.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(self.tooltip, text=text, background="yellow", relief="solid", borderwidth=1)
-        label.pack()
-        self.tooltips.append(self.tooltip)
-
-    def hide_tooltip(self, event):
-        """Hides the tooltip."""
-        if hasattr(self, "tooltip"):
-            self.tooltip.destroy()
-            del self.tooltip
-        for tooltip in self.tooltips:
-            tooltip.destroy()
-        self.tooltips.clear()
-
-    def validate_entry(self, entry):
-        """Validates the entry to ensure it's a non-negative integer."""
-        value = entry.get()
-        try:
-            if value == "":
-                entry.config(bg="white")
-                return
-            val = int(value)
-            if val < 0:
-                entry.config(bg="#FFCDD2")
-            else:
-                entry.config(bg="white")
-        except ValueError:
-            entry.config(bg="#FFCDD2")
-
     def complete_table(self):
-        """Computes the Need matrix and Available resources, then displays a unified table."""
-        try:
-            self._collect_data()
-            detector = MultiInstanceDeadlockDetector(self.allocation, self.max_matrix, self.available, self.total_resources)
-            need = detector.get_need()
-
-            # Hide input sections
-            self.total_frame.pack_forget()
-            self.alloc_frame.pack_forget()
-            self.max_frame.pack_forget()
-
-            # Create unified table
-            tk.Label(self.unified_frame, text="Unified Resource Table", font=("Helvetica", 14, "bold"), bg="#F3F4F6", fg="#2E3A59").grid(row=0, column=0, columnspan=(self.num_resources*4)+1, pady=5)
-
-            # Headers
-            tk.Label(self.unified_frame, text="", font=("Arial", 12), bg="#F3F4F6").grid(row=1, column=0, padx=10, pady=5)
-            # Allocation headers
-            tk.Label(self.unified_frame, text="Allocation", font=("Helvetica", 12, "bold"), bg="#C8E6C9").grid(row=1, column=1, columnspan=self.num_resources, padx=10, pady=5)
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                tk.Label(self.unified_frame, text=f"{r}", font=("Arial", 12), bg="#C8E6C9").grid(row=2, column=j+1, padx=10, pady=5)
-            # Separator after Allocation
-            tk.Label(self.unified_frame, text="", font=("Arial", 12), bg="#000000", width=1).grid(row=1, column=self.num_resources+1, rowspan=self.num_processes+3, sticky="ns")
-            # Max headers
-            tk.Label(self.unified_frame, text="Max", font=("Helvetica", 12, "bold"), bg="#BBDEFB").grid(row=1, column=self.num_resources+2, columnspan=self.num_resources, padx=10, pady=5)
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                tk.Label(self.unified_frame, text=f"{r}", font=("Arial", 12), bg="#BBDEFB").grid(row=2, column=j+self.num_resources+2, padx=10, pady=5)
-            # Separator after Max
-            tk.Label(self.unified_frame, text="", font=("Arial", 12), bg="#000000", width=1).grid(row=1, column=(self.num_resources*2)+2, rowspan=self.num_processes+3, sticky="ns")
-            # Need headers
-            tk.Label(self.unified_frame, text="Need", font=("Helvetica", 12, "bold"), bg="#FFECB3").grid(row=1, column=(self.num_resources*2)+3, columnspan=self.num_resources, padx=10, pady=5)
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                tk.Label(self.unified_frame, text=f"{r}", font=("Arial", 12), bg="#FFECB3").grid(row=2, column=j+(self.num_resources*2)+3, padx=10, pady=5)
-            # Separator after Need
-            tk.Label(self.unified_frame, text="", font=("Arial", 12), bg="#000000", width=1).grid(row=1, column=(self.num_resources*3)+3, rowspan=self.num_processes+3, sticky="ns")
-            # Available headers with values
-            tk.Label(self.unified_frame, text="Available", font=("Helvetica", 12, "bold"), bg="#D1C4E9").grid(row=1, column=(self.num_resources*3)+4, columnspan=self.num_resources, padx=10, pady=5)
-            for j in range(self.num_resources):
-                r = f"R{j+1}"
-                tk.Label(self.unified_frame, text=f"{r}", font=("Arial", 12), bg="#D1C4E9").grid(row=2, column=j+(self.num_resources*3)+4, padx=10, pady=5)
-                label_avail = tk.Label(self.unified_frame, text=str(self.available[r]), font=("Arial", 12), bg="#D1C4E9", width=5, relief="sunken")
-                label_avail.grid(row=3, column=j+(self.num_resources*3)+4, padx=10, pady=5)
-
-            # Process rows
-            self.unified_labels = {}
-            for i in range(self.num_processes):
-                p = f"P{i+1}"
-                tk.Label(self.unified_frame, text=f"{p}", font=("Arial", 12), bg="#F3F4F6").grid(row=i+3, column=0, padx=10, pady=5)
-                self.unified_labels[p] = {}
-                for j in range(self.num_resources):
-                    r = f"R{j+1}"
-                    # Allocation
-                    label_alloc = tk.Label(self.unified_frame, text=str(self.allocation[p][r]), font=("Arial", 12), bg="#C8E6C9", width=5, relief="sunken")
-                    label_alloc.grid(row=i+3, column=j+1, padx=10, pady=5)
-                    self.unified_labels[p][f"alloc_{r}"] = label_alloc
-                    # Max
-                    label_max = tk.Label(self.unified_frame, text=str(self.max_matrix[p][r]), font=("Arial", 12), bg="#BBDEFB", width=5, relief="sunken")
-                    label_max.grid(row=i+3, column=j+self.num_resources+2, padx=10, pady=5)
-                    self.unified_labels[p][f"max_{r}"] = label_max
-                    # Need
-                    label_need = tk.Label(self.unified_frame, text=str(need[p][r]), font=("Arial", 12), bg="#FFECB3", width=5, relief="sunken")
-                    label_need.grid(row=i+3, column=j+(self.num_resources*2)+3, padx=10, pady=5)
-                    self.unified_labels[p][f"need_{r}"] = label_need
-
-            # Show unified table
-            self.unified_frame.pack(fill=tk.X, padx=10, pady=10)
+        """Computes the Need matrix and Available resources, then displays a unified table.
 
-        except ValueError as e:
-            messagebox.showerror("Error", str(e), parent=self.input_window)
+        The unified table is a read-only MatrixGrid whose cells are computed from the input grids
+        when they scroll into view.
+        """
+        if not self._commit_edits():
+            return
+        n = self.num_resources
+        allocation = self.alloc_grid.values
+        max_values = self.max_grid.values
+        invalid = next((k for k, (a, m) in enumerate(zip(allocation, max_values)) if a > m), None)
+        if invalid is not None:
+            i, j = divmod(invalid, n)
+            messagebox.showerror("Error", f"Invalid data: Allocation ({allocation[invalid]}) exceeds Max "
+                                          f"({max_values[invalid]}) for P{i+1} and R{j+1}", parent=self.input_window)
+            return
+        allocated = self.alloc_grid.column_sums()
+        available = [total - used for total, used in zip(self.total_grid.values, allocated)]
+
+        # Hide input sections
+        self.input_area.pack_forget()
+        for widget in self.unified_frame.winfo_children():
+            widget.destroy()
+
+        # Create unified table: Allocation | Max | Need blocks of n columns each
+        blocks = (("Allocation", "#C8E6C9"), ("Max", "#BBDEFB"), ("Need", "#FFECB3"))
+
+        def cell_value(i, col):
+            block, j = divmod(col, n)
+            k = i * n + j
+            if block == 0:
+                return allocation[k]
+            if block == 1:
+                return max_values[k]
+            return max_values[k] - allocation[k]
+
+        legend = "   |   ".join(f"{name} (R1..R{n})" for name, _ in blocks)
+        tk.Label(self.unified_frame, text="Unified Resource Table", font=("Helvetica", 14, "bold"),
+                 bg="#F3F4F6", fg="#2E3A59").pack(pady=5)
+        tk.Label(self.unified_frame, text=legend, font=("Arial", 10), bg="#F3F4F6", fg="#2E3A59").pack()
+        available_grid = MatrixGrid(self.unified_frame, 1, n, title="Available", bg="#D1C4E9", cell_bg="#D1C4E9",
+                                    row_label=lambda i: "Available", cell_value=lambda i, j: available[j])
+        available_grid.pack(fill=tk.X, padx=10, pady=5)
+        unified_grid = MatrixGrid(self.unified_frame, self.num_processes, 3 * n,
+                                  cell_bg=lambda col: blocks[col // n][1],
+                                  col_label=lambda col: f"R{col % n + 1}",
+                                  describe=lambda i, col: f"{blocks[col // n][0]} of R{col % n + 1} for P{i+1}",
+                                  cell_value=cell_value)
+        unified_grid.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        # Show unified table
+        self.unified_frame.pack(fill=tk.BOTH, expand=True)
 
     def detect_deadlock(self):
-        """Detects deadlock or unsafe state and displays the result."""
-        try:
-            self._collect_data()
-            start_time = time.time()
-            detector = MultiInstanceDeadlockDetector(self.allocation, self.max_matrix, self.available, self.total_resources)
-            has_deadlock, message = detector.detect_deadlock()
-            elapsed_time = time.time() - start_time
-            message += f"\nDetection took {elapsed_time:.3f} seconds."
-            self.last_detector = detector  # Store the detector for visualization
-            if has_deadlock:
-                self.sound_manager.play_deadlock_sound()
-                messagebox.showwarning("Unsafe State Detected", message, parent=self.input_window)
-            else:
-                self.sound_manager.play_safe_sound()  # Play sound for safe state
-                messagebox.showinfo("Safe State", message, parent=self.input_window)
-        except ValueError as e:
-            messagebox.showerror("Error", str(e), parent=self.input_window)
+        """Starts detection of a deadlock or unsafe state in a background process."""
+        self._start_detection(self.show_detection_result)
+
+    def show_detection_result(self, result, elapsed_time):
+        """Displays a detection result."""
+        has_deadlock, message, _ = result
+        message += f"\nDetection took {elapsed_time:.3f} seconds."
+        self.last_result = result  # Stored for visualization
+        if has_deadlock:
+            self.sound_manager.play_deadlock_sound()
+            messagebox.showwarning("Unsafe State Detected", message, parent=self.input_window)
+        else:
+            self.sound_manager.play_safe_sound()  # Play sound for safe state
+            messagebox.showinfo("Safe State", message, parent=self.input_window)
 
     def visualize_rag(self):
-        """Visualizes the RAG for a multi-instance system."""
-        try:
-            self._collect_data()
-            if self.last_detector is None:
-                detector = MultiInstanceDeadlockDetector(self.allocation, self.max_matrix, self.available, self.total_resources)
-                has_deadlock, _ = detector.detect_deadlock()
-                self.last_detector = detector
-            else:
-                detector = self.last_detector
-
-            rag = self._build_rag(detector.get_need())
-            flat_allocation = self._flatten_allocation()
-            need = detector.get_need()
-            safe_sequence = detector.safe_sequence if not detector.has_deadlock else []
-            visualize_multi_rag(rag, flat_allocation, need, safe_sequence)
-        except ValueError as e:
-            messagebox.showerror("Error", str(e), parent=self.input_window)
+        """Visualizes the RAG for a multi-instance system, detecting first (in the background) if needed."""
+        if self.last_result is None:
+            self._start_detection(self._visualize_result)
+        elif self._commit_edits():
+            self._visualize_result(self.last_result, 0.0)
+
+    def _visualize_result(self, result, elapsed_time):
+        """Plots the RAG for a detection result."""
+        from multi_visualization import MultiRAGView, visualize_multi_rag  # Loaded on first use to keep startup fast
+        self.last_result = result
+        has_deadlock, _, safe_sequence = result
+        self._collect_data()
+        need = {p: {r: self.max_matrix[p][r] - self.allocation[p][r] for r in self.total_resources}
+                for p in self.allocation}
+        rag = self._build_rag(need)
+        flat_allocation = self._flatten_allocation()
+        if self.rag_window is None or not self.rag_window.is_open():
+            from rag_view import ViewWindow
+            self.rag_window = ViewWindow(self.input_window, "Multi-Instance Resource Allocation Graph", MultiRAGView())
+        if has_deadlock:
+            finished = set(safe_sequence)
+            unfinished = [p for p in self.allocation if p not in finished]
+            visualize_multi_rag(rag, flat_allocation, need, [], unfinished, view=self.rag_window)
+        else:
+            visualize_multi_rag(rag, flat_allocation, need, safe_sequence, view=self.rag_window)
+        self.rag_window.show()
+
+    def _start_detection(self, on_done):
+        """Runs detection on the grid arrays in a background process, then calls on_done(result, elapsed)."""
+        if self.background_task is not None and self.background_task.running:
+            return
+        if not self._commit_edits():
+            return
+        args = (self.alloc_grid.values, self.max_grid.values, self.total_grid.values,
+                self.num_processes, self.num_resources)
+        self.background_task = BackgroundTask(self.input_window, detect_multi_arrays, args, on_done,
+                                              self.show_task_error, size=self.num_processes * self.num_resources)
+
+    def show_task_error(self, message):
+        """Displays an error raised by a background task (e.g., an invalid state)."""
+        messagebox.showerror("Error", message, parent=self.input_window)
 
     def reset(self):
         """Resets all input fields."""
-        for r in self.total_entries:
-            self.total_entries[r].delete(0, tk.END)
-            self.total_entries[r].config(bg="white")
-        for p in self.alloc_entries:
-            for r in self.alloc_entries[p]:
-                self.alloc_entries[p][r].delete(0, tk.END)
-                self.alloc_entries[p][r].insert(0, "0")
-                self.alloc_entries[p][r].config(bg="white")
-        for p in self.max_entries:
-            for r in self.max_entries[p]:
-                self.max_entries[p][r].delete(0, tk.END)
-                self.max_entries[p][r].insert(0, "0")
-                self.max_entries[p][r].config(bg="white")
+        self.total_grid.fill(0)
+        self.alloc_grid.fill(0)
+        self.max_grid.fill(0)
         self.unified_frame.pack_forget()
-        self.total_frame.pack(fill=tk.X, padx=10, pady=10)
-        self.alloc_frame.pack(fill=tk.X, padx=10, pady=10)
-        self.max_frame.pack(fill=tk.X, padx=10, pady=10)
+        self.input_area.pack(fill=tk.BOTH, expand=True)
         self.allocation.clear()
         self.max_matrix.clear()
         self.available.clear()
         self.total_resources.clear()
-        self.last_detector = None
+        self.last_result = None
 
-    def _collect_data(self):
-        """Collects data from input fields, treating empty fields as 0."""
-        self.total_resources = {}
-        for r in self.total_entries:
-            value = self.total_entries[r].get()
-            self.total_resources[r] = int(value) if value.strip() else 0
+    def import_matrices(self):
+        """Loads Total, Allocation and Max from a CSV, NPZ or NPY file, resizing the grids to fit."""
+        path = filedialog.askopenfilename(parent=self.input_window, title="Import Matrices",
+                                          filetypes=MATRIX_FILE_TYPES)
+        if not path:
+            return
+        from matrix_io import load_matrices  # Loaded on first use: NumPy stays out of startup
+        try:
+            state = load_matrices(path)
+            if state.allocation.size and (min(state.allocation.min(), state.max.min()) < 0 or
+                                          max(state.allocation.max(), state.max.max()) >= 2 ** 31):
+                raise ValueError("Allocation and Max must be non-negative integers.")
+            if state.total.size and (state.total.min() < 0 or state.total.max() >= 2 ** 31):
+                raise ValueError("Total resources must be non-negative integers.")
+            num_processes, num_resources = state.allocation.shape
+            if num_processes == 0 or num_resources == 0:
+                raise ValueError("The file contains no processes or no resources.")
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Import Error", str(e), parent=self.input_window)
+            return
 
-        self.allocation = {}
-        for p in self.alloc_entries:
-            self.allocation[p] = {}
-            for r in self.alloc_entries[p]:
-                value = self.alloc_entries[p][r].get()
-                self.allocation[p][r] = int(value) if value.strip() else 0
+        if (num_processes, num_resources) != (self.num_processes, self.num_resources):
+            for widget in self.input_area.winfo_children():
+                widget.destroy()
+            self.num_processes, self.num_resources = num_processes, num_resources
+            self._create_grids()
+        else:
+            self.total_grid.cancel_edit()
+            self.alloc_grid.cancel_edit()
+            self.max_grid.cancel_edit()
+        self.total_grid.load(state.total.tolist())
+        self.alloc_grid.load(state.allocation.ravel().tolist())
+        self.max_grid.load(state.max.ravel().tolist())
+        self.unified_frame.pack_forget()
+        self.input_area.pack(fill=tk.BOTH, expand=True)
+        self.last_result = None
 
-        self.max_matrix = {}
-        for p in self.max_entries:
-            self.max_matrix[p] = {}
-            for r in self.max_entries[p]:
-                value = self.max_entries[p][r].get()
-                self.max_matrix[p][r] = int(value) if value.strip() else 0
-
-        total_allocated = {r: sum(self.allocation[p].get(r, 0) for p in self.allocation) 
-                          for r in self.total_resources}
-        self.available = {r: self.total_resources[r] - total_allocated[r] for r in self.total_resources}
+    def export_matrices(self):
+        """Saves Total, Allocation and Max as CSV, NPZ or a directory of NPY files."""
+        if not self._commit_edits():
+            return
+        path = filedialog.asksaveasfilename(parent=self.input_window, title="Export Matrices",
+                                            defaultextension=".csv", filetypes=MATRIX_FILE_TYPES)
+        if not path:
+            return
+        import numpy as np
+        from matrix_io import save_matrices
+        shape = (self.num_processes, self.num_resources)
+        try:
+            save_matrices(path, np.asarray(self.alloc_grid.values, dtype=np.int64).reshape(shape),
+                          np.asarray(self.max_grid.values, dtype=np.int64).reshape(shape),
+                          np.asarray(self.total_grid.values, dtype=np.int64))
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Export Error", str(e), parent=self.input_window)
+
+    def _on_grid_change(self, row, col):
+        """Drops the last detection result once a cell changes, so Visualize never mixes it with new data."""
+        self.last_result = None
+
+    def _commit_edits(self):
+        """Stores any cell that is being edited; shows an error and returns False if one is invalid."""
+        for grid in (self.total_grid, self.alloc_grid, self.max_grid):
+            if not grid.commit_edit():
+                messagebox.showerror("Error", "Please enter non-negative integers.", parent=self.input_window)
+                return False
+        return True
+
+    def _collect_data(self):
+        """Builds the dict views of the grid arrays (used for visualization)."""
+        resources = [f"R{j+1}" for j in range(self.num_resources)]
+        self.total_resources = dict(zip(resources, self.total_grid.values))
+        self.allocation = {f"P{i+1}": dict(zip(resources, self.alloc_grid.row(i))) for i in range(self.num_processes)}
+        self.max_matrix = {f"P{i+1}": dict(zip(resources, self.max_grid.row(i))) for i in range(self.num_processes)}
+        allocated = self.alloc_grid.column_sums()
+        self.available = {r: self.total_resources[r] - used for r, used in zip(resources, allocated)}
 
     def _build_rag(self, need):
         """Builds the RAG for visualization (multi-instance)."""
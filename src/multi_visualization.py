@@ -1,105 +1,205 @@
-import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
+from rag_view import CachedView
+from graph_lod import LOD_THRESHOLD, build_lod, draw_lod, lod_positions
 
-def visualize_multi_rag(rag, flat_allocation, need, safe_sequence=None, unfinished_processes=None):
+LOD_COLORS = {"process": "lightblue", "resource": "lightgreen", "request": "red", "allocation": "blue",
+              "highlight": "darkred"}
+
+
+class MultiRAGView(CachedView):
+    """The multi-instance RAG figure, updated in place.
+
+    Nodes, edges and their labels are kept between updates and only the ones whose data changed
+    are redrawn (see rag_view.ArtistCache). Embed the figure with rag_view.ViewWindow, or use
+    visualize_multi_rag() for a standalone window.
+
+    Args:
+        figure (matplotlib.figure.Figure, optional): The figure to draw on; a new one is created if omitted.
+    """
+    def __init__(self, figure=None):
+        if figure is None:
+            from matplotlib.figure import Figure
+            figure = Figure(figsize=(10, 8))
+        super().__init__(figure)
+        self.ax = figure.subplots()
+        figure.subplots_adjust(left=0.03, right=0.97, bottom=0.03, top=0.8)
+        self.ax.set_title("Multi-Instance Resource Allocation Graph", pad=20)
+        self.ax.axis("off")
+        figure.text(0.5, 0.95, "Legend: Circles = Processes, Rectangles = Resources", ha="center", fontsize=10)
+        figure.text(0.5, 0.92, "Red Solid Arrow = Request (R), Blue Dashed Arrow = Held (H)", ha="center", fontsize=10)
+        self.nodes = self.new_cache()
+        self.edges = self.new_cache()
+        self.lod = self.new_cache()  # The level-of-detail drawing, used instead of nodes/edges
+        self.status = self.new_cache(overlay=True)
+        self._limits_key = None
+
+    def update(self, rag, flat_allocation, need, safe_sequence=None, unfinished_processes=None, detail="auto",
+               processes=None):
+        """Redraws the parts of the figure that differ from the last update.
+
+        Args: see visualize_multi_rag().
+
+        Returns:
+            int: The number of nodes, edges and texts that were redrawn.
+        """
+        if processes is None:
+            processes = [node for node in rag if node.startswith("P")]
+            resources = [node for node in rag if node.startswith("R")]
+        else:
+            process_set = set(processes)
+            resources = [node for node in rag if node not in process_set]
+        if detail == "lod" or (detail == "auto" and len(processes) + len(resources) > LOD_THRESHOLD):
+            changed = self._update_lod(rag, processes, unfinished_processes)
+            return changed + self._update_status(_shorten(safe_sequence), _shorten(unfinished_processes))
+        if self.lod.specs:
+            self.lod.clear()
+            self._limits_key = None  # Restore the limits of the full drawing
+
+        # Processes (circles) at the bottom, resources (rectangles) at the top
+        pos = {p: (i * 1.5, 0) for i, p in enumerate(processes)}
+        pos.update({r: (i * 1.5, 2) for i, r in enumerate(resources)})
+        if self._limits_key != (len(processes), len(resources)):
+            self._limits_key = (len(processes), len(resources))
+            self.set_limits(self.ax, pos, 0.8)
+
+        node_specs = {p: (pos[p], "process") for p in processes}
+        for r in resources:
+            # Dots based on total instances
+            total_instances = max([need[p][r] + flat_allocation[p].count(r) for p in processes])
+            node_specs[r] = (pos[r], min(total_instances, 5))
+        changed = self.nodes.sync(node_specs, self._draw_node)
+
+        # Edges with instance counts
+        edge_specs = {}
+        for p in processes:
+            for r in rag[p]:  # Request edges (P -> R)
+                instances_needed = need[p][r]
+                if instances_needed > 0:
+                    edge_specs[(p, r)] = (pos[p], pos[r], "request", instances_needed)
+        for r in resources:
+            for p in rag[r]:  # Allocation edges (R -> P)
+                instances_allocated = flat_allocation[p].count(r)
+                if instances_allocated > 0:
+                    edge_specs[(r, p)] = (pos[r], pos[p], "allocation", instances_allocated)
+        changed += self.edges.sync(edge_specs, self._draw_edge)
+        return changed + self._update_status(safe_sequence, unfinished_processes)
+
+    def _update_lod(self, rag, processes, unfinished_processes):
+        """Draws a large graph in level-of-detail mode (see graph_lod): the unfinished processes and
+        their neighbourhood in full, everything else as aggregate nodes, edges as line collections."""
+        process_set = set(processes)
+        unfinished = frozenset(unfinished_processes or ())
+        # Without a deadlock, show the busiest part of the graph
+        focus = [p for p in processes if p in unfinished] or sorted(rag, key=lambda node: -len(rag[node]))[:10]
+        lod = build_lod(rag, process_set, focus)
+        highlight_edges = frozenset([(p, r) for p in unfinished for r in rag.get(p, ())] +
+                                    [(r, p) for r in rag if r not in process_set for p in rag[r] if p in unfinished])
+        self.nodes.clear()
+        self.edges.clear()
+        self._limits_key = None
+        return self.lod.sync({"rag": (lod, frozenset(n for n in lod.detail if n in process_set), unfinished,
+                                      highlight_edges),
+                              "info": (len(lod.detail), len(rag), len(lod.groups))}, self._draw_lod)
+
+    def _draw_lod(self, key, spec):
+        if key == "info":
+            shown, total, groups = spec
+            return [self.figure.text(0.5, 0.01, f"Level of detail: {shown} of {total} nodes drawn individually, "
+                                                f"the rest in {groups} groups", ha="center", fontsize=9)]
+        lod, detail_processes, unfinished, highlight_edges = spec
+        pos = lod_positions(lod, detail_processes)
+        self.set_limits(self.ax, pos, 1.2)
+        return draw_lod(self.ax, lod, detail_processes, pos, unfinished, highlight_edges, LOD_COLORS)
+
+    def _update_status(self, safe_sequence, unfinished_processes):
+        """Updates the safe sequence / deadlock line."""
+        # Determine status
+        if safe_sequence and len(safe_sequence) > 0:
+            status = f"Safe Sequence: {safe_sequence}"
+            status_color = "green"
+        else:
+            status = "No Safe Execution Sequence Found"
+            status_color = "red"
+            if unfinished_processes:
+                status = f"Deadlock Found: Processes Involved: {unfinished_processes}"
+                status_color = "red"
+        return self.status.sync({"status": (status, status_color)}, self._draw_status)
+
+    def _draw_node(self, node, spec):
+        (x, y), kind = spec
+        ax = self.ax
+        if kind == "process":
+            artists = ax.plot(x, y, 'o', markersize=28, color="lightblue", zorder=2)
+        else:
+            artists = [ax.add_patch(Rectangle((x - 0.4, y - 0.2), 0.8, 0.4, fill=True, color="lightgreen",
+                                              ec="black", zorder=1))]
+            for dot in range(kind):
+                artists += ax.plot(x - 0.3 + (dot * 0.15), y, 'o', color="black", markersize=5, zorder=2)
+        artists.append(ax.text(x, y, node, fontsize=12, ha="center", va="center", zorder=3))
+        return artists
+
+    def _draw_edge(self, edge, spec):
+        (x1, y1), (x2, y2), kind, instances = spec
+        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
+        if kind == "request":
+            # Request edge: solid arrow
+            arrow = self.ax.annotate("", xy=(x2, y2), xytext=(x1, y1),
+                                     arrowprops=dict(arrowstyle="->", color="red", lw=2))
+            label = self.ax.text(mid_x, mid_y + 0.1, f"R({instances})", fontsize=10, color="red", ha="center")
+        else:
+            # Allocation edge: dashed arrow
+            arrow = self.ax.annotate("", xy=(x2, y2), xytext=(x1, y1),
+                                     arrowprops=dict(arrowstyle="->", color="blue", lw=2, linestyle="--"))
+            label = self.ax.text(mid_x, mid_y - 0.1, f"H({instances})", fontsize=10, color="blue", ha="center")
+        return [arrow, label]
+
+    def _draw_status(self, key, spec):
+        status, status_color = spec
+        return [self.figure.text(0.5, 0.89, status, ha="center", fontsize=12, color=status_color)]
+
+
+def _shorten(names, limit=8):
+    """Shortens a long process list for the status line of the level-of-detail view."""
+    if not names or len(names) <= limit:
+        return names
+    return list(names[:limit // 2]) + [f"... ({len(names) - limit} more) ..."] + list(names[-(limit // 2):])
+
+
+def visualize_multi_rag(rag, flat_allocation, need, safe_sequence=None, unfinished_processes=None, view=None,
+                        detail="auto", output_path=None, processes=None):
     """Visualizes the Resource Allocation Graph (RAG) for a multi-instance system.
 
+    With a view, the view is updated in place (only what changed is redrawn); with an output_path,
+    the graph is rendered straight to that file (PNG, SVG, ...) without opening a window;
+    otherwise it is drawn in a new standalone window and this call blocks until it is closed.
+
     Args:
         rag (dict): Dict mapping nodes (processes/resources) to their neighbors.
         flat_allocation (dict): Flattened allocation matrix for visualization.
         need (dict): Need matrix for determining request edges.
         safe_sequence (list, optional): The safe sequence determined by the deadlock detector.
         unfinished_processes (list, optional): List of processes that couldn't finish (involved in deadlock).
-    """
-    G_rag = nx.DiGraph()
-    processes = [node for node in rag if node.startswith("P")]
-    resources = [node for node in rag if node.startswith("R")]
-
-    # Add nodes
-    for p in processes:
-        G_rag.add_node(p, type="process")
-    for r in resources:
-        G_rag.add_node(r, type="resource")
-
-    # Add edges with instance counts
-    for p in processes:
-        for r in rag[p]:  # Request edges (P -> R)
-            instances_needed = need[p][r]
-            if instances_needed > 0:
-                G_rag.add_edge(p, r, type="request", instances=instances_needed)
-    for r in resources:
-        for p in rag[r]:  # Allocation edges (R -> P)
-            instances_allocated = flat_allocation[p].count(r)
-            if instances_allocated > 0:
-                G_rag.add_edge(r, p, type="allocation", instances=instances_allocated)
-
-    # Determine status
-    if safe_sequence and len(safe_sequence) > 0:
-        status = f"Safe Sequence: {safe_sequence}"
-        status_color = "green"
-    else:
-        status = "No Safe Execution Sequence Found"
-        status_color = "red"
-        if unfinished_processes:
-            status = f"Deadlock Found: Processes Involved: {unfinished_processes}"
-            status_color = "red"
+        view (MultiRAGView or rag_view.ViewWindow, optional): The view to update.
+        detail (str): "full" draws every node and edge, "lod" draws the level-of-detail view (the
+            unfinished processes and their neighbourhood in full, the rest as aggregate nodes, see
+            graph_lod), and "auto" switches to "lod" above graph_lod.LOD_THRESHOLD nodes.
+        output_path (str, optional): File to render to; the format follows the extension.
+        processes (list, optional): The process nodes of rag; every other node is a resource. By default
+            nodes are told apart by their names ('P...' processes, 'R...' resources).
 
-    # Visualization
-    fig, ax = plt.subplots(figsize=(10, 8))
-    pos = {}
-
-    # Position processes (circles) at the bottom
-    for i, p in enumerate(processes):
-        pos[p] = (i * 1.5, 0)
-
-    # Position resources (rectangles) at the top
-    for i, r in enumerate(resources):
-        pos[r] = (i * 1.5, 2)
-
-    # Draw process nodes (circles)
-    process_nodes = [n for n in G_rag.nodes() if G_rag.nodes[n]["type"] == "process"]
-    nx.draw_networkx_nodes(G_rag, pos, nodelist=process_nodes, node_shape='o', node_color="lightblue", 
-                           node_size=800, ax=ax)
-
-    # Draw resource nodes (rectangles) with dots
-    resource_nodes = [n for n in G_rag.nodes() if G_rag.nodes[n]["type"] == "resource"]
-    for r in resource_nodes:
-        x, y = pos[r]
-        # Draw rectangle
-        rect = Rectangle((x - 0.4, y - 0.2), 0.8, 0.4, fill=True, color="lightgreen", ec="black")
-        ax.add_patch(rect)
-        # Add dots based on total instances
-        total_instances = max([need[p][r] + flat_allocation[p].count(r) for p in processes])
-        for dot in range(min(total_instances, 5)):
-            ax.plot(x - 0.3 + (dot * 0.15), y, 'o', color="black", markersize=5)
-
-    # Draw edges
-    for edge in G_rag.edges(data=True):
-        src, dst, data = edge
-        instances = data["instances"]
-        if data["type"] == "request":
-            # Request edge: solid arrow
-            ax.annotate("", xy=pos[dst], xytext=pos[src], 
-                        arrowprops=dict(arrowstyle="->", color="red", lw=2))
-            ax.text((pos[src][0] + pos[dst][0]) / 2, (pos[src][1] + pos[dst][1]) / 2 + 0.1,
-                    f"R({instances})", fontsize=10, color="red", ha="center")
-        else:
-            # Allocation edge: dashed arrow
-            ax.annotate("", xy=pos[dst], xytext=pos[src], 
-                        arrowprops=dict(arrowstyle="->", color="blue", lw=2, linestyle="--"))
-            ax.text((pos[src][0] + pos[dst][0]) / 2, (pos[src][1] + pos[dst][1]) / 2 - 0.1,
-                    f"H({instances})", fontsize=10, color="blue", ha="center")
-
-    # Draw labels
-    nx.draw_networkx_labels(G_rag, pos, font_size=12, ax=ax)
-
-    # Set title and legend
-    ax.set_title("Multi-Instance Resource Allocation Graph", pad=20)
-    ax.axis("off")
-    plt.figtext(0.5, 0.95, "Legend: Circles = Processes, Rectangles = Resources", ha="center", fontsize=10)
-    plt.figtext(0.5, 0.92, "Red Solid Arrow = Request (R), Blue Dashed Arrow = Held (H)", ha="center", fontsize=10)
-    plt.figtext(0.5, 0.89, status, ha="center", fontsize=12, color=status_color)
-
-    plt.tight_layout(rect=[0, 0, 1, 0.88])
-    plt.show()
\ No newline at end of file
+    Returns:
+        The view that was drawn.
+    """
+    if view is not None:
+        view.update(rag, flat_allocation, need, safe_sequence, unfinished_processes, detail, processes)
+        return view
+    if output_path is not None:
+        view = MultiRAGView()
+        view.update(rag, flat_allocation, need, safe_sequence, unfinished_processes, detail, processes)
+        view.save(output_path)
+        return view
+    view = MultiRAGView(plt.figure(figsize=(10, 8)))
+    view.update(rag, flat_allocation, need, safe_sequence, unfinished_processes, detail, processes)
+    plt.show()
+    return view
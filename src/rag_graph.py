@@ -0,0 +1,280 @@
+from array import array
+
+
+class RAGGraph:
+    """An integer-indexed Resource Allocation Graph stored in compressed sparse row (CSR) form.
+
+    Nodes are interned to integers: processes are 0..num_processes-1 and resources are
+    num_processes..num_processes+num_resources-1, so the node type is a single comparison instead
+    of a string check. Out-edges of node n are targets[offsets[n]:offsets[n+1]]. Names such as
+    'P1' or 'R17' are an optional label layer that is only used at the edges of the API.
+
+    Args:
+        num_processes (int): Number of processes.
+        num_resources (int): Number of resources.
+        alloc_resources (sequence of int): Resource index (0-based) of every allocation edge.
+        alloc_processes (sequence of int): Process index (0-based) of every allocation edge.
+        request_processes (sequence of int): Process index (0-based) of every request edge.
+        request_resources (sequence of int): Resource index (0-based) of every request edge.
+        process_labels (list, optional): Process names; defaults to 'P1', 'P2', ...
+        resource_labels (list, optional): Resource names; defaults to 'R1', 'R2', ...
+
+    Raises:
+        ValueError: If an edge refers to a process or resource index that is out of range.
+    """
+    def __init__(self, num_processes, num_resources, alloc_resources, alloc_processes,
+                 request_processes, request_resources, process_labels=None, resource_labels=None):
+        self.num_processes = num_processes
+        self.num_resources = num_resources
+        self.num_nodes = num_processes + num_resources
+        self.process_labels = process_labels
+        self.resource_labels = resource_labels
+
+        alloc_resources = _as_index_array(alloc_resources)
+        alloc_processes = _as_index_array(alloc_processes)
+        request_processes = _as_index_array(request_processes)
+        request_resources = _as_index_array(request_resources)
+        if len(alloc_resources) != len(alloc_processes) or len(request_processes) != len(request_resources):
+            raise ValueError("Edge arrays must have matching lengths.")
+        _check_range(alloc_processes, num_processes, "process")
+        _check_range(request_processes, num_processes, "process")
+        _check_range(alloc_resources, num_resources, "resource")
+        _check_range(request_resources, num_resources, "resource")
+        self.num_allocations = len(alloc_resources)
+        self.num_requests = len(request_processes)
+
+        # Counting sort of the edges by source node.
+        offsets = array("l", bytes(array("l").itemsize * (self.num_nodes + 1)))
+        for p in request_processes:
+            offsets[p + 1] += 1
+        for r in alloc_resources:
+            offsets[num_processes + r + 1] += 1
+        for n in range(self.num_nodes):
+            offsets[n + 1] += offsets[n]
+        fill = array("l", offsets)
+        targets = array("i", bytes(array("i").itemsize * (self.num_allocations + self.num_requests)))
+        for p, r in zip(request_processes, request_resources):
+            targets[fill[p]] = num_processes + r
+            fill[p] += 1
+        for r, p in zip(alloc_resources, alloc_processes):
+            source = num_processes + r
+            targets[fill[source]] = p
+            fill[source] += 1
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_state(cls, resources_held, resources_wanted, total_resources):
+        """Interns a dict-based state ('P1' -> ['R1', ...]) into a graph, validating it on the way.
+
+        Args:
+            resources_held (dict): Mapping of processes to the resources they hold.
+            resources_wanted (dict): Mapping of processes to the resources they request.
+            total_resources (int): Number of resources, named 'R1'..'Rn'.
+
+        Returns:
+            RAGGraph: The interned graph.
+
+        Raises:
+            ValueError: If the state is invalid (e.g., invalid resource names, duplicate allocations).
+        """
+        process_index = {}
+        process_labels = []
+        for mapping in (resources_held, resources_wanted):
+            for process in mapping:
+                if process not in process_index:
+                    if not process.startswith("P"):
+                        raise ValueError(f"Invalid process name: {process}")
+                    process_index[process] = len(process_labels)
+                    process_labels.append(process)
+
+        holder = array("i", [-1]) * total_resources
+        alloc_resources = array("i")
+        alloc_processes = array("i")
+        for process, resources in resources_held.items():
+            p = process_index[process]
+            for resource in resources:
+                r = _parse_resource(resource, total_resources)
+                if r < 0:
+                    raise ValueError(f"Invalid resource {resource} in resources_held for {process}")
+                if holder[r] >= 0:
+                    raise ValueError(f"Resource {resource} is allocated to multiple processes")
+                holder[r] = p
+                alloc_resources.append(r)
+                alloc_processes.append(p)
+
+        request_processes = array("i")
+        request_resources = array("i")
+        for process, resources in resources_wanted.items():
+            p = process_index[process]
+            for resource in resources:
+                r = _parse_resource(resource, total_resources)
+                if r < 0:
+                    raise ValueError(f"Invalid resource {resource} in resources_wanted for {process}")
+                if holder[r] == p:
+                    raise ValueError(f"Invalid state: {process} requests {resource} which it already holds.")
+                request_processes.append(p)
+                request_resources.append(r)
+
+        return cls(len(process_labels), total_resources, alloc_resources, alloc_processes,
+                   request_processes, request_resources, process_labels=process_labels)
+
+    def is_process(self, node):
+        """Returns True if the node index refers to a process."""
+        return node < self.num_processes
+
+    def label(self, node):
+        """Returns the display name of a node index."""
+        if node < self.num_processes:
+            if self.process_labels is not None:
+                return self.process_labels[node]
+            return f"P{node + 1}"
+        r = node - self.num_processes
+        if self.resource_labels is not None:
+            return self.resource_labels[r]
+        return f"R{r + 1}"
+
+    def neighbors(self, node):
+        """Returns the out-neighbors of a node index."""
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def process_nodes(self):
+        """Returns the labels of all process nodes."""
+        return [self.label(n) for n in range(self.num_processes)]
+
+    def resource_nodes(self):
+        """Returns the labels of all resource nodes."""
+        return [self.label(n) for n in range(self.num_processes, self.num_nodes)]
+
+    def to_adjacency(self):
+        """Builds the labelled adjacency-list form ({'P1': ['R2'], 'R1': ['P1'], ...}).
+
+        Returns:
+            dict: A graph where keys are node labels and values are lists of neighboring labels.
+        """
+        labels = [self.label(n) for n in range(self.num_nodes)]
+        offsets, targets = self.offsets, self.targets
+        return {labels[n]: [labels[t] for t in targets[offsets[n]:offsets[n + 1]]]
+                for n in range(self.num_nodes)}
+
+    def strongly_connected_components(self):
+        """Finds every strongly connected component with more than one node (i.e., every deadlocked set).
+
+        Runs an iterative Tarjan over the CSR arrays, so it needs no recursion and does no
+        per-node string work.
+
+        Returns:
+            list: A list of components, each a list of node indices.
+        """
+        return strongly_connected_components(self.num_nodes, self.offsets, self.targets)
+
+    def extract_cycle(self, component):
+        """Walks edges inside a deadlocked component until a node repeats, returning that cycle.
+
+        Args:
+            component (list): Node indices of a strongly connected component.
+
+        Returns:
+            list: Node indices of a cycle, closed by repeating its first node.
+        """
+        members = set(component)
+        start = min(component)  # Processes have the smallest indices
+        position = {}
+        path = []
+        node = start
+        while node not in position:
+            position[node] = len(path)
+            path.append(node)
+            node = next(t for t in self.neighbors(node) if t in members)
+        cycle = path[position[node]:]
+        cycle.append(node)  # Close the cycle
+        return cycle
+
+
+def strongly_connected_components(n_nodes, offsets, targets):
+    """Finds every strongly connected component with more than one node of a CSR graph.
+
+    Iterative Tarjan: out-edges of node n are targets[offsets[n]:offsets[n+1]].
+
+    Args:
+        n_nodes (int): Number of nodes.
+        offsets (array): CSR row offsets (n_nodes + 1 entries).
+        targets (array): CSR edge targets.
+
+    Returns:
+        list: A list of components, each a list of node indices.
+    """
+    index = array("l", [-1]) * n_nodes
+    lowlink = array("l", [0]) * n_nodes
+    next_edge = array("l", offsets)
+    on_stack = bytearray(n_nodes)
+    scc_stack = []
+    components = []
+    counter = 0
+
+    for root in range(n_nodes):
+        if index[root] >= 0 or offsets[root] == offsets[root + 1]:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack.append(root)
+        on_stack[root] = 1
+        work = [root]
+        while work:
+            node = work[-1]
+            edge = next_edge[node]
+            end = offsets[node + 1]
+            while edge < end:
+                neighbor = targets[edge]
+                edge += 1
+                if index[neighbor] < 0:
+                    break
+                if on_stack[neighbor] and index[neighbor] < lowlink[node]:
+                    lowlink[node] = index[neighbor]
+            else:
+                neighbor = -1
+            next_edge[node] = edge
+            if neighbor >= 0 and index[neighbor] < 0:
+                index[neighbor] = lowlink[neighbor] = counter
+                counter += 1
+                scc_stack.append(neighbor)
+                on_stack[neighbor] = 1
+                work.append(neighbor)
+                continue
+            work.pop()
+            if work:
+                parent = work[-1]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = scc_stack.pop()
+                    on_stack[member] = 0
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1:
+                    components.append(component)
+    return components
+
+
+def _as_index_array(values):
+    """Converts a sequence of integers (list, array, NumPy array) to a compact array('i')."""
+    if isinstance(values, array) and values.typecode == "i":
+        return values
+    return array("i", values)
+
+
+def _check_range(values, limit, kind):
+    if len(values) and (min(values) < 0 or max(values) >= limit):
+        raise ValueError(f"Edge refers to a {kind} index outside 0..{limit - 1}")
+
+
+def _parse_resource(resource, total_resources):
+    """Returns the 0-based index of a resource named 'R1'..'Rn', or -1 if the name is invalid."""
+    digits = resource[1:]
+    if resource[:1] != "R" or not (digits.isascii() and digits.isdigit()) or digits[0] == "0":
+        return -1
+    r = int(digits) - 1
+    return r if r < total_resources else -1
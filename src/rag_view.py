@@ -0,0 +1,190 @@
+class ArtistCache:
+    """Keeps the matplotlib artists of keyed graph elements (nodes, edges, labels) between draws.
+
+    Every element is described by a hashable spec (position, colors, text, ...). sync() compares the
+    new specs with the previous ones and only creates or removes the artists of elements whose spec
+    changed, so updating a large figure after a small state change costs time proportional to the
+    change instead of to the graph.
+
+    Args:
+        overlay (bool): Whether the elements are overlays (texts that change often, see CachedView).
+    """
+    def __init__(self, overlay=False):
+        self.overlay = overlay
+        self.animated = False  # Set by CachedView.animate_overlays() for overlay caches
+        self.specs = {}
+        self.artists = {}
+        self.added = []  # Artists created since the last CachedView.pop_changes()
+        self.removed = False  # Whether any artist was removed since then
+
+    def sync(self, specs, create):
+        """Brings the artists in line with specs.
+
+        Args:
+            specs (dict): Mapping of element key to its spec.
+            create (callable): create(key, spec) draws an element and returns a list of its artists.
+
+        Returns:
+            int: The number of elements that were added, changed or removed.
+        """
+        changed = 0
+        for key in [key for key in self.specs if key not in specs]:
+            self._remove(key)
+            changed += 1
+        for key, spec in specs.items():
+            if self.specs.get(key) != spec:
+                if key in self.specs:
+                    self._remove(key)
+                self.specs[key] = spec
+                self.artists[key] = artists = create(key, spec)
+                if self.animated:
+                    for artist in artists:
+                        artist.set_animated(True)
+                self.added.extend(artists)
+                changed += 1
+        return changed
+
+    def clear(self):
+        """Removes every artist."""
+        for key in list(self.specs):
+            self._remove(key)
+
+    def _remove(self, key):
+        for artist in self.artists.pop(key):
+            artist.remove()
+        del self.specs[key]
+        self.removed = True
+
+
+class CachedView:
+    """Base class of figures whose elements live in ArtistCaches.
+
+    It tracks what the last update changed, so an embedding canvas can draw only the new artists
+    on top of the previous frame (see ViewWindow.update). Overlay caches hold elements that are
+    replaced often (legend, status texts); when embedded they are animated artists, drawn on top of
+    every frame, so replacing one never forces a full redraw.
+    """
+    def __init__(self, figure):
+        self.figure = figure
+        self.caches = []
+        self.invalidated = False  # Set when something outside the caches changed (e.g., axis limits)
+
+    def new_cache(self, overlay=False):
+        """Creates an ArtistCache whose changes are reported by pop_changes()."""
+        cache = ArtistCache(overlay)
+        self.caches.append(cache)
+        return cache
+
+    def animate_overlays(self):
+        """Turns the overlay elements into animated artists (left out of full draws)."""
+        for cache in self.caches:
+            if cache.overlay:
+                cache.animated = True
+                for artists in cache.artists.values():
+                    for artist in artists:
+                        artist.set_animated(True)
+
+    def overlay_artists(self):
+        """Returns every artist of the overlay caches."""
+        return [artist for cache in self.caches if cache.overlay
+                for artists in cache.artists.values() for artist in artists]
+
+    def set_limits(self, ax, pos, pad):
+        """Fits the axis limits to the node positions (a change of limits needs a full redraw)."""
+        if not pos:
+            return
+        xs = [x for x, _ in pos.values()]
+        ys = [y for _, y in pos.values()]
+        limits = ((min(xs) - pad, max(xs) + pad), (min(ys) - pad, max(ys) + pad))
+        if (ax.get_xlim(), ax.get_ylim()) != limits:
+            ax.set_xlim(*limits[0])
+            ax.set_ylim(*limits[1])
+            self.invalidated = True
+
+    def save(self, output_path, dpi=100):
+        """Renders the figure to a file without any GUI backend; the format follows the extension
+        (e.g., .png or .svg)."""
+        self.figure.savefig(output_path, dpi=dpi)
+
+    def pop_changes(self):
+        """Returns (added_artists, needs_full_redraw) for the updates since the last call."""
+        added = []
+        full = self.invalidated
+        for cache in self.caches:
+            if not cache.overlay:
+                added.extend(cache.added)
+                full = full or cache.removed
+            cache.added = []
+            cache.removed = False
+        self.invalidated = False
+        return added, full
+
+
+class ViewWindow:
+    """A Toplevel that embeds a view's figure in Tk (TkAgg canvas plus the navigation toolbar).
+
+    The figure and its artists stay alive while the window is open. When an update only adds
+    elements (or changes overlays), the new artists are drawn over the last rendered frame and
+    blitted, which takes milliseconds; anything else (removed or restyled elements, a new layout)
+    schedules a full redraw.
+
+    Args:
+        parent (tk.Widget): The owning window.
+        title (str): Window title.
+        view (CachedView): The view to embed (e.g., visualization.RAGView or multi_visualization.MultiRAGView).
+    """
+    def __init__(self, parent, title, view):
+        import tkinter as tk  # Only the embedded window needs Tk; views also render headless (see save())
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        self.view = view
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.geometry("1200x800")
+        self.canvas = FigureCanvasTkAgg(view.figure, master=self.window)
+        toolbar = NavigationToolbar2Tk(self.canvas, self.window, pack_toolbar=False)
+        toolbar.update()
+        toolbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self._background = None  # The last rendered frame without overlays, refreshed after every full draw
+        view.animate_overlays()
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def is_open(self):
+        """Returns True while the window exists."""
+        return self.window is not None and self.window.winfo_exists()
+
+    def update(self, *args, **kwargs):
+        """Updates the view and redraws the embedded canvas (incrementally when possible)."""
+        self.view.update(*args, **kwargs)
+        added, full = self.view.pop_changes()
+        if full or self._background is None:
+            self.canvas.draw_idle()
+            return
+        figure = self.view.figure
+        self.canvas.restore_region(self._background)
+        for artist in added:
+            figure.draw_artist(artist)
+        self._background = self.canvas.copy_from_bbox(figure.bbox)
+        self._draw_overlays()
+        self.canvas.blit(figure.bbox)
+
+    def show(self):
+        """Brings the window to the front."""
+        self.window.deiconify()
+        self.window.lift()
+
+    def _on_draw(self, event):
+        """Keeps the background of a full draw and paints the overlays on it (TkAgg blits afterwards)."""
+        self._background = self.canvas.copy_from_bbox(self.view.figure.bbox)
+        self._draw_overlays()
+
+    def _draw_overlays(self):
+        for artist in self.view.overlay_artists():
+            self.view.figure.draw_artist(artist)
+
+    def close(self):
+        """Destroys the window; the view's figure is released with it."""
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
@@ -1,18 +1,24 @@
-import pygame
-import logging
-
-# Configure logging to write errors to a file and console
-logging.basicConfig(
-    level=logging.ERROR,
-    handlers=[
-        logging.FileHandler('deadlock_detection.log'),
-        logging.StreamHandler()  # Also output to console
-    ]
-)
+import time
+import queue
+import threading
+from app_logging import get_logger, log_event
+
+logger = get_logger(__name__)
+
+SOUND_EVENTS = ("allocate", "request", "deadlock", "safe")
+MIN_REPEAT_INTERVAL = 0.08  # Seconds; repeats of one sound closer together than this are dropped
+QUEUE_SIZE = 32  # Events queued while the player is busy; further ones are dropped
+
 
 class SoundManager:
     """Manages sound effects for the deadlock detection tool.
 
+    The pygame mixer is initialized and the samples are decoded on a background thread, so startup
+    never waits on the audio device. The play_* methods only queue an event for that thread, which
+    coalesces bursts: each sound plays at most once per batch of queued events and never more often
+    than every MIN_REPEAT_INTERVAL seconds, so hundreds of allocations in a row (e.g., a trace replay)
+    cost the event loop next to nothing.
+
     Args:
         allocate_sound_path (str): Path to the sound file for allocation events.
         request_sound_path (str): Path to the sound file for request events.
@@ -20,38 +26,15 @@ class SoundManager:
         safe_sound_path (str): Path to the sound file for safe state (no deadlock) events.
     """
     def __init__(self, allocate_sound_path, request_sound_path, deadlock_sound_path, safe_sound_path="assets/safe_sound.wav"):
-        self.sound_enabled = False  # Start as False, set to True only if all succeeds
+        self.sound_paths = dict(zip(SOUND_EVENTS, (allocate_sound_path, request_sound_path, deadlock_sound_path,
+                                                    safe_sound_path)))
+        self.sound_enabled = True  # Events are queued right away and play once the sounds are loaded
         self.sounds_loaded = False
-        try:
-            pygame.mixer.init()
-            print("Pygame mixer initialized successfully")
-            logging.info("Pygame mixer initialized successfully")
-        except Exception as e:
-            error_msg = f"Failed to initialize pygame mixer: {e}"
-            logging.error(error_msg)
-            print(error_msg)
-            return
-
-        try:
-            self.allocate_sound = pygame.mixer.Sound(allocate_sound_path)
-            print(f"Loaded allocate sound: {allocate_sound_path}")
-            self.request_sound = pygame.mixer.Sound(request_sound_path)
-            print(f"Loaded request sound: {request_sound_path}")
-            self.deadlock_sound = pygame.mixer.Sound(deadlock_sound_path)
-            print(f"Loaded deadlock sound: {deadlock_sound_path}")
-            self.safe_sound = pygame.mixer.Sound(safe_sound_path)
-            print(f"Loaded safe state sound: {safe_sound_path}")
-            self.sounds_loaded = True
-            self.sound_enabled = True  # Enable only if all sounds load
-            logging.info(f"Sounds loaded successfully: allocate={allocate_sound_path}, request={request_sound_path}, deadlock={deadlock_sound_path}, safe={safe_sound_path}")
-        except Exception as e:
-            error_msg = f"Error loading sounds: {e}"
-            logging.error(error_msg)
-            print(error_msg)
-            self.sound_enabled = False
-            self.sounds_loaded = False
-
-        print(f"SoundManager initialized with sound_enabled={self.sound_enabled}, sounds_loaded={self.sounds_loaded}")
+        self.load_failed = False
+        self._sounds = {}
+        self._events = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="sound", daemon=True)
+        self._thread.start()
 
     def toggle_sound(self):
         """Toggles sound on or off.
@@ -59,35 +42,91 @@ class SoundManager:
         Returns:
             bool: True if sound is enabled, False otherwise.
         """
-        if not self.sounds_loaded:
-            print("Sounds not loaded, cannot toggle.")
-            logging.warning("Toggle attempted but sounds not loaded.")
+        if self.load_failed:
+            logger.warning("Toggle attempted but sounds not loaded.")
             return False
         self.sound_enabled = not self.sound_enabled
-        print(f"Sound toggled: enabled={self.sound_enabled}")
-        logging.info(f"Sound toggled: enabled={self.sound_enabled}")
+        log_event(logger, "sound_toggled", enabled=self.sound_enabled)
         return self.sound_enabled
 
     def play_allocate_sound(self):
         """Plays the sound for an allocation event."""
-        print(f"Attempting to play allocate sound: enabled={self.sound_enabled}, sound={self.allocate_sound}")
-        if self.sound_enabled and self.allocate_sound:
-            self.allocate_sound.play()
+        self._post("allocate")
 
     def play_request_sound(self):
         """Plays the sound for a request event."""
-        print(f"Attempting to play request sound: enabled={self.sound_enabled}, sound={self.request_sound}")
-        if self.sound_enabled and self.request_sound:
-            self.request_sound.play()
+        self._post("request")
 
     def play_deadlock_sound(self):
         """Plays the sound for a deadlock detection event."""
-        print(f"Attempting to play deadlock sound: enabled={self.sound_enabled}, sound={self.deadlock_sound}")
-        if self.sound_enabled and self.deadlock_sound:
-            self.deadlock_sound.play()
+        self._post("deadlock")
 
     def play_safe_sound(self):
         """Plays the sound for a safe state (no deadlock) event."""
-        print(f"Attempting to play safe state sound: enabled={self.sound_enabled}, sound={self.safe_sound}")
-        if self.sound_enabled and self.safe_sound:
-            self.safe_sound.play()
\ No newline at end of file
+        self._post("safe")
+
+    def close(self):
+        """Stops the sound thread after the queued events."""
+        try:
+            self._events.put(None, timeout=1.0)
+        except queue.Full:
+            return
+        self._thread.join(timeout=1.0)
+
+    def _post(self, name):
+        """Queues a sound event without blocking; it is dropped if the queue is full."""
+        if not self.sound_enabled:
+            return
+        try:
+            self._events.put_nowait(name)
+        except queue.Full:
+            pass  # The player is behind; a burst sounds the same without this event
+
+    def _load(self):
+        """Initializes the mixer and decodes every sample (runs on the sound thread).
+
+        Returns:
+            bool: True if all sounds were loaded.
+        """
+        try:
+            import pygame  # Deferred: importing pygame and opening the audio device take a while
+            pygame.mixer.init()
+            logger.debug("Pygame mixer initialized successfully")
+        except Exception as e:
+            logger.error("Failed to initialize pygame mixer: %s", e)
+            return False
+
+        try:
+            for name, path in self.sound_paths.items():
+                self._sounds[name] = pygame.mixer.Sound(path)
+        except Exception as e:
+            logger.error("Error loading sounds: %s", e)
+            return False
+        log_event(logger, "sounds_loaded", paths=self.sound_paths)
+        return True
+
+    def _run(self):
+        """Loads the sounds, then plays queued events until close()."""
+        if not self._load():
+            self.load_failed = True
+            self.sound_enabled = False
+            return
+        self.sounds_loaded = True
+
+        last_played = {}
+        while True:
+            batch = [self._events.get()]
+            while True:
+                try:
+                    batch.append(self._events.get_nowait())
+                except queue.Empty:
+                    break
+            for name in dict.fromkeys(batch):  # Each sound once per batch, in order of arrival
+                if name is None:
+                    return
+                now = time.monotonic()
+                if now - last_played.get(name, float("-inf")) < MIN_REPEAT_INTERVAL:
+                    continue
+                last_played[name] = now
+                if self.sound_enabled:
+                    self._sounds[name].play()
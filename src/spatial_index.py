@@ -0,0 +1,78 @@
+class GridIndex:
+    """A uniform-grid spatial index of named points, for hit tests on the drag-and-drop canvas.
+
+    Points are bucketed by the grid cell they fall in. With cells at least as large as the hit
+    radius, a hit test only looks at the 3 x 3 cells around the query point, so it costs the same
+    however many nodes the canvas holds; moving a point (e.g., while it is dragged) is at most one
+    bucket swap.
+
+    Args:
+        cell_size (float): Width and height of a grid cell in pixels.
+    """
+    def __init__(self, cell_size=80):
+        self.cell_size = cell_size
+        self.positions = {}  # key -> (x, y)
+        self.buckets = {}  # (column, row) -> set of keys
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def get(self, key):
+        """Returns the (x, y) position of a point, or None."""
+        return self.positions.get(key)
+
+    def move(self, key, x, y):
+        """Adds a point at (x, y), or moves it there."""
+        cell = self._cell(x, y)
+        old = self.positions.get(key)
+        if old is None or self._cell(*old) != cell:
+            if old is not None:
+                self._discard(self._cell(*old), key)
+            self.buckets.setdefault(cell, set()).add(key)
+        self.positions[key] = (x, y)
+
+    def remove(self, key):
+        """Removes a point, if it is indexed."""
+        old = self.positions.pop(key, None)
+        if old is not None:
+            self._discard(self._cell(*old), key)
+
+    def clear(self):
+        """Removes every point."""
+        self.positions = {}
+        self.buckets = {}
+
+    def hit(self, x, y, radius=40):
+        """Returns the point closest to (x, y) among those less than radius away on both axes, or None.
+
+        Args:
+            x (float): Query x.
+            y (float): Query y.
+            radius (float): Half the side of the square hit box; at most cell_size for constant time.
+        """
+        reach = max(1, -int(-radius // self.cell_size))  # Cells to look at on each side
+        column, row = self._cell(x, y)
+        best = None
+        best_distance = None
+        for i in range(column - reach, column + reach + 1):
+            for j in range(row - reach, row + reach + 1):
+                for key in self.buckets.get((i, j), ()):
+                    px, py = self.positions[key]
+                    dx, dy = abs(x - px), abs(y - py)
+                    if dx < radius and dy < radius:
+                        distance = dx * dx + dy * dy
+                        if best is None or distance < best_distance:
+                            best, best_distance = key, distance
+        return best
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _discard(self, cell, key):
+        bucket = self.buckets[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self.buckets[cell]
@@ -0,0 +1,66 @@
+import os
+import sys
+import argparse
+import subprocess
+
+# Modules the GUI must not load before its first frame; they are imported lazily on first use
+# (pygame on the sound thread).
+DEFERRED_MODULES = ("matplotlib", "networkx", "numpy", "pygame")
+GUI_MODULES = ("gui", "multi_gui", "sound_manager")
+
+
+def measure_imports(modules):
+    """Imports modules in a fresh interpreter under `-X importtime`.
+
+    Args:
+        modules (tuple): Names of the modules to import.
+
+    Returns:
+        tuple: (total_us, loaded) where total_us is the cumulative import time in microseconds of the
+        top-level imports and loaded is the set of every module name that was imported.
+    """
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    code = "; ".join(f"import {name}" for name in modules)
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=src_dir,
+                               capture_output=True, text=True, check=True)
+    total_us = 0
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header line
+        loaded.add(name.strip())
+        if not name[1:].startswith(" "):  # Top-level import (nested ones are indented)
+            total_us += int(cumulative)
+    return total_us, loaded
+
+
+def main(argv=None):
+    """Fails (exit code 1) if the GUI modules load the plotting or audio stack or exceed the startup budget."""
+    parser = argparse.ArgumentParser(description="Check the GUI import-time budget with -X importtime")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum import time of the GUI modules")
+    parser.add_argument("--runs", type=int, default=3, help="Measure several times and keep the fastest run")
+    args = parser.parse_args(argv)
+
+    best_us = None
+    for _ in range(args.runs):
+        total_us, loaded = measure_imports(GUI_MODULES)
+        best_us = total_us if best_us is None else min(best_us, total_us)
+
+    eager = sorted(name for name in loaded if name.split(".")[0] in DEFERRED_MODULES)
+    ok = True
+    if eager:
+        print(f"FAIL: imported at startup but should be deferred: {', '.join(eager[:10])}")
+        ok = False
+    if best_us / 1000 > args.budget_ms:
+        print(f"FAIL: GUI import time {best_us / 1000:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        ok = False
+    if ok:
+        print(f"OK: GUI import time {best_us / 1000:.1f} ms (budget {args.budget_ms:.0f} ms), plotting and audio stacks deferred")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+BRANCH_BITS = 5
+BRANCH = 1 << BRANCH_BITS
+MASK = BRANCH - 1
+
+
+class PersistentVector:
+    """A fixed-length immutable sequence whose set() shares everything but one path with the original.
+
+    The items are the leaves of a 32-way trie of tuples. set() copies the O(log32 n) nodes on the
+    path to one item and reuses every other node, so keeping many versions of a long vector costs
+    memory in proportion to the changes, not to the length.
+
+    Args:
+        items (iterable): The items.
+    """
+    __slots__ = ("root", "length", "shift")
+
+    def __init__(self, items=()):
+        items = tuple(items)
+        nodes = [items[i:i + BRANCH] for i in range(0, len(items), BRANCH)] or [()]
+        shift = 0
+        while len(nodes) > 1:
+            nodes = [tuple(nodes[i:i + BRANCH]) for i in range(0, len(nodes), BRANCH)]
+            shift += BRANCH_BITS
+        self.root = nodes[0]
+        self.length = len(items)
+        self.shift = shift
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.length:
+            raise IndexError("PersistentVector index out of range")
+        node = self.root
+        for shift in range(self.shift, 0, -BRANCH_BITS):
+            node = node[(index >> shift) & MASK]
+        return node[index & MASK]
+
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+    def set(self, index, value):
+        """Returns a new vector with one item replaced; this vector is unchanged."""
+        if not 0 <= index < self.length:
+            raise IndexError("PersistentVector index out of range")
+        vector = PersistentVector.__new__(PersistentVector)
+        vector.root = self._set(self.root, self.shift, index, value)
+        vector.length = self.length
+        vector.shift = self.shift
+        return vector
+
+    @staticmethod
+    def _set(node, shift, index, value):
+        i = (index >> shift) & MASK
+        child = value if shift == 0 else PersistentVector._set(node[i], shift - BRANCH_BITS, index, value)
+        return node[:i] + (child,) + node[i + 1:]
+
+
+class Snapshot:
+    """One state of a StateTimeline.
+
+    Attributes:
+        held (PersistentVector): The resources each process holds, as tuples in timeline process order.
+        wanted (PersistentVector): The resources each process requests, in the same layout.
+        action (tuple): The (action, process, resource) step that led to this state; None for the first.
+        result: The detection result of this state once it has been detected, otherwise None.
+    """
+    __slots__ = ("held", "wanted", "action", "result")
+
+    def __init__(self, held, wanted, action, result=None):
+        self.held = held
+        self.wanted = wanted
+        self.action = action
+        self.result = result
+
+
+class StateTimeline:
+    """An undo/redo timeline of single-instance states (which process holds and requests what).
+
+    Every allocation or request adds a Snapshot. Snapshots share structure, so a long session costs
+    memory per change instead of a full copy of the state per step. Undo, redo and goto() only move
+    the current position: every earlier state, and the detection result cached on it, stays available,
+    so going back to a state that was already detected needs no new detection. A new step after an
+    undo drops the redo branch, unless it is the step that redo would repeat.
+
+    Args:
+        processes (iterable): The process names; they are fixed for the timeline.
+    """
+    def __init__(self, processes):
+        self.processes = tuple(processes)
+        self.process_index = {p: i for i, p in enumerate(self.processes)}
+        empty = PersistentVector(() for _ in self.processes)
+        self.snapshots = [Snapshot(empty, empty, None)]
+        self.position = 0
+
+    @property
+    def current(self):
+        """The Snapshot at the current position."""
+        return self.snapshots[self.position]
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position + 1 < len(self.snapshots)
+
+    def record(self, action, process, resource):
+        """Applies a step to the current state and moves to the resulting state.
+
+        Args:
+            action (str): "allocation" (process now holds resource) or "request" (process now wants it).
+            process (str): The process.
+            resource (str): The resource.
+
+        Returns:
+            Snapshot: The new current snapshot.
+
+        Raises:
+            ValueError: If the action or process is unknown.
+        """
+        step = (action, process, resource)
+        if self.can_redo() and self.snapshots[self.position + 1].action == step:
+            self.position += 1  # Same state as the redo branch, including its cached result
+            return self.current
+        if process not in self.process_index:
+            raise ValueError(f"Unknown process: {process}")
+        i = self.process_index[process]
+        held, wanted = self.current.held, self.current.wanted
+        if action == "allocation":
+            held = held.set(i, held[i] + (resource,))
+        elif action == "request":
+            wanted = wanted.set(i, wanted[i] + (resource,))
+        else:
+            raise ValueError(f"Unknown action: {action}")
+        del self.snapshots[self.position + 1:]
+        self.snapshots.append(Snapshot(held, wanted, step))
+        self.position += 1
+        return self.current
+
+    def undo(self):
+        """Moves one state back.
+
+        Returns:
+            tuple: The (action, process, resource) step that was undone.
+
+        Raises:
+            ValueError: If there is nothing to undo.
+        """
+        if not self.can_undo():
+            raise ValueError("Nothing to undo.")
+        step = self.current.action
+        self.position -= 1
+        return step
+
+    def redo(self):
+        """Moves one state forward again.
+
+        Returns:
+            tuple: The (action, process, resource) step that was redone.
+
+        Raises:
+            ValueError: If there is nothing to redo.
+        """
+        if not self.can_redo():
+            raise ValueError("Nothing to redo.")
+        self.position += 1
+        return self.current.action
+
+    def goto(self, position):
+        """Moves straight to any state of the timeline; nothing is replayed on the way.
+
+        Args:
+            position (int): The index of the state (0 is the initial, empty state).
+
+        Returns:
+            Snapshot: The new current snapshot.
+
+        Raises:
+            ValueError: If there is no state at that position.
+        """
+        if not 0 <= position < len(self.snapshots):
+            raise ValueError(f"No state at position {position}.")
+        self.position = position
+        return self.current
+
+    def state(self, snapshot=None):
+        """Returns a snapshot (the current one by default) as (resources_held, resources_wanted) dicts of lists."""
+        snapshot = snapshot or self.current
+        held = {p: list(resources) for p, resources in zip(self.processes, snapshot.held)}
+        wanted = {p: list(resources) for p, resources in zip(self.processes, snapshot.wanted)}
+        return held, wanted
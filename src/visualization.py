@@ -1,383 +1,420 @@
+import math
+import heapq
 import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.patches import Rectangle
+from matplotlib.patches import FancyArrowPatch, Rectangle
 from matplotlib.lines import Line2D
 import numpy as np
+from rag_graph import RAGGraph
+from rag_view import CachedView
+from graph_layout import BipartiteLayout, CircularLayout
+from graph_lod import LOD_THRESHOLD, LODGraph, build_lod, draw_lod, lod_positions
+from wait_for_graph import (build_holder_index, build_wait_for_graph,  # Re-exported for existing callers
+                            convert_deadlock_cycle_to_wfg, get_deadlock_details)
+from app_logging import get_logger, log_event
+
+PROCESS_MARKER_SIZE = 24.5  # Marker sizes in points (networkx node_size 600 and 400 before)
+RESOURCE_MARKER_SIZE = 20
+
+logger = get_logger(__name__)
+
+# Node positions shared by every view in this session, so repeat renders keep nodes in place
+RAG_LAYOUT = BipartiteLayout(scale=2.0)
+WFG_LAYOUT = CircularLayout(scale=1.0)
 
 def compute_safe_sequence(processes, resources_held, resources_wanted, total_resources):
     """
     Computes a safe execution sequence using a simplified Banker's Algorithm.
-    
+
+    Each process counts the requested resources it is still waiting for, and a finishing process
+    only wakes the processes waiting for the resources it releases, so the run is linear in the
+    number of allocations and requests. Among the processes that can run, the one listed first is
+    always picked, so the sequence is the same as a rescan from the start after every step.
+
     Args:
         processes (list): List of process names (e.g., ['P1', 'P2', ...]).
         resources_held (dict): Mapping of processes to held resources.
         resources_wanted (dict): Mapping of processes to requested resources.
         total_resources (int): Total number of resources in the system.
-    
+
     Returns:
         list: A safe execution sequence, or None if no safe sequence exists.
     """
-    # Calculate currently held resources
+    # Initialize available resources (all resources not currently held)
     held_resources = set()
     for proc in resources_held:
         held_resources.update(resources_held[proc])
-    
-    # Initialize available resources (all resources not currently held)
-    all_resources = {f"R{i+1}" for i in range(total_resources)}
-    available = all_resources - held_resources
-    finish = {proc: False for proc in processes}
-    safe_sequence = []
+    available = {f"R{i+1}" for i in range(total_resources)} - held_resources
+
+    order = {proc: i for i, proc in enumerate(processes)}
+    blocked = {}  # Process -> number of its requests that are neither available nor its own
+    waiting = {}  # Resource -> processes waiting for it to be released
+    ready = []  # Heap of the order of the processes that can run
+    for proc in processes:
+        own = resources_held[proc]
+        count = 0
+        for res in resources_wanted[proc]:
+            if res not in available and res not in own:
+                count += 1
+                waiting.setdefault(res, []).append(proc)
+        blocked[proc] = count
+        if count == 0:
+            heapq.heappush(ready, order[proc])
 
-    while len(safe_sequence) < len(processes):
-        found = False
-        for proc in processes:
-            if not finish[proc]:
-                # Check if all requested resources are either available or already held
-                can_run = True
-                for res in resources_wanted[proc]:
-                    if res not in available and res not in resources_held[proc]:
-                        can_run = False
-                        break
-                if can_run:
-                    safe_sequence.append(proc)
-                    available.update(resources_held[proc])  # Release held resources
-                    finish[proc] = True
-                    found = True
-                    break  # Move to next iteration after finding one
-        if not found:
-            return None  # No process can run, indicating potential deadlock or unsafe state
+    safe_sequence = []
+    while ready:
+        proc = processes[heapq.heappop(ready)]
+        safe_sequence.append(proc)
+        for res in resources_held[proc]:  # Release held resources
+            if res not in available:
+                available.add(res)
+                for waiter in waiting.pop(res, ()):
+                    blocked[waiter] -= 1
+                    if blocked[waiter] == 0:
+                        heapq.heappush(ready, order[waiter])
+    if len(safe_sequence) < len(processes):
+        return None  # No process can run, indicating potential deadlock or unsafe state
     return safe_sequence
 
-def build_wait_for_graph(resources_held, resources_wanted):
-    """
-    Builds the Wait-For Graph (WFG) from the RAG.
-    
-    Args:
-        resources_held (dict): Mapping of processes to held resources.
-        resources_wanted (dict): Mapping of processes to requested resources.
-    
-    Returns:
-        dict: Adjacency list representing the WFG.
-    """
-    wfg = {proc: [] for proc in resources_held}
-    for p1 in resources_wanted:
-        for res in resources_wanted[p1]:
-            for p2 in resources_held:
-                if res in resources_held[p2] and p1 != p2:
-                    wfg[p1].append(p2)
-    return wfg
-
-def convert_deadlock_cycle_to_wfg(deadlock_cycle, resources_held, resources_wanted):
-    """
-    Converts a deadlock cycle from the RAG to a WFG cycle (processes only).
-    
-    Args:
-        deadlock_cycle (list): The deadlock cycle from the RAG.
-        resources_held (dict): Mapping of processes to held resources.
-        resources_wanted (dict): Mapping of processes to requested resources.
-    
-    Returns:
-        list: A deadlock cycle containing only process nodes.
-    """
-    if not deadlock_cycle:
-        return None
-    
-    process_cycle = [node for node in deadlock_cycle if node.startswith("P")]
-    wfg_cycle = []
-    for i in range(len(process_cycle)):
-        p1 = process_cycle[i]
-        p2 = process_cycle[(i + 1) % len(process_cycle)]
-        for res in resources_wanted[p1]:
-            if res in resources_held[p2]:
-                if p1 not in wfg_cycle:
-                    wfg_cycle.append(p1)
-                break
-    
-    if wfg_cycle:
-        wfg_cycle.append(wfg_cycle[0])
-    
-    return wfg_cycle if len(wfg_cycle) > 1 else None
-
-def get_deadlock_details(deadlock_cycle, resources_held, resources_wanted):
-    """
-    Generates a detailed description of the deadlock cycle.
-    
-    Args:
-        deadlock_cycle (list): The deadlock cycle from the RAG.
-        resources_held (dict): Mapping of processes to held resources.
-        resources_wanted (dict): Mapping of processes to requested resources.
-    
-    Returns:
-        list: A list of strings describing each step in the deadlock cycle.
-    """
-    if not deadlock_cycle:
-        return []
-    
-    details = []
-    process_cycle = [node for node in deadlock_cycle if node.startswith("P")]
-    for i in range(len(process_cycle)):
-        p1 = process_cycle[i]
-        p2 = process_cycle[(i + 1) % len(process_cycle)]
-        for res in resources_wanted[p1]:
-            if res in resources_held[p2]:
-                detail = f"{p1} holds {resources_held[p1]} and requests {res}, which is held by {p2}"
-                details.append(detail)
-                break
-    return details
-
-def visualize_rag(rag, resources_held, resources_wanted, deadlock_cycle=None, total_resources=None):
-    """
-    Visualizes the Resource Allocation Graph (RAG) and Wait-For Graph (WFG) side by side.
-    
-    Args:
-        rag (dict): The Resource Allocation Graph as an adjacency list.
-        resources_held (dict): Mapping of processes to held resources.
-        resources_wanted (dict): Mapping of processes to requested resources.
-        deadlock_cycle (list, optional): List of nodes forming a deadlock cycle in the RAG.
-        total_resources (int, optional): Total number of resources in the system.
-    """
-    # Infer total_resources if not provided
-    if total_resources is None:
-        all_res = set()
-        for res_list in resources_held.values():
-            all_res.update(res_list)
-        for res_list in resources_wanted.values():
-            all_res.update(res_list)
-        total_resources = max([int(r[1:]) for r in all_res]) if all_res else 0
-
-    # Debug output
-    print(f"RAG: {rag}")
-    print(f"Resources Held: {resources_held}")
-    print(f"Resources Wanted: {resources_wanted}")
-    print(f"Deadlock Cycle: {deadlock_cycle}")
-    print(f"Total Resources: {total_resources}")
-
-    # Create RAG
-    G_rag = nx.DiGraph()
-    for node in rag:
-        G_rag.add_node(node)
-        for neighbor in rag[node]:
-            G_rag.add_edge(node, neighbor)
-
-    # Build WFG
-    wfg = build_wait_for_graph(resources_held, resources_wanted)
-    G_wfg = nx.DiGraph()
-    for node in wfg:
-        G_wfg.add_node(node)
-        for neighbor in wfg[node]:
-            G_wfg.add_edge(node, neighbor)
-
-    # Convert RAG deadlock cycle to WFG deadlock cycle
-    wfg_deadlock_cycle = convert_deadlock_cycle_to_wfg(deadlock_cycle, resources_held, resources_wanted)
-
-    # Get detailed deadlock information
-    deadlock_details = get_deadlock_details(deadlock_cycle, resources_held, resources_wanted)
-
-    # Define node types for RAG
-    processes = [n for n in G_rag.nodes if n.startswith("P")]
-    resources = [n for n in G_rag.nodes if n.startswith("R")]
-
-    # Create figure with two subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 8), gridspec_kw={'wspace': 0.4})
-
-    # Set background and grid
-    ax1.set_facecolor('#f8f9fa')
-    ax2.set_facecolor('#f8f9fa')
-    ax1.grid(True, linestyle='--', alpha=0.3, zorder=0)
-    ax2.grid(True, linestyle='--', alpha=0.3, zorder=0)
-
-    # --- RAG (Left Subplot) ---
-    pos_rag = nx.bipartite_layout(G_rag, processes, align='horizontal', scale=2.0, center=(0, 0))
-
-    # Draw nodes
-    if deadlock_cycle:
-        deadlock_nodes = set(deadlock_cycle)
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=[n for n in processes if n not in deadlock_nodes], 
-                               node_shape='o', node_color='#add8e6', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=[n for n in processes if n in deadlock_nodes], 
-                               node_shape='o', node_color='#ff9999', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=[n for n in resources if n not in deadlock_nodes], 
-                               node_shape='s', node_color='#90ee90', node_size=400, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=[n for n in resources if n in deadlock_nodes], 
-                               node_shape='s', node_color='#ffcc99', node_size=400, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-    else:
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=processes, node_shape='o', 
-                               node_color='#add8e6', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-        nx.draw_networkx_nodes(G_rag, pos_rag, nodelist=resources, node_shape='s', 
-                               node_color='#90ee90', node_size=400, 
-                               edgecolors='black', linewidths=0.5, ax=ax1)
-
-    # Draw resource nodes with rectangles
-    for resource in resources:
-        x, y = pos_rag[resource]
-        rect = Rectangle((x - 0.08, y - 0.08), 0.16, 0.16, 
-                         facecolor='#90ee90' if resource not in set(deadlock_cycle or []) else '#ffcc99', 
-                         edgecolor='black', linewidth=0.5, zorder=1)
-        ax1.add_patch(rect)
-        ax1.plot(x, y, 'ko', markersize=5, zorder=2)
-
-    # Draw edges for RAG
-    allocation_edges = [(u, v) for u, v in G_rag.edges if u.startswith("R") and v.startswith("P")]
-    request_edges = [(u, v) for u, v in G_rag.edges if u.startswith("P") and v.startswith("R")]
-
-    # Highlight deadlock edges
-    deadlock_edges_rag = []
+def _rag_edge_specs(rag, process_set, deadlock_cycle, pos):
+    """Describes every RAG edge as (start, end, is_allocation, is_deadlocked)."""
+    deadlock_edges = set()
     if deadlock_cycle:
         for i in range(len(deadlock_cycle) - 1):
             u, v = deadlock_cycle[i], deadlock_cycle[i + 1]
-            if (u, v) in G_rag.edges:
-                deadlock_edges_rag.append((u, v))
-        non_deadlock_allocation = [(u, v) for u, v in allocation_edges if (u, v) not in deadlock_edges_rag]
-        non_deadlock_request = [(u, v) for u, v in request_edges if (u, v) not in deadlock_edges_rag]
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=non_deadlock_allocation, edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='-|>', arrowsize=10, ax=ax1)
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=non_deadlock_request, edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='->', arrowsize=10, ax=ax1)
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=[e for e in deadlock_edges_rag if e in allocation_edges], 
-                               edge_color='red', width=1.5, arrows=True, arrowstyle='-|>', arrowsize=10, ax=ax1)
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=[e for e in deadlock_edges_rag if e in request_edges], 
-                               edge_color='red', width=1.5, arrows=True, arrowstyle='->', arrowsize=10, ax=ax1)
-    else:
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=allocation_edges, edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='-|>', arrowsize=10, ax=ax1)
-        nx.draw_networkx_edges(G_rag, pos_rag, edgelist=request_edges, edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='->', arrowsize=10, ax=ax1)
-
-    # Add edge labels
-    for edge in allocation_edges:
-        u, v = edge
-        x1, y1 = pos_rag[u]
-        x2, y2 = pos_rag[v]
-        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-        label_x, label_y = mid_x - 0.05, mid_y
-        label_color = 'red' if (u, v) in deadlock_edges_rag else 'black'
-        ax1.text(label_x, label_y, "H", fontsize=8, color=label_color, ha='right', va='center')
-
-    for edge in request_edges:
-        u, v = edge
-        x1, y1 = pos_rag[u]
-        x2, y2 = pos_rag[v]
+            if v in rag.get(u, ()):
+                deadlock_edges.add((u, v))
+    return {(u, v): (pos[u], pos[v], u not in process_set, (u, v) in deadlock_edges)
+            for u in rag for v in rag[u]}
+
+
+class RAGView(CachedView):
+    """The RAG and Wait-For Graph figure, updated in place.
+
+    The figure and every node, edge and label artist are kept between updates; update() diffs the new
+    state against the previous one (see rag_view.ArtistCache), so adding one request edge creates one
+    arrow and one label instead of rebuilding the figure. Node positions come from layout caches
+    (see graph_layout) that keep every node where it was and only place new ones; by default all
+    views share the session-wide RAG_LAYOUT and WFG_LAYOUT. Embed the figure with
+    rag_view.ViewWindow, or use visualize_rag() for a standalone window.
+
+    Args:
+        figure (matplotlib.figure.Figure, optional): The figure to draw on; a new one is created if omitted.
+        rag_layout (graph_layout.BipartiteLayout, optional): Layout cache for the RAG.
+        wfg_layout (graph_layout.CircularLayout, optional): Layout cache for the WFG.
+    """
+    def __init__(self, figure=None, rag_layout=None, wfg_layout=None):
+        if figure is None:
+            from matplotlib.figure import Figure
+            figure = Figure(figsize=(12, 8))
+        super().__init__(figure)
+        self.ax_rag, self.ax_wfg = figure.subplots(1, 2, gridspec_kw={'wspace': 0.4})
+        figure.subplots_adjust(left=0.03, right=0.97, bottom=0.2, top=0.85)
+        for ax, title in ((self.ax_rag, "Resource Allocation Graph"), (self.ax_wfg, "Wait-For Graph")):
+            ax.set_facecolor('#f8f9fa')
+            ax.set_title(title, fontsize=14, pad=15, fontweight='bold')
+            ax.axis('off')
+        self.rag_nodes = self.new_cache()
+        self.rag_edges = self.new_cache()
+        self.wfg_nodes = self.new_cache()
+        self.wfg_edges = self.new_cache()
+        self.lod = self.new_cache()  # The level-of-detail drawing (both panels), used instead of the four above
+        self.annotations = self.new_cache(overlay=True)  # Legend and the safe sequence/deadlock texts
+        self.rag_layout = rag_layout if rag_layout is not None else RAG_LAYOUT
+        self.wfg_layout = wfg_layout if wfg_layout is not None else WFG_LAYOUT
+        self._rag_layout = (None, {})
+        self._wfg_layout = (None, {})
+
+    def update(self, rag, resources_held, resources_wanted, deadlock_cycle=None, total_resources=None, detail="auto"):
+        """Redraws the parts of the figure that differ from the last update.
+
+        Args: see visualize_rag().
+
+        Returns:
+            int: The number of nodes, edges and annotations that were redrawn.
+        """
+        # Node types come straight from the interned graph when one is given
+        graph = None
+        if isinstance(rag, RAGGraph):
+            graph = rag
+            process_set = set(rag.process_nodes())
+            rag = rag.to_adjacency()
+        else:
+            process_set = {node for node in rag if node.startswith("P")}
+
+        # Infer total_resources if not provided
+        if total_resources is None:
+            all_res = set()
+            for res_list in resources_held.values():
+                all_res.update(res_list)
+            for res_list in resources_wanted.values():
+                all_res.update(res_list)
+            total_resources = max([int(r[1:]) for r in all_res]) if all_res else 0
+
+        nodes = list(dict.fromkeys(list(rag) + [v for targets in rag.values() for v in targets]))
+        if detail == "lod" or (detail == "auto" and len(nodes) > LOD_THRESHOLD):
+            if graph is None:
+                graph = RAGGraph.from_state(resources_held, resources_wanted, total_resources)
+            return self._update_lod(graph, rag, process_set, resources_held, resources_wanted)
+        if self.lod.specs:
+            self.lod.clear()
+            self._rag_layout = self._wfg_layout = (None, {})  # Restore the limits of the full drawing
+
+        holder = build_holder_index(resources_held)
+        wfg = build_wait_for_graph(resources_held, resources_wanted, holder)
+        wfg_deadlock_cycle = convert_deadlock_cycle_to_wfg(deadlock_cycle, resources_held, resources_wanted, holder)
+        deadlock_details = get_deadlock_details(deadlock_cycle, resources_held, resources_wanted, holder)
+
+        # --- RAG (left) ---
+        pos_rag = self._layout_rag(nodes, process_set)
+        deadlock_nodes = set(deadlock_cycle or [])
+        changed = self.rag_nodes.sync(
+            {node: (pos_rag[node], node in process_set, node in deadlock_nodes) for node in nodes},
+            self._draw_rag_node)
+        changed += self.rag_edges.sync(_rag_edge_specs(rag, process_set, deadlock_cycle, pos_rag),
+                                       self._draw_rag_edge)
+
+        # --- WFG (right) ---
+        wfg_nodes = list(dict.fromkeys(list(wfg) + [v for targets in wfg.values() for v in targets]))
+        pos_wfg = self._layout_wfg(wfg_nodes)
+        wfg_deadlock_nodes = set(wfg_deadlock_cycle or [])
+        wfg_deadlock_edges = set()
+        if wfg_deadlock_cycle:
+            wfg_deadlock_edges = {(wfg_deadlock_cycle[i], wfg_deadlock_cycle[i + 1])
+                                  for i in range(len(wfg_deadlock_cycle) - 1)}
+        changed += self.wfg_nodes.sync({node: (pos_wfg[node], node in wfg_deadlock_nodes) for node in wfg_nodes},
+                                       self._draw_wfg_node)
+        changed += self.wfg_edges.sync({(u, v): (pos_wfg[u], pos_wfg[v], (u, v) in wfg_deadlock_edges)
+                                        for u in wfg for v in wfg[u]}, self._draw_wfg_edge)
+
+        # --- Legend and safe sequence / deadlock info ---
+        annotations = {"legend": (bool(wfg_deadlock_cycle),)}
+        processes = list(resources_held.keys())
+        safe_sequence = compute_safe_sequence(processes, resources_held, resources_wanted, total_resources)
+        y_position = 0.12
+        if safe_sequence:
+            annotations["status"] = (y_position, "Safe Execution Sequence: " + " -> ".join(safe_sequence),
+                                     10, 'green', 'bold')
+        else:
+            annotations["status"] = (y_position, "No Safe Execution Sequence Found", 10, 'orange', 'bold')
+            y_position -= 0.04
+            if wfg_deadlock_cycle:
+                cycle_text = "Deadlock Cycle: " + " -> ".join(wfg_deadlock_cycle)
+                involved_processes = sorted(set(wfg_deadlock_cycle[:-1]))
+                involved_text = f" (Processes Involved: {', '.join(involved_processes)})"
+                annotations["cycle"] = (y_position, cycle_text + involved_text, 10, 'red', 'bold')
+                y_position -= 0.04
+                for i, detail in enumerate(deadlock_details):
+                    annotations[("detail", i)] = (y_position - i * 0.04, detail, 9, 'red', 'normal')
+        changed += self.annotations.sync(annotations, self._draw_annotation)
+        return changed
+
+    def _update_lod(self, graph, rag, process_set, resources_held, resources_wanted):
+        """Draws a large graph in level-of-detail mode (see graph_lod).
+
+        The deadlocked sets and their neighbourhood are drawn node by node, everything else is
+        collapsed into aggregate nodes, and edges are drawn as line collections.
+        """
+        components = graph.strongly_connected_components()
+        component_of = {graph.label(n): i for i, component in enumerate(components) for n in component}
+        # Without a deadlock, show the busiest part of the graph
+        focus = list(component_of) or sorted(rag, key=lambda node: -len(rag[node]))[:10]
+        lod = build_lod(rag, process_set, focus)
+        highlight_edges = frozenset((u, v) for u in component_of for v in rag[u]
+                                    if component_of.get(v) == component_of[u])
+        detail_processes = [node for node in lod.detail if node in process_set]
+        wfg = build_wait_for_graph(resources_held, resources_wanted)
+        shown = set(detail_processes)
+        wfg_edges = tuple((p, q) for p in detail_processes for q in wfg.get(p, ()) if q in shown)
+
+        for cache in (self.rag_nodes, self.rag_edges, self.wfg_nodes, self.wfg_edges):
+            cache.clear()
+        self._rag_layout = self._wfg_layout = (None, {})
+        changed = self.lod.sync({
+            "rag": (lod, frozenset(detail_processes), frozenset(component_of), highlight_edges),
+            "wfg": (tuple(detail_processes), wfg_edges, frozenset(component_of)),
+        }, self._draw_lod)
+
+        num_processes = len(process_set)
+        annotations = {"legend": ("lod", bool(components))}
+        if components:
+            involved = sum(1 for node in component_of if node in process_set)
+            annotations["status"] = (0.12, f"Deadlock: {len(components)} deadlocked set(s), {involved} of "
+                                           f"{num_processes} processes involved", 10, 'red', 'bold')
+        else:
+            annotations["status"] = (0.12, f"No deadlock: all {num_processes} processes can finish", 10,
+                                     'green', 'bold')
+        annotations["lod"] = (0.08, f"Level of detail: {len(lod.detail)} of {len(rag)} nodes drawn individually, "
+                                    f"the rest in {len(lod.groups)} groups", 9, 'black', 'normal')
+        changed += self.annotations.sync(annotations, self._draw_annotation)
+        return changed
+
+    def _draw_lod(self, key, spec):
+        if key == "rag":
+            lod, detail_processes, deadlocked, highlight_edges = spec
+            pos = lod_positions(lod, detail_processes)
+            self.set_limits(self.ax_rag, pos, 1.2)
+            return draw_lod(self.ax_rag, lod, detail_processes, pos, deadlocked, highlight_edges)
+        processes, edges, deadlocked = spec
+        count = max(len(processes), 1)
+        angles = {p: 2 * math.pi * i / count for i, p in enumerate(processes)}
+        pos = {p: (math.cos(a), math.sin(a)) for p, a in angles.items()}
+        label_pos = {p: (1.15 * math.cos(a), 1.15 * math.sin(a)) for p, a in angles.items()}
+        self.set_limits(self.ax_wfg, pos, 0.4)
+        lod = LODGraph(processes, (), tuple((p, q, "request", 1) for p, q in edges))
+        highlight_edges = {(p, q) for p, q in edges if p in deadlocked and q in deadlocked}
+        return draw_lod(self.ax_wfg, lod, set(processes), pos, deadlocked, highlight_edges, label_pos=label_pos)
+
+    def _layout_rag(self, nodes, process_set):
+        """Returns the RAG node positions; the layout is only consulted when the nodes changed."""
+        key = tuple(nodes)
+        if self._rag_layout[0] != key:
+            pos = self.rag_layout.layout(nodes, process_set)
+            self._rag_layout = (key, pos)
+            self.set_limits(self.ax_rag, pos, 0.4)
+        return self._rag_layout[1]
+
+    def _layout_wfg(self, nodes):
+        """Returns the WFG node positions; the layout is only consulted when the nodes changed."""
+        key = tuple(nodes)
+        if self._wfg_layout[0] != key:
+            pos = self.wfg_layout.layout(nodes)
+            self._wfg_layout = (key, pos)
+            self.set_limits(self.ax_wfg, pos, 0.4)
+        return self._wfg_layout[1]
+
+    def _draw_rag_node(self, node, spec):
+        (x, y), is_process, in_cycle = spec
+        ax = self.ax_rag
+        if is_process:
+            artists = ax.plot(x, y, 'o', markersize=PROCESS_MARKER_SIZE, color='#ff9999' if in_cycle else '#add8e6',
+                              markeredgecolor='black', markeredgewidth=0.5, zorder=2)
+            label_x = x - 0.15
+        else:
+            color = '#ffcc99' if in_cycle else '#90ee90'
+            artists = ax.plot(x, y, 's', markersize=RESOURCE_MARKER_SIZE, color=color,
+                              markeredgecolor='black', markeredgewidth=0.5, zorder=2)
+            artists.append(ax.add_patch(Rectangle((x - 0.08, y - 0.08), 0.16, 0.16, facecolor=color,
+                                                  edgecolor='black', linewidth=0.5, zorder=1)))
+            artists += ax.plot(x, y, 'ko', markersize=5, zorder=2)
+            label_x = x + 0.15
+        artists.append(ax.text(label_x, y, node, fontsize=10, fontweight='bold', ha='center', va='center', zorder=3))
+        return artists
+
+    def _draw_rag_edge(self, edge, spec):
+        (x1, y1), (x2, y2), is_allocation, in_cycle = spec
+        source_size = RESOURCE_MARKER_SIZE if is_allocation else PROCESS_MARKER_SIZE
+        target_size = PROCESS_MARKER_SIZE if is_allocation else RESOURCE_MARKER_SIZE
+        color = 'red' if in_cycle else 'black'
+        arrow = FancyArrowPatch((x1, y1), (x2, y2), arrowstyle='-|>' if is_allocation else '->', mutation_scale=10,
+                                color=color, linewidth=1.5 if in_cycle else 1.2,
+                                shrinkA=source_size / 2, shrinkB=target_size / 2, zorder=1)
+        self.ax_rag.add_patch(arrow)
         mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-        label_x, label_y = mid_x + 0.05, mid_y
-        label_color = 'red' if (u, v) in deadlock_edges_rag else 'black'
-        ax1.text(label_x, label_y, "R", fontsize=8, color=label_color, ha='left', va='center')
-
-    # Draw node labels
-    label_pos_rag = pos_rag.copy()
-    for node in label_pos_rag:
-        x, y = label_pos_rag[node]
-        if node.startswith("P"):
-            label_pos_rag[node] = (x - 0.15, y)
+        if is_allocation:
+            label = self.ax_rag.text(mid_x - 0.05, mid_y, "H", fontsize=8, color=color, ha='right', va='center')
         else:
-            label_pos_rag[node] = (x + 0.15, y)
-    nx.draw_networkx_labels(G_rag, label_pos_rag, font_size=10, font_weight='bold', ax=ax1)
-
-    ax1.set_title("Resource Allocation Graph", fontsize=14, pad=15, fontweight='bold')
-    ax1.axis('off')
-
-    # --- WFG (Right Subplot) ---
-    pos_wfg = nx.circular_layout(G_wfg, scale=1.0)
-
-    # Draw nodes
-    if wfg_deadlock_cycle:
-        deadlock_nodes = set(wfg_deadlock_cycle)
-        nx.draw_networkx_nodes(G_wfg, pos_wfg, nodelist=[n for n in G_wfg.nodes if n not in deadlock_nodes], 
-                               node_shape='o', node_color='#add8e6', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax2)
-        nx.draw_networkx_nodes(G_wfg, pos_wfg, nodelist=[n for n in deadlock_nodes], 
-                               node_shape='o', node_color='#ff9999', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax2)
-    else:
-        nx.draw_networkx_nodes(G_wfg, pos_wfg, nodelist=list(G_wfg.nodes), node_shape='o', 
-                               node_color='#add8e6', node_size=600, 
-                               edgecolors='black', linewidths=0.5, ax=ax2)
-
-    # Draw edges
-    deadlock_edges = []
-    if wfg_deadlock_cycle:
-        deadlock_edges = [(wfg_deadlock_cycle[i], wfg_deadlock_cycle[i + 1]) for i in range(len(wfg_deadlock_cycle) - 1)]
-        non_deadlock_edges = [(u, v) for u, v in G_wfg.edges if (u, v) not in deadlock_edges]
-        nx.draw_networkx_edges(G_wfg, pos_wfg, edgelist=non_deadlock_edges, edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='->', arrowsize=10, 
-                               connectionstyle='arc3,rad=0.1', ax=ax2)
-        nx.draw_networkx_edges(G_wfg, pos_wfg, edgelist=deadlock_edges, edge_color='red', 
-                               width=1.5, arrows=True, arrowstyle='->', arrowsize=10, 
-                               connectionstyle='arc3,rad=0.1', ax=ax2)
-    else:
-        nx.draw_networkx_edges(G_wfg, pos_wfg, edgelist=list(G_wfg.edges), edge_color='black', 
-                               width=1.2, arrows=True, arrowstyle='->', arrowsize=10, 
-                               connectionstyle='arc3,rad=0.1', ax=ax2)
-
-    # Add edge labels
-    for edge in G_wfg.edges:
-        u, v = edge
-        x1, y1 = pos_wfg[u]
-        x2, y2 = pos_wfg[v]
+            label = self.ax_rag.text(mid_x + 0.05, mid_y, "R", fontsize=8, color=color, ha='left', va='center')
+        return [arrow, label]
+
+    def _draw_wfg_node(self, node, spec):
+        (x, y), in_cycle = spec
+        artists = self.ax_wfg.plot(x, y, 'o', markersize=PROCESS_MARKER_SIZE,
+                                   color='#ff9999' if in_cycle else '#add8e6',
+                                   markeredgecolor='black', markeredgewidth=0.5, zorder=2)
+        angle = np.arctan2(y, x)
+        artists.append(self.ax_wfg.text(x + 0.15 * np.cos(angle), y + 0.15 * np.sin(angle), node, fontsize=10,
+                                        fontweight='bold', ha='center', va='center', zorder=3))
+        return artists
+
+    def _draw_wfg_edge(self, edge, spec):
+        (x1, y1), (x2, y2), in_cycle = spec
+        color = 'red' if in_cycle else 'black'
+        arrow = FancyArrowPatch((x1, y1), (x2, y2), arrowstyle='->', mutation_scale=10, color=color,
+                                linewidth=1.5 if in_cycle else 1.2, connectionstyle='arc3,rad=0.1',
+                                shrinkA=PROCESS_MARKER_SIZE / 2, shrinkB=PROCESS_MARKER_SIZE / 2, zorder=1)
+        self.ax_wfg.add_patch(arrow)
         mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
         dx, dy = x2 - x1, y2 - y1
         length = np.sqrt(dx**2 + dy**2)
         if length > 0:
             dx, dy = dx / length, dy / length
-        offset_x, offset_y = -dy * 0.05, dx * 0.05
-        label_x, label_y = mid_x + offset_x, mid_y + offset_y
-        label_color = 'red' if edge in deadlock_edges else 'black'
-        ax2.text(label_x, label_y, "W", fontsize=8, color=label_color, ha='center', va='center')
-
-    # Draw node labels
-    label_pos_wfg = pos_wfg.copy()
-    for node in label_pos_wfg:
-        x, y = label_pos_wfg[node]
-        angle = np.arctan2(y, x)
-        offset = 0.15
-        label_pos_wfg[node] = (x + offset * np.cos(angle), y + offset * np.sin(angle))
-    nx.draw_networkx_labels(G_wfg, label_pos_wfg, font_size=10, font_weight='bold', ax=ax2)
-
-    ax2.set_title("Wait-For Graph", fontsize=14, pad=15, fontweight='bold')
-    ax2.axis('off')
-
-    # Legend
-    legend_elements = [
-        Line2D([0], [0], marker='o', color='w', label='Process', markerfacecolor='#add8e6', markersize=10),
-        Line2D([0], [0], marker='s', color='w', label='Resource', markerfacecolor='#90ee90', markersize=10),
-        Line2D([0], [0], color='black', lw=1.2, label='Held (H)'),
-        Line2D([0], [0], color='black', lw=1.2, linestyle='solid', label='Request (R)/Wait-For (W)'),
-    ]
-    if wfg_deadlock_cycle:
-        legend_elements.append(Line2D([0], [0], color='red', lw=1.5, label='Deadlock Cycle'))
-    fig.legend(handles=legend_elements, loc='upper center', bbox_to_anchor=(0.5, 0.98), 
-               fontsize=9, title="Legend", title_fontsize=11, frameon=True, 
-               edgecolor='black', framealpha=1, ncol=len(legend_elements))
-
-    # Compute and display safe sequence or deadlock info
-    processes = list(resources_held.keys())
-    safe_sequence = compute_safe_sequence(processes, resources_held, resources_wanted, total_resources)
-    y_position = 0.12
-    if safe_sequence:
-        sequence_text = "Safe Execution Sequence: " + " -> ".join(safe_sequence)
-        plt.figtext(0.5, y_position, sequence_text, ha="center", fontsize=10, color='green', weight='bold', 
-                    bbox=dict(facecolor='white', edgecolor='green', boxstyle='round,pad=0.3'))
-    else:
-        plt.figtext(0.5, y_position, "No Safe Execution Sequence Found", ha="center", fontsize=10, color='orange', weight='bold', 
-                    bbox=dict(facecolor='white', edgecolor='orange', boxstyle='round,pad=0.3'))
-        y_position -= 0.04
-        if wfg_deadlock_cycle:
-            cycle_text = "Deadlock Cycle: " + " -> ".join(wfg_deadlock_cycle)
-            involved_processes = sorted(set(wfg_deadlock_cycle[:-1]))
-            involved_text = f" (Processes Involved: {', '.join(involved_processes)})"
-            plt.figtext(0.5, y_position, cycle_text + involved_text, ha="center", fontsize=10, color='red', weight='bold', 
-                        bbox=dict(facecolor='white', edgecolor='red', boxstyle='round,pad=0.3'))
-            y_position -= 0.04
-            for i, detail in enumerate(deadlock_details):
-                plt.figtext(0.5, y_position - i * 0.04, detail, ha="center", fontsize=9, color='red', 
-                            wrap=True, bbox=dict(facecolor='white', edgecolor='red', boxstyle='round,pad=0.3'))
+        label = self.ax_wfg.text(mid_x - dy * 0.05, mid_y + dx * 0.05, "W", fontsize=8, color=color,
+                                 ha='center', va='center')
+        return [arrow, label]
+
+    def _draw_annotation(self, key, spec):
+        if key == "legend" and spec[0] == "lod":
+            legend_elements = [
+                Line2D([0], [0], marker='o', color='w', label='Process', markerfacecolor='#add8e6', markersize=10),
+                Line2D([0], [0], marker='s', color='w', label='Resource', markerfacecolor='#90ee90', markersize=10),
+                Line2D([0], [0], marker='h', color='w', label='Group of nodes', markerfacecolor='#d3d3d3',
+                       markersize=12),
+                Line2D([0], [0], color='#555555', lw=1.2, linestyle='dashed', label='Held'),
+                Line2D([0], [0], color='black', lw=1.2, label='Request/Wait-For'),
+            ]
+            if spec[1]:
+                legend_elements.append(Line2D([0], [0], color='red', lw=1.5, label='Deadlocked Set'))
+            return [self.figure.legend(handles=legend_elements, loc='upper center', bbox_to_anchor=(0.5, 0.98),
+                                       fontsize=9, title="Legend (level of detail)", title_fontsize=11,
+                                       frameon=True, edgecolor='black', framealpha=1, ncol=len(legend_elements))]
+        if key == "legend":
+            (has_cycle,) = spec
+            legend_elements = [
+                Line2D([0], [0], marker='o', color='w', label='Process', markerfacecolor='#add8e6', markersize=10),
+                Line2D([0], [0], marker='s', color='w', label='Resource', markerfacecolor='#90ee90', markersize=10),
+                Line2D([0], [0], color='black', lw=1.2, label='Held (H)'),
+                Line2D([0], [0], color='black', lw=1.2, linestyle='solid', label='Request (R)/Wait-For (W)'),
+            ]
+            if has_cycle:
+                legend_elements.append(Line2D([0], [0], color='red', lw=1.5, label='Deadlock Cycle'))
+            return [self.figure.legend(handles=legend_elements, loc='upper center', bbox_to_anchor=(0.5, 0.98),
+                                       fontsize=9, title="Legend", title_fontsize=11, frameon=True,
+                                       edgecolor='black', framealpha=1, ncol=len(legend_elements))]
+        y, text, fontsize, color, weight = spec
+        return [self.figure.text(0.5, y, text, ha="center", fontsize=fontsize, color=color, weight=weight, wrap=True,
+                                 bbox=dict(facecolor='white', edgecolor=color, boxstyle='round,pad=0.3'))]
+
+
+def visualize_rag(rag, resources_held, resources_wanted, deadlock_cycle=None, total_resources=None, view=None,
+                  detail="auto", output_path=None):
+    """
+    Visualizes the Resource Allocation Graph (RAG) and Wait-For Graph (WFG) side by side.
+
+    With a view, the view is updated in place (only what changed is redrawn); with an output_path,
+    the graphs are rendered straight to that file (PNG, SVG, ...) without opening a window;
+    otherwise they are drawn in a new standalone window and this call blocks until it is closed.
 
-    plt.tight_layout(rect=[0, 0.15, 1, 0.9])
+    Args:
+        rag (RAGGraph or dict): The Resource Allocation Graph, as a RAGGraph or an adjacency list.
+        resources_held (dict): Mapping of processes to held resources.
+        resources_wanted (dict): Mapping of processes to requested resources.
+        deadlock_cycle (list, optional): List of nodes forming a deadlock cycle in the RAG.
+        total_resources (int, optional): Total number of resources in the system.
+        view (RAGView or rag_view.ViewWindow, optional): The view to update.
+        detail (str): "full" draws every node and edge, "lod" draws the level-of-detail view (the
+            deadlocked sets and their neighbourhood in full, the rest as aggregate nodes, see
+            graph_lod), and "auto" switches to "lod" above graph_lod.LOD_THRESHOLD nodes.
+        output_path (str, optional): File to render to; the format follows the extension.
+
+    Returns:
+        The view that was drawn.
+    """
+    log_event(logger, "visualize_rag", nodes=rag.num_nodes if isinstance(rag, RAGGraph) else len(rag),
+              processes=len(resources_held), deadlock_cycle=deadlock_cycle, total_resources=total_resources)
+
+    if view is not None:
+        view.update(rag, resources_held, resources_wanted, deadlock_cycle, total_resources, detail)
+        return view
+    if output_path is not None:
+        # Fresh layouts, so a file does not depend on what was rendered before in this process
+        view = RAGView(rag_layout=BipartiteLayout(scale=2.0), wfg_layout=CircularLayout(scale=1.0))
+        view.update(rag, resources_held, resources_wanted, deadlock_cycle, total_resources, detail)
+        view.save(output_path)
+        return view
+    view = RAGView(plt.figure(figsize=(12, 8)))
+    view.update(rag, resources_held, resources_wanted, deadlock_cycle, total_resources, detail)
     plt.show()
+    return view
 
 if __name__ == "__main__":
     # Example with no deadlock
@@ -0,0 +1,199 @@
+from array import array
+from rag_graph import strongly_connected_components
+
+
+def build_holder_index(resources_held):
+    """Builds the resource -> holding process index of a single-instance state.
+
+    Args:
+        resources_held (dict): Mapping of processes to held resources.
+
+    Returns:
+        dict: Mapping of each held resource to the process holding it.
+    """
+    return {res: proc for proc, held in resources_held.items() for res in held}
+
+
+def build_wait_for_graph(resources_held, resources_wanted, holder=None):
+    """
+    Builds the Wait-For Graph (WFG) from the RAG.
+
+    Each request is resolved through the resource -> holder index, so the graph is built in
+    O(processes + edges) instead of scanning every process's held list per request.
+
+    Args:
+        resources_held (dict): Mapping of processes to held resources.
+        resources_wanted (dict): Mapping of processes to requested resources.
+        holder (dict, optional): A prebuilt build_holder_index(resources_held).
+
+    Returns:
+        dict: Adjacency list representing the WFG.
+    """
+    if holder is None:
+        holder = build_holder_index(resources_held)
+    wfg = {proc: [] for proc in resources_held}
+    for p1, wanted in resources_wanted.items():
+        waits_for = wfg.setdefault(p1, [])
+        for res in wanted:
+            p2 = holder.get(res)
+            if p2 is not None and p2 != p1:
+                waits_for.append(p2)
+    return wfg
+
+
+def convert_deadlock_cycle_to_wfg(deadlock_cycle, resources_held, resources_wanted, holder=None):
+    """
+    Converts a deadlock cycle from the RAG to a WFG cycle (processes only).
+
+    Args:
+        deadlock_cycle (list): The deadlock cycle from the RAG.
+        resources_held (dict): Mapping of processes to held resources.
+        resources_wanted (dict): Mapping of processes to requested resources.
+        holder (dict, optional): A prebuilt build_holder_index(resources_held).
+
+    Returns:
+        list: A deadlock cycle containing only process nodes.
+    """
+    if not deadlock_cycle:
+        return None
+    if holder is None:
+        holder = build_holder_index(resources_held)
+
+    process_cycle = [node for node in deadlock_cycle if node.startswith("P")]
+    wfg_cycle = []
+    for i in range(len(process_cycle)):
+        p1 = process_cycle[i]
+        p2 = process_cycle[(i + 1) % len(process_cycle)]
+        if p1 not in wfg_cycle and any(holder.get(res) == p2 for res in resources_wanted[p1]):
+            wfg_cycle.append(p1)
+
+    if wfg_cycle:
+        wfg_cycle.append(wfg_cycle[0])
+
+    return wfg_cycle if len(wfg_cycle) > 1 else None
+
+
+def get_deadlock_details(deadlock_cycle, resources_held, resources_wanted, holder=None):
+    """
+    Generates a detailed description of the deadlock cycle.
+
+    Args:
+        deadlock_cycle (list): The deadlock cycle from the RAG.
+        resources_held (dict): Mapping of processes to held resources.
+        resources_wanted (dict): Mapping of processes to requested resources.
+        holder (dict, optional): A prebuilt build_holder_index(resources_held).
+
+    Returns:
+        list: A list of strings describing each step in the deadlock cycle.
+    """
+    if not deadlock_cycle:
+        return []
+    if holder is None:
+        holder = build_holder_index(resources_held)
+
+    details = []
+    process_cycle = [node for node in deadlock_cycle if node.startswith("P")]
+    for i in range(len(process_cycle)):
+        p1 = process_cycle[i]
+        p2 = process_cycle[(i + 1) % len(process_cycle)]
+        for res in resources_wanted[p1]:
+            if holder.get(res) == p2:
+                detail = f"{p1} holds {resources_held[p1]} and requests {res}, which is held by {p2}"
+                details.append(detail)
+                break
+    return details
+
+
+class WaitForGraph:
+    """The process-only Wait-For Graph of a RAGGraph, in CSR form.
+
+    Process p waits for q if p requests a resource that q holds. Out-edges of process p are
+    targets[offsets[p]:offsets[p+1]], and via[i] is the resource index behind edge i, so cycles can
+    be expanded back into RAG cycles.
+
+    Args:
+        graph (RAGGraph): The single-instance RAG to project.
+    """
+    def __init__(self, graph):
+        num_processes = graph.num_processes
+        rag_offsets, rag_targets = graph.offsets, graph.targets
+        offsets = array("l", [0]) * (num_processes + 1)
+        targets = array("i")
+        via = array("i")
+        # A resource node's out-edges are its holders, so the RAG itself is the reverse index.
+        for p in range(num_processes):
+            for resource_node in rag_targets[rag_offsets[p]:rag_offsets[p + 1]]:
+                for q in rag_targets[rag_offsets[resource_node]:rag_offsets[resource_node + 1]]:
+                    if q != p:
+                        targets.append(q)
+                        via.append(resource_node - num_processes)
+            offsets[p + 1] = len(targets)
+        self.graph = graph
+        self.num_processes = num_processes
+        self.offsets = offsets
+        self.targets = targets
+        self.via = via
+
+    def to_adjacency(self):
+        """Builds the labelled adjacency-list form ({'P1': ['P2'], ...})."""
+        labels = self.graph.process_nodes()
+        offsets, targets = self.offsets, self.targets
+        return {labels[p]: [labels[q] for q in targets[offsets[p]:offsets[p + 1]]]
+                for p in range(self.num_processes)}
+
+    def strongly_connected_components(self):
+        """Finds every deadlocked set of processes.
+
+        Returns:
+            list: A list of components, each a list of process indices.
+        """
+        return strongly_connected_components(self.num_processes, self.offsets, self.targets)
+
+    def extract_cycle(self, component):
+        """Walks edges inside a deadlocked component until a process repeats.
+
+        Args:
+            component (list): Process indices of a strongly connected component.
+
+        Returns:
+            list: RAG node indices of the cycle (processes and the resources they wait on), closed by
+            repeating its first node.
+        """
+        members = set(component)
+        offsets, targets, via = self.offsets, self.targets, self.via
+        position = {}
+        path = []
+        p = min(component)
+        while p not in position:
+            position[p] = len(path)
+            edge = next(e for e in range(offsets[p], offsets[p + 1]) if targets[e] in members)
+            path.append((p, via[edge]))
+            p = targets[edge]
+        cycle = []
+        for process, resource in path[position[p]:]:
+            cycle.append(process)
+            cycle.append(self.num_processes + resource)
+        cycle.append(p)  # Close the cycle
+        return cycle
+
+    def expand_component(self, component):
+        """Adds the resources a deadlocked set of processes waits on inside the set.
+
+        Args:
+            component (list): Process indices of a strongly connected component.
+
+        Returns:
+            list: RAG node indices: each process followed by the resources it waits on in the set.
+        """
+        members = set(component)
+        offsets, targets, via = self.offsets, self.targets, self.via
+        seen = set()
+        nodes = []
+        for p in component:
+            nodes.append(p)
+            for edge in range(offsets[p], offsets[p + 1]):
+                resource = via[edge]
+                if targets[edge] in members and resource not in seen:
+                    seen.add(resource)
+                    nodes.append(self.num_processes + resource)
+        return nodes
@@ -0,0 +1,248 @@
+import sys
+import json
+import random
+import argparse
+
+
+def single_instance_rows(num_processes, num_resources, density=1.0, cycles=0, cycle_length=2,
+                         held_fraction=0.8, seed=0):
+    """Generates a valid single-instance state row by row.
+
+    The rows only depend on the arguments, so writers can iterate twice instead of keeping a state
+    in memory.
+
+    The first cycles*cycle_length processes form `cycles` disjoint deadlock cycles: process j of a
+    cycle holds resource j and requests resource j+1 of the same cycle. The remaining processes hold
+    contiguous blocks of `held_fraction` of the remaining resources, and each requests about
+    `density` resources. Those requests only go to free resources, cycle resources or resources held
+    by later processes, so they never create extra cycles: the state is deadlocked exactly when
+    cycles > 0.
+
+    Args:
+        num_processes (int): Number of processes.
+        num_resources (int): Number of resources.
+        density (float): Average number of requests per non-cycle process.
+        cycles (int): Number of deadlock cycles.
+        cycle_length (int): Processes (and resources) per cycle, at least 2.
+        held_fraction (float): Fraction of the non-cycle resources that are held.
+        seed (int): Random seed.
+
+    Yields:
+        tuple: (process, held, wanted) where held and wanted are lists of resource names.
+
+    Raises:
+        ValueError: If the cycles do not fit in the requested number of processes and resources.
+    """
+    if cycle_length < 2:
+        raise ValueError("Cycle length must be at least 2.")
+    in_cycles = cycles * cycle_length
+    if in_cycles > num_processes or in_cycles > num_resources:
+        raise ValueError(f"{cycles} cycles of length {cycle_length} need at least {in_cycles} processes and resources.")
+
+    for i in range(in_cycles):
+        start = i - i % cycle_length
+        successor = start + (i - start + 1) % cycle_length
+        yield f"P{i+1}", [f"R{i+1}"], [f"R{successor+1}"]
+
+    rng = random.Random(seed)
+    others = num_processes - in_cycles
+    held_count = int((num_resources - in_cycles) * held_fraction)
+    for q in range(others):
+        # Process q holds the resources in [first, next_first) (offsets after the cycle resources).
+        first = -(-q * held_count // others)
+        next_first = -(-(q + 1) * held_count // others)
+        held = [f"R{in_cycles + r + 1}" for r in range(first, next_first)]
+        # Requestable: cycle resources, then resources held by later processes or free.
+        later_start = in_cycles + next_first
+        choices = in_cycles + (num_resources - later_start)
+        count = int(density) + (rng.random() < density - int(density))
+        picked = set()
+        for _ in range(min(count, choices)):
+            c = rng.randrange(choices)
+            picked.add(c if c < in_cycles else later_start + (c - in_cycles))
+        wanted = [f"R{r+1}" for r in sorted(picked)]
+        yield f"P{in_cycles + q + 1}", held, wanted
+
+
+def multi_instance_rows(num_processes, num_resources, density=0.5, cycles=0, cycle_length=2,
+                        max_instances=3, seed=0):
+    """Generates a valid multi-instance (Banker's) state row by row (reproducibly, like single_instance_rows).
+
+    Non-deadlocked processes are built so that running them in index order is a safe sequence: each
+    one's Need fits in what the earlier ones release. The last cycles*cycle_length processes form
+    `cycles` deadlocked groups; each group holds one instance of a resource per process and needs one
+    more instance than is left after every other process finishes, so the groups can never run.
+
+    Args:
+        num_processes (int): Number of processes.
+        num_resources (int): Number of resources.
+        density (float): Probability that an Allocation/Need cell is non-zero.
+        cycles (int): Number of deadlocked groups (0 gives a safe state).
+        cycle_length (int): Processes per deadlocked group, at least 2.
+        max_instances (int): Upper bound of a random Allocation/Need cell.
+        seed (int): Random seed.
+
+    Yields:
+        tuple: ("row", process, allocation, max) per process, where allocation and max are lists in
+        resource order, and finally ("totals", available, total_resources) as lists.
+
+    Raises:
+        ValueError: If the groups do not fit in the requested number of processes.
+    """
+    if cycles and cycle_length < 2:
+        raise ValueError("Each deadlocked group needs at least 2 processes.")
+    stuck = cycles * cycle_length
+    if stuck > num_processes:
+        raise ValueError(f"{cycles} groups of {cycle_length} need at least {stuck} processes.")
+
+    rng = random.Random(seed)
+    available = [rng.randint(0, max_instances) for _ in range(num_resources)]
+    work = list(available)
+    for i in range(num_processes - stuck):
+        allocation = [rng.randint(1, max_instances) if rng.random() < density else 0 for _ in range(num_resources)]
+        need = [rng.randint(0, min(work[r], max_instances)) if rng.random() < density else 0
+                for r in range(num_resources)]
+        yield "row", f"P{i+1}", allocation, [a + n for a, n in zip(allocation, need)]
+        for r in range(num_resources):
+            work[r] += allocation[r]
+
+    totals = list(work)
+    for k in range(stuck):
+        r = (k // cycle_length) % num_resources
+        allocation = [0] * num_resources
+        allocation[r] = 1
+        need = [0] * num_resources
+        need[r] = work[r] + 1  # One more than is ever free while the group waits
+        totals[r] += 1
+        yield "row", f"P{num_processes - stuck + k + 1}", allocation, [a + n for a, n in zip(allocation, need)]
+    yield "totals", available, totals
+
+
+def generate_single_state(num_processes, num_resources, **options):
+    """Builds an in-memory single-instance state for DeadlockDetector (for small scenarios).
+
+    Returns:
+        tuple: (resources_held, resources_wanted, total_resources)
+    """
+    held = {}
+    wanted = {}
+    for process, process_held, process_wanted in single_instance_rows(num_processes, num_resources, **options):
+        held[process] = process_held
+        wanted[process] = process_wanted
+    return held, wanted, num_resources
+
+
+def generate_multi_state(num_processes, num_resources, **options):
+    """Builds an in-memory multi-instance state for MultiInstanceDeadlockDetector (for small scenarios).
+
+    Returns:
+        tuple: (allocation, max_matrix, available, total_resources)
+    """
+    resources = [f"R{j+1}" for j in range(num_resources)]
+    allocation = {}
+    max_matrix = {}
+    for row in multi_instance_rows(num_processes, num_resources, **options):
+        if row[0] == "row":
+            _, process, alloc_row, max_row = row
+            allocation[process] = dict(zip(resources, alloc_row))
+            max_matrix[process] = dict(zip(resources, max_row))
+        else:
+            _, available, totals = row
+    return allocation, max_matrix, dict(zip(resources, available)), dict(zip(resources, totals))
+
+
+def write_single_state(out, num_processes, num_resources, **options):
+    """Streams a single-instance state file (the format read by `main.py detect`) to `out`.
+
+    The rows are generated twice (once for "resources_held", once for "resources_wanted") instead of
+    being kept in memory.
+    """
+    dumps = json.dumps
+    out.write(f'{{"mode": "single", "total_resources": {num_resources},\n "resources_held": {{')
+    for column in (1, 2):
+        if column == 2:
+            out.write('},\n "resources_wanted": {')
+        separator = "\n"
+        for row in single_instance_rows(num_processes, num_resources, **options):
+            out.write(f'{separator}  "{row[0]}": {dumps(row[column])}')
+            separator = ",\n"
+    out.write("}}\n")
+
+
+def write_single_events(out, num_processes, num_resources, **options):
+    """Streams the same state as JSON-lines events (every allocation, then every request) for monitor.py."""
+    for column, op in ((1, "allocate"), (2, "request")):
+        for row in single_instance_rows(num_processes, num_resources, **options):
+            process = row[0]
+            for resource in row[column]:
+                out.write(f'{{"op": "{op}", "process": "{process}", "resource": "{resource}"}}\n')
+
+
+def write_multi_state(out, num_processes, num_resources, **options):
+    """Streams a multi-instance state file (the format read by `main.py detect`) to `out`."""
+    resources = [f"R{j+1}" for j in range(num_resources)]
+
+    def row_object(values):
+        return "{" + ", ".join(f'"{r}": {v}' for r, v in zip(resources, values)) + "}"
+
+    out.write('{"mode": "multi",\n "allocation": {')
+    for column in (2, 3):
+        if column == 3:
+            out.write('},\n "max": {')
+        separator = "\n"
+        for row in multi_instance_rows(num_processes, num_resources, **options):
+            if row[0] == "row":
+                out.write(f'{separator}  "{row[1]}": {row_object(row[column])}')
+                separator = ",\n"
+            else:
+                _, available, totals = row
+    out.write(f'}},\n "available": {row_object(available)},\n "total_resources": {row_object(totals)}}}\n')
+
+
+def main(argv=None):
+    """Command-line entry point: writes a generated scenario to a file or stdout."""
+    parser = argparse.ArgumentParser(description="Generate reproducible synthetic deadlock scenarios")
+    parser.add_argument("mode", choices=["single", "multi"], help="Single-instance (RAG) or multi-instance (Banker's)")
+    parser.add_argument("--processes", type=int, required=True)
+    parser.add_argument("--resources", type=int, required=True)
+    parser.add_argument("--density", type=float, default=None,
+                        help="Requests per process (single, default 1.0) or non-zero cell probability (multi, default 0.5)")
+    parser.add_argument("--cycles", type=int, default=None,
+                        help="Deadlock cycles/groups to plant (default: 0 with --safe, otherwise 1)")
+    parser.add_argument("--cycle-length", type=int, default=2)
+    parser.add_argument("--safe", action="store_true", help="Generate a deadlock-free/safe state")
+    parser.add_argument("--held-fraction", type=float, default=0.8, help="Single: fraction of resources held")
+    parser.add_argument("--max-instances", type=int, default=3, help="Multi: largest random matrix cell")
+    parser.add_argument("--format", choices=["state", "events"], default="state",
+                        help="A state file for `main.py detect`, or JSON-lines events for `main.py monitor` (single only)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    cycles = args.cycles if args.cycles is not None else (0 if args.safe else 1)
+    if args.safe and cycles:
+        parser.error("--safe cannot be combined with --cycles > 0")
+    options = {"cycles": cycles, "cycle_length": args.cycle_length, "seed": args.seed}
+    if args.mode == "single":
+        options.update(density=1.0 if args.density is None else args.density, held_fraction=args.held_fraction)
+        writer = write_single_events if args.format == "events" else write_single_state
+    else:
+        if args.format == "events":
+            parser.error("--format events is only available for single-instance scenarios")
+        options.update(density=0.5 if args.density is None else args.density, max_instances=args.max_instances)
+        writer = write_multi_state
+
+    out = open(args.output, "w", encoding="utf-8", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        writer(out, args.processes, args.resources, **options)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
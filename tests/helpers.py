@@ -0,0 +1,113 @@
+import random
+
+
+def random_single_state(seed, max_processes=8, max_resources=8, hold_probability=0.7, max_requests=3):
+    """A valid random single-instance state: (resources_held, resources_wanted, total_resources)."""
+    rng = random.Random(seed)
+    num_processes = rng.randint(1, max_processes)
+    total_resources = rng.randint(1, max_resources)
+    processes = [f"P{i+1}" for i in range(num_processes)]
+    held = {p: [] for p in processes}
+    wanted = {p: [] for p in processes}
+    holder = {}
+    for r in range(total_resources):
+        if rng.random() < hold_probability:
+            p = rng.choice(processes)
+            held[p].append(f"R{r+1}")
+            holder[f"R{r+1}"] = p
+    for p in processes:
+        for _ in range(rng.randint(0, max_requests)):
+            resource = f"R{rng.randint(1, total_resources)}"
+            if holder.get(resource) != p and resource not in wanted[p]:
+                wanted[p].append(resource)
+    return held, wanted, total_resources
+
+
+def rag_adjacency(resources_held, resources_wanted):
+    """The RAG of a single-instance state as {node: set of successors}."""
+    graph = {}
+    for process, resources in resources_held.items():
+        graph.setdefault(process, set())
+        for resource in resources:
+            graph.setdefault(resource, set()).add(process)
+    for process, resources in resources_wanted.items():
+        graph.setdefault(process, set())
+        for resource in resources:
+            graph[process].add(resource)
+            graph.setdefault(resource, set())
+    return graph
+
+
+def has_cycle(graph):
+    """Reference cycle check: repeatedly removes nodes without predecessors (Kahn)."""
+    indegree = {node: 0 for node in graph}
+    for targets in graph.values():
+        for target in targets:
+            indegree[target] = indegree.get(target, 0) + 1
+    stack = [node for node, degree in indegree.items() if degree == 0]
+    removed = 0
+    while stack:
+        node = stack.pop()
+        removed += 1
+        for target in graph.get(node, ()):
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                stack.append(target)
+    return removed < len(indegree)
+
+
+def is_cycle_of(cycle, graph):
+    """True if cycle is a closed walk [a, b, ..., a] along edges of graph."""
+    return (len(cycle) > 2 and cycle[0] == cycle[-1]
+            and all(v in graph.get(u, ()) for u, v in zip(cycle, cycle[1:])))
+
+
+def deadlocked_sets(graph):
+    """Reference deadlocked sets: groups of two or more mutually reachable nodes."""
+    reach = {}
+    for start in graph:
+        seen = set()
+        stack = [start]
+        while stack:
+            for target in graph.get(stack.pop(), ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        reach[start] = seen
+    return {frozenset([u] + [v for v in reach[u] if u in reach[v]])
+            for u in graph if u in reach[u]}
+
+
+def random_multi_state(seed, max_processes=8, max_resources=5, max_instances=6):
+    """A valid random Banker's state as dicts: (allocation, max_matrix, available, total_resources)."""
+    rng = random.Random(seed)
+    processes = [f"P{i+1}" for i in range(rng.randint(1, max_processes))]
+    resources = [f"R{j+1}" for j in range(rng.randint(1, max_resources))]
+    total = {r: rng.randint(0, max_instances) for r in resources}
+    allocation = {p: {} for p in processes}
+    available = dict(total)
+    for r in resources:
+        for p in processes:
+            allocation[p][r] = rng.randint(0, available[r])
+            available[r] -= allocation[p][r]
+    max_matrix = {p: {r: allocation[p][r] + rng.randint(0, max_instances // 2) for r in resources}
+                  for p in processes}
+    return allocation, max_matrix, available, total
+
+
+def rescan_safe_sequence(allocation, max_matrix, available):
+    """Reference Banker's Algorithm: after each finish, rescans from the first remaining process."""
+    processes = list(allocation)
+    work = dict(available)
+    remaining = list(processes)
+    sequence = []
+    while True:
+        for p in remaining:
+            if all(max_matrix[p].get(r, 0) - allocation[p].get(r, 0) <= work[r] for r in work):
+                for r in work:
+                    work[r] += allocation[p].get(r, 0)
+                sequence.append(p)
+                remaining.remove(p)
+                break
+        else:
+            return sequence, remaining
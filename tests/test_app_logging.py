@@ -0,0 +1,58 @@
+import logging
+import pytest
+from app_logging import ROOT_LOGGER, configure_logging, get_logger, log_event, stop_logging
+
+
+@pytest.fixture
+def root_logger():
+    """Restores the application logger after a test reconfigures it."""
+    logger = logging.getLogger(ROOT_LOGGER)
+    saved = logger.handlers[:], logger.level, logger.propagate
+    yield logger
+    stop_logging()
+    logger.handlers, logger.level, logger.propagate = saved[0], saved[1], saved[2]
+
+
+class Counted:
+    """A field value that counts how often it is formatted."""
+    def __init__(self):
+        self.calls = 0
+
+    def __repr__(self):
+        self.calls += 1
+        return "counted"
+
+
+def test_module_loggers_sit_below_the_application_logger():
+    assert get_logger("gui").name == "deadlock.gui"
+    assert get_logger("package.gui").name == "deadlock.gui"
+
+
+def test_disabled_events_are_not_formatted(root_logger):
+    root_logger.setLevel(logging.WARNING)
+    value = Counted()
+    log_event(get_logger("test"), "allocation", process=value)
+    assert value.calls == 0
+
+
+def test_events_are_written_by_the_background_thread(root_logger, tmp_path):
+    path = tmp_path / "app.log"
+    configure_logging("debug", str(path))
+    held = ["R1"]
+    log_event(get_logger("gui"), "allocation", process="P1", held=held)
+    held.append("R2")  # Formatted when logged, so later changes do not show up
+    get_logger("gui").info("plain message")
+    stop_logging()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0].endswith("DEBUG deadlock.gui: allocation process='P1' held=['R1']")
+    assert lines[1].endswith("INFO deadlock.gui: plain message")
+
+
+def test_reconfiguring_replaces_the_level(root_logger, tmp_path):
+    path = tmp_path / "app.log"
+    configure_logging("debug", str(path))
+    configure_logging("warning", str(path))
+    log_event(get_logger("gui"), "allocation", process="P1")
+    get_logger("gui").warning("kept")
+    stop_logging()
+    assert [line.split(": ", 1)[1] for line in path.read_text(encoding="utf-8").splitlines()] == ["kept"]
@@ -0,0 +1,128 @@
+import sys
+import time
+import heapq
+import itertools
+import pytest
+import background_task
+from background_task import BackgroundTask, detect_single, detect_multi_arrays, build_single_graph
+from helpers import random_multi_state, rescan_safe_sequence
+
+
+def deadlocked_state():
+    return {"P1": ["R1"], "P2": ["R2"]}, {"P1": ["R2"], "P2": ["R1"]}, 2
+
+
+class FakeWindow:
+    """Stands in for a Tk window: runs after() callbacks in due order, without a display."""
+    def __init__(self):
+        self.queue = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+        self.exists = True
+
+    def after(self, ms, function, *args):
+        callback_id = next(self.ids)
+        heapq.heappush(self.queue, (time.monotonic() + ms / 1000, callback_id, function, args))
+        return callback_id
+
+    def after_cancel(self, callback_id):
+        self.cancelled.add(callback_id)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def run(self, timeout=30):
+        """Runs callbacks until none are left, failing if one blocks the (fake) Tk thread."""
+        deadline = time.monotonic() + timeout
+        while self.queue and time.monotonic() < deadline:
+            due, callback_id, function, args = heapq.heappop(self.queue)
+            if callback_id in self.cancelled:
+                continue
+            time.sleep(max(0.0, due - time.monotonic()))
+            start_time = time.perf_counter()
+            function(*args)
+            assert time.perf_counter() - start_time < 0.5, f"{function.__name__} blocked the Tk thread"
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(BackgroundTask, "_show_progress", lambda self: None)  # No display here
+    return FakeWindow()
+
+
+def start(window, function, args, size):
+    results, errors = [], []
+    task = BackgroundTask(window, function, args, lambda value, elapsed: results.append(value), errors.append,
+                          size=size)
+    return task, results, errors
+
+
+def test_small_task_runs_inline_on_a_snapshot(window):
+    held, wanted, total = deadlocked_state()
+    task, results, errors = start(window, detect_single, (held, wanted, total), size=4)
+    held["P1"].clear()  # Edits after starting do not reach the task
+    assert not results  # Delivered from the event loop, like a process result
+    window.run()
+    assert task._process is None and not task.running
+    assert results[0][0] is True and not errors
+
+
+def test_large_task_runs_in_a_process(window):
+    task, results, errors = start(window, detect_single, deadlocked_state(), size=10**6)
+    window.run()
+    assert results[0][0] is True and not errors
+    assert task._process.exitcode == 0
+
+
+@pytest.mark.parametrize("size", [1, 10**6])
+def test_errors_reach_on_error(window, size):
+    _, results, errors = start(window, detect_single, ({"P1": ["R9"]}, {}, 2), size=size)
+    window.run()
+    assert not results
+    assert errors == ["Invalid resource R9 in resources_held for P1"]
+
+
+def test_cancel_stops_the_process_without_callbacks(window):
+    task, results, errors = start(window, time.sleep, (30,), size=10**6)
+    task.cancel()
+    window.run()
+    assert not results and not errors
+    assert task._process.exitcode is not None
+
+
+def test_closed_window_cancels_the_task(window):
+    task, results, errors = start(window, time.sleep, (30,), size=10**6)
+    window.exists = False
+    window.run()
+    assert not task.running and not results and not errors
+    task._process.join(5)
+    assert task._process.exitcode is not None
+
+
+def test_build_single_graph_validates():
+    assert build_single_graph(*deadlocked_state()).num_nodes == 4
+    with pytest.raises(ValueError):
+        build_single_graph({"P1": ["R3"]}, {}, 2)
+
+
+@pytest.mark.parametrize("numpy_installed", [True, False])
+@pytest.mark.parametrize("seed", range(30))
+def test_detect_multi_arrays_matches_the_rescan_reference(monkeypatch, numpy_installed, seed):
+    if not numpy_installed:
+        monkeypatch.setitem(sys.modules, "numpy", None)  # Makes `import numpy` raise ImportError
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    processes, resources = list(allocation), list(total)
+    deadlocked, _, safe_sequence = detect_multi_arrays(
+        [allocation[p][r] for p in processes for r in resources],
+        [max_matrix[p][r] for p in processes for r in resources],
+        [total[r] for r in resources], len(processes), len(resources))
+    sequence, unfinished = rescan_safe_sequence(allocation, max_matrix, available)
+    assert (deadlocked, safe_sequence) == (bool(unfinished), sequence)
+
+
+def test_run_reports_unexpected_errors():
+    status, message, elapsed = background_task._run(int, ("x",))
+    assert status == "error" and message.startswith("invalid literal")
+    status, message, _ = background_task._run(len, (None,))
+    assert (status, message) == ("error", "TypeError: object of type 'NoneType' has no len()")
+    assert background_task._run(len, ([1],))[:2] == ("ok", 1)
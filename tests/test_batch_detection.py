@@ -0,0 +1,76 @@
+import pytest
+from batch_detection import detect_many, detect_state, state_mode
+from helpers import random_single_state, random_multi_state, rescan_safe_sequence
+
+
+def make_states(count):
+    states = []
+    for seed in range(count):
+        held, wanted, total = random_single_state(seed)
+        states.append({"resources_held": held, "resources_wanted": wanted, "total_resources": total})
+        allocation, max_matrix, available, total = random_multi_state(seed)
+        states.append({"allocation": allocation, "max": max_matrix, "total_resources": total})
+    return states
+
+
+def without_timing(results):
+    return [result._replace(elapsed=None) for result in results]
+
+
+def test_pool_results_match_inline_results_in_order():
+    states = make_states(40)
+    inline = detect_many(states, workers=1)
+    assert without_timing(detect_many(states, workers=2, chunksize=7)) == without_timing(inline)
+    assert all(result.error is None and result.elapsed >= 0 for result in inline)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_multi_state_derives_available(seed):
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    sequence, unfinished = rescan_safe_sequence(allocation, max_matrix, available)
+    result = detect_state({"allocation": allocation, "max": max_matrix, "total_resources": total})
+    assert result.deadlocked == bool(unfinished)
+    assert result.safe_sequence == sequence
+    assert result.unfinished == unfinished
+    assert result.cycle is None and result.components is None
+
+
+def test_single_state_reports_cycle_and_components():
+    result = detect_state({"resources_held": {"P1": ["R1"], "P2": ["R2"]},
+                           "resources_wanted": {"P1": ["R2"], "P2": ["R1"]}, "total_resources": 2})
+    assert result.deadlocked
+    assert result.cycle[0] == result.cycle[-1]
+    assert [sorted(c) for c in result.components] == [["P1", "P2", "R1", "R2"]]
+    assert result.safe_sequence is None and result.unfinished is None
+
+
+def test_matrix_file_state(tmp_path):
+    from matrix_io import save_matrices
+    path = str(tmp_path / "state.npz")
+    save_matrices(path, [[1, 0], [0, 1]], [[1, 1], [1, 1]], [1, 1])
+    result = detect_state({"matrix_file": path})
+    assert result.deadlocked
+    assert result.unfinished == ["P1", "P2"]
+
+
+@pytest.mark.parametrize("state, error", [
+    ({"resources_held": {"P1": ["R3"]}, "total_resources": 2}, "Invalid resource R3 in resources_held for P1"),
+    ({"resources_held": {}}, "Missing field 'total_resources'"),
+    ({"mode": "triple"}, "Unknown detection mode: triple"),
+    ({"allocation": {"P1": {"R1": 3}}, "max": {"P1": {"R1": 3}}, "total_resources": {"R1": 2}},
+     "Invalid data: Allocation of R1 (3) exceeds Total (2)"),
+    ("P1", "A state must be a dict, not str."),
+])
+def test_invalid_states_become_error_results(state, error):
+    result = detect_state(state)
+    assert result.deadlocked is None
+    assert result.error == error
+
+
+def test_state_mode():
+    assert state_mode({"mode": "multi", "resources_held": {}}) == "multi"
+    assert state_mode({"allocation": {}}) == "multi"
+    assert state_mode({"matrix_file": "x.csv"}) == "multi"
+    assert state_mode({"resources_held": {}}) == "single"
+    with pytest.raises(ValueError):
+        state_mode(["P1"])
@@ -0,0 +1,59 @@
+import time
+import pytest
+from benchmark import (BENCHMARKS, SINGLE_FAMILIES, chain_state, ring_state, dense_bankers_state,
+                       run_suite, compare)
+from deadlock_algo import DeadlockDetector
+
+
+@pytest.mark.parametrize("family", sorted(SINGLE_FAMILIES))
+def test_single_families_are_valid_states(family):
+    held, wanted, total = SINGLE_FAMILIES[family](200, seed=1)
+    DeadlockDetector(held, wanted, total)  # Raises on an invalid state
+    assert total == 100
+
+
+def test_chain_is_safe_and_ring_is_deadlocked():
+    assert not DeadlockDetector(*chain_state(50)).detect_cycle()
+    assert DeadlockDetector(*ring_state(50)).detect_cycle()
+
+
+def test_dense_bankers_state_is_valid_and_seeded():
+    allocation, max_matrix, available, n, m = dense_bankers_state(100, seed=3, num_resources=4)
+    assert (n, m) == (100, 4)
+    assert len(allocation) == len(max_matrix) == n * m
+    assert all(a <= b for a, b in zip(allocation, max_matrix))
+    assert all(1 <= a <= 3 for a in available)
+    assert dense_bankers_state(100, seed=3, num_resources=4)[0] == allocation
+
+
+def test_every_benchmark_runs_on_small_inputs():
+    results = run_suite(sorted(BENCHMARKS), [10, 100], time_limit=60, repeats=1)
+    assert results
+    for result in results:
+        if "skipped" not in result:
+            assert result["seconds"] >= 0 and result["setup_seconds"] >= 0 and result["peak_bytes"] >= 0
+    assert {r["benchmark"] for r in results} == set(BENCHMARKS)
+
+
+def test_sizes_stop_growing_past_the_time_limit(monkeypatch):
+    def slow_state(size, seed=0):
+        time.sleep(0.02)  # Input building counts against the limit
+        return size
+
+    monkeypatch.setitem(BENCHMARKS, "fake", (lambda state: (lambda: None), {"slow": slow_state}))
+    results = run_suite(["fake"], [1, 1000, 10000], time_limit=1.0, repeats=1)
+    assert "seconds" in results[0]
+    assert results[1]["skipped"] == "projected to exceed 1.0 s"
+    assert results[2]["skipped"] == "projected to exceed 1.0 s"
+    results = run_suite(["fake"], [1, 2], time_limit=0.01, repeats=1)
+    assert results[1]["skipped"] == "previous size exceeded 0.01 s"
+
+
+def test_compare_reports_regressions_only():
+    baseline = {"results": [{"benchmark": "b", "family": "f", "size": 10, "seconds": 0.01},
+                            {"benchmark": "b", "family": "f", "size": 100, "seconds": 0.0001}]}
+    results = [{"benchmark": "b", "family": "f", "size": 10, "seconds": 0.02},
+               {"benchmark": "b", "family": "f", "size": 100, "seconds": 0.01},
+               {"benchmark": "b", "family": "f", "size": 1000, "skipped": "x"}]
+    assert compare(results, baseline, 1.5) == ["b/f/10: 0.0100 s -> 0.0200 s"]
+    assert compare(results, baseline, 3) == []
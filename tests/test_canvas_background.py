@@ -0,0 +1,117 @@
+import types
+import pytest
+import canvas_background
+from canvas_background import (GRADIENT_STEPS, GRADIENT_TAG, MAX_CACHED_GRADIENTS, SIZE_BUCKET, ResizeCoalescer,
+                               draw_gradient, gradient_image)
+
+
+class FakePhotoImage:
+    def __init__(self, master, width, height):
+        self.width, self.height = width, height
+        self.puts = []
+
+    def put(self, color, to):
+        self.puts.append((color, to))
+
+
+class FakeCanvas:
+    """Stands in for a tk.Canvas (and its Tk interpreter) for the gradient item."""
+    def __init__(self):
+        self.tk = object()
+        self.items = {}
+
+    def find_withtag(self, tag):
+        return tuple(item for item, options in self.items.items() if options["tags"] == tag)
+
+    def create_image(self, x, y, anchor, image, tags):
+        item = len(self.items) + 1
+        self.items[item] = {"image": image, "tags": tags}
+        return item
+
+    def itemconfigure(self, item, image):
+        self.items[item]["image"] = image
+
+    def tag_lower(self, item):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fake_images(monkeypatch):
+    monkeypatch.setattr(canvas_background.tk, "PhotoImage", FakePhotoImage)
+    monkeypatch.setattr(canvas_background, "_gradients", canvas_background.OrderedDict())
+
+
+def test_gradient_is_painted_once_per_size_bucket():
+    canvas = FakeCanvas()
+    image = gradient_image(canvas, "#000000", "#ff8000", 500, 301)
+    assert (image.width, image.height) == (512, 320)
+    assert len(image.puts) == GRADIENT_STEPS
+    assert image.puts[0] == ("#000000", (0, 0, 512, 3))
+    assert image.puts[-1][0] == "#fc7e00"
+    assert gradient_image(canvas, "#000000", "#ff8000", 512 - SIZE_BUCKET + 1, 300) is image
+    assert gradient_image(canvas, "#000000", "#ff8000", 513, 300) is not image
+    assert gradient_image(FakeCanvas(), "#000000", "#ff8000", 500, 301) is not image  # Other interpreter
+
+
+def test_least_recently_used_gradients_are_evicted():
+    canvas = FakeCanvas()
+    first = gradient_image(canvas, "#000000", "#ffffff", 32, 32)
+    second = gradient_image(canvas, "#000000", "#ffffff", 32, 64)
+    for i in range(MAX_CACHED_GRADIENTS - 2):
+        gradient_image(canvas, "#000000", "#ffffff", 64, 32 + i * SIZE_BUCKET)
+    assert gradient_image(canvas, "#000000", "#ffffff", 32, 32) is first  # Now the most recently used
+    gradient_image(canvas, "#000000", "#ffffff", 128, 32)
+    cached = list(canvas_background._gradients.values())
+    assert len(cached) == MAX_CACHED_GRADIENTS
+    assert first in cached and second not in cached
+
+
+def test_draw_gradient_swaps_the_image_of_one_item():
+    canvas = FakeCanvas()
+    item = draw_gradient(canvas, "#000000", "#ffffff", 400, 300)
+    assert draw_gradient(canvas, "#000000", "#ffffff", 800, 600) == item
+    assert len(canvas.items) == 1
+    assert canvas.items[item]["image"] is canvas.gradient_image
+    assert canvas.find_withtag(GRADIENT_TAG) == (item,)
+    assert canvas.gradient_image.width == 800
+
+
+class FakeWidget:
+    def __init__(self):
+        self.bindings = []
+        self.scheduled = []
+
+    def bind(self, sequence, function, add=None):
+        self.bindings.append(function)
+
+    def after(self, ms, function):
+        self.scheduled.append(function)
+        return len(self.scheduled)
+
+    def configure_event(self, width, height, widget=None):
+        for function in self.bindings:
+            function(types.SimpleNamespace(widget=widget or self, width=width, height=height))
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for function in scheduled:
+            function()
+
+
+def test_resize_bursts_run_the_handler_once_with_the_latest_size():
+    widget = FakeWidget()
+    calls = []
+    ResizeCoalescer(widget, lambda event: calls.append((event.width, event.height)))
+    for width in range(600, 700, 10):
+        widget.configure_event(width, 400)
+    widget.configure_event(900, 900, widget=object())  # A child widget's event
+    assert len(widget.scheduled) == 1
+    widget.run_pending()
+    assert calls == [(690, 400)]
+
+    widget.configure_event(690, 400)  # Moved, not resized
+    widget.run_pending()
+    assert calls == [(690, 400)]
+    widget.configure_event(700, 500)
+    widget.run_pending()
+    assert calls == [(690, 400), (700, 500)]
@@ -0,0 +1,70 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+from cli import main
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+SAFE = {"resources_held": {"P1": ["R1"]}, "resources_wanted": {"P2": ["R1"]}, "total_resources": 2}
+DEADLOCKED = {"resources_held": {"P1": ["R1"], "P2": ["R2"]},
+              "resources_wanted": {"P1": ["R2"], "P2": ["R1"]}, "total_resources": 2}
+UNSAFE = {"allocation": {"P1": {"R1": 1}, "P2": {"R1": 1}}, "max": {"P1": {"R1": 2}, "P2": {"R1": 2}},
+          "total_resources": {"R1": 2}}
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("states, code", [
+    ([SAFE], 0),
+    ([DEADLOCKED], 1),
+    ([UNSAFE], 1),
+    ([SAFE, DEADLOCKED], 1),
+    ([SAFE, {"resources_held": {"P1": ["R9"]}, "total_resources": 2}], 2),
+])
+def test_detect_exit_codes(tmp_path, states, code):
+    assert main(["detect", write(tmp_path, "states.json", states)]) == code
+
+
+@pytest.mark.parametrize("content", ["not json", "42", "[1, 2]", '["P1"]'])
+def test_detect_rejects_files_without_state_objects(tmp_path, capsys, content):
+    assert main(["detect", write(tmp_path, "bad.json", content)]) == 2
+    assert "Error" in capsys.readouterr().err
+
+
+def test_detect_missing_file_exits_2(tmp_path):
+    assert main(["detect", str(tmp_path / "missing.json")]) == 2
+
+
+def test_detect_json_output(tmp_path, capsys):
+    safe, deadlocked = write(tmp_path, "safe.json", SAFE), write(tmp_path, "deadlocked.json", DEADLOCKED)
+    assert main(["detect", safe, deadlocked, "--json"]) == 1
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["source"], r["deadlocked"]) for r in results] == [(safe, False), (deadlocked, True)]
+
+
+def test_detect_matrix_file(tmp_path, capsys):
+    path = write(tmp_path, "state.csv", "")
+    from matrix_io import save_matrices
+    save_matrices(path, [[1, 0], [0, 1]], [[1, 0], [0, 1]], [1, 1])
+    assert main(["detect", path]) == 0
+    assert capsys.readouterr().out.startswith("Safe sequence: ['P1', 'P2']")
+
+
+def test_detect_does_not_import_the_gui_stack(tmp_path):
+    path = write(tmp_path, "state.json", DEADLOCKED)
+    code = ("import sys, main\n"
+            "sys.argv = ['main.py', 'detect', sys.argv[1]]\n"
+            "try:\n"
+            "    main.main()\n"
+            "except SystemExit as e:\n"
+            "    print([m for m in ('tkinter', 'pygame', 'matplotlib') if m in sys.modules])\n"
+            "    raise\n")
+    process = subprocess.run([sys.executable, "-c", code, path], cwd=SRC, capture_output=True, text=True)
+    assert process.returncode == 1, process.stderr
+    assert process.stdout.splitlines()[-1] == "[]"
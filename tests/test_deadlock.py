@@ -0,0 +1,60 @@
+import pytest
+from deadlock_algo import DeadlockDetector
+from helpers import random_single_state, rag_adjacency, deadlocked_sets, is_cycle_of
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_reports_every_deadlocked_set(seed):
+    held, wanted, total = random_single_state(seed)
+    detector = DeadlockDetector(held, wanted, total)
+    graph = rag_adjacency(held, wanted)
+    expected = deadlocked_sets(graph)
+    rag = detector.build_rag()
+    assert detector.detect_cycle(rag) == bool(expected)
+    assert {frozenset(component) for component in detector.deadlocked_components} == expected
+    assert len(detector.deadlocked_components) == len(expected)
+    assert {frozenset(component) for component in detector.find_deadlocked_components(rag)} == expected
+    if expected:
+        assert is_cycle_of(detector.cycle, graph)
+    else:
+        assert detector.cycle is None
+
+
+def test_long_wait_chain_does_not_recurse():
+    n = 20000
+    held = {f"P{i+1}": [f"R{i+1}"] for i in range(n)}
+    wanted = {f"P{i+1}": [f"R{(i+1) % n + 1}"] for i in range(n)}
+    detector = DeadlockDetector(held, wanted, n)
+    assert detector.detect_cycle(detector.build_rag())
+    assert len(detector.cycle) == 2 * n + 1
+    assert len(detector.deadlocked_components) == 1
+
+
+def test_message_lists_all_deadlocked_sets():
+    held = {"P1": ["R1"], "P2": ["R2"], "P3": ["R3"], "P4": ["R4"]}
+    wanted = {"P1": ["R2"], "P2": ["R1"], "P3": ["R4"], "P4": ["R3"]}
+    deadlocked, message = DeadlockDetector(held, wanted, 4).detect_deadlock()
+    assert deadlocked
+    assert "2 deadlocked sets found" in message
+
+
+@pytest.mark.parametrize("held, wanted, expected", [
+    ({}, {}, "Please allocate and request resources before detecting deadlock."),
+    ({}, {"P1": ["R1"]}, "No resources are allocated. Please allocate resources before detecting deadlock."),
+    ({"P1": ["R1"]}, {}, "No resources are requested. Please request resources before detecting deadlock."),
+    ({"P1": ["R1"], "P2": []}, {"P2": ["R1"]}, "No deadlock detected in the system."),
+    ({"P1": ["R1"]}, {"P2": ["R1"]}, "No deadlock detected in the system."),
+])
+def test_messages_without_deadlock(held, wanted, expected):
+    assert DeadlockDetector(held, wanted, 2).detect_deadlock() == (False, expected)
+
+
+def test_detect_cycle_accepts_an_adjacency_list():
+    detector = DeadlockDetector({}, {}, 2)
+    assert detector.detect_cycle({"P1": ["R2"], "P2": ["R1"], "R1": ["P1"], "R2": ["P2"]})
+    assert not detector.detect_cycle({"P1": ["R2"], "R1": ["P1"]})
+
+
+def test_rejects_non_positive_totals():
+    with pytest.raises(ValueError):
+        DeadlockDetector({}, {}, 0)
@@ -0,0 +1,70 @@
+import os
+import pytest
+from diagram_export import export_many, multi_diagram_inputs
+
+SINGLE = {"resources_held": {"P1": ["R1"], "P2": ["R2"]},
+          "resources_wanted": {"P1": ["R2"], "P2": ["R1"]}, "total_resources": 2}
+MULTI = {"allocation": {"P1": {"R1": 1, "R2": 0}, "P2": {"R1": 0, "R2": 2}},
+         "max": {"P1": {"R1": 2, "R2": 1}, "P2": {"R1": 1, "R2": 2}}, "total_resources": {"R1": 2, "R2": 2}}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_exports_png_and_svg(tmp_path, workers):
+    jobs = [(SINGLE, str(tmp_path / "single.png")), (MULTI, str(tmp_path / "multi.svg")),
+            (SINGLE, str(tmp_path / "single.svg"))]
+    results = export_many(jobs, workers=workers)
+    assert [result.output_path for result in results] == [path for _, path in jobs]
+    assert all(result.error is None for result in results)
+    with open(tmp_path / "single.png", "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
+    with open(tmp_path / "multi.svg", encoding="utf-8") as f:
+        assert "<svg" in f.read()
+
+
+def test_exports_matrix_files_and_lod(tmp_path):
+    from matrix_io import save_matrices
+    from workload_generator import generate_single_state
+    matrix_path = str(tmp_path / "state.npz")
+    save_matrices(matrix_path, [[1, 0], [0, 1]], [[1, 1], [1, 1]], [1, 1])
+    held, wanted, total = generate_single_state(300, 300, cycles=1, seed=0)
+    large = {"resources_held": held, "resources_wanted": wanted, "total_resources": total}
+    results = export_many([({"matrix_file": matrix_path}, str(tmp_path / "matrix.png")),
+                           (large, str(tmp_path / "large.png"))], workers=1, detail="auto", dpi=50)
+    assert [result.error for result in results] == [None, None]
+    assert os.path.getsize(tmp_path / "large.png") > 0
+
+
+def test_invalid_states_are_reported_not_raised(tmp_path):
+    results = export_many([({"resources_held": {"P1": ["R5"]}, "total_resources": 2}, str(tmp_path / "a.png")),
+                           ({"resources_held": {}}, str(tmp_path / "b.png")),
+                           (SINGLE, str(tmp_path / "missing" / "c.png"))], workers=1)
+    assert results[0].error == "Invalid resource R5 in resources_held for P1"
+    assert results[1].error == "Missing field 'total_resources'"
+    assert results[2].error is not None
+    assert not os.path.exists(tmp_path / "a.png")
+
+
+def test_multi_diagram_inputs():
+    rag, flat_allocation, need = multi_diagram_inputs(["P1", "P2"], ["R1", "R2"], [[2, 0], [0, 1]], [[0, 1], [1, 0]])
+    assert rag == {"P1": ["R2"], "P2": ["R1"], "R1": ["P1"], "R2": ["P2"]}
+    assert flat_allocation == {"P1": ["R1", "R1"], "P2": ["R2"]}
+    assert need == {"P1": {"R1": 0, "R2": 1}, "P2": {"R1": 1, "R2": 0}}
+    assert multi_diagram_inputs(["P1"], ["R1"], [[1]], [[0]], full=False) == ({"P1": [], "R1": ["P1"]}, None, None)
+
+
+@pytest.mark.parametrize("detail", ["full", "lod"])
+def test_exports_multi_states_with_any_names(tmp_path, detail):
+    state = {"allocation": {"P1": {"A": 1}}, "max": {"P1": {"A": 2}}, "total_resources": {"A": 1}}
+    results = export_many([(state, str(tmp_path / "named.svg"))], workers=1, detail=detail)
+    assert results[0].error is None
+    assert os.path.getsize(tmp_path / "named.svg") > 0
+
+
+def test_multi_view_takes_the_processes_instead_of_guessing_by_name():
+    from multi_visualization import MultiRAGView
+    rag, flat_allocation, need = multi_diagram_inputs(["web", "db"], ["disk"], [[1], [0]], [[0], [1]])
+    view = MultiRAGView()
+    view.update(rag, flat_allocation, need, [], ["db"], "full", ["web", "db"])
+    assert set(view.nodes.specs) == {"web", "db", "disk"}
+    assert view.nodes.specs["disk"][1] == 1  # A resource, drawn with one instance
+    assert set(view.edges.specs) == {("disk", "web"), ("db", "disk")}
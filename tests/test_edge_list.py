@@ -0,0 +1,129 @@
+import random
+import types
+import pytest
+from edge_list import EdgeList
+
+
+class FakeCanvas:
+    """Records the text items an EdgeList creates and how often they are reconfigured."""
+    def __init__(self):
+        self.items = {}
+        self.next_id = 1
+        self.configured = 0
+        self.bindings = {}
+
+    def bind(self, sequence, function, add=None):
+        self.bindings[sequence] = function
+
+    def create_text(self, x, y, **options):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = {"coords": [x, y], "text": ""}
+        return item
+
+    def coords(self, item):
+        return self.items[item]["coords"]
+
+    def delete(self, item):
+        del self.items[item]
+
+    def itemconfigure(self, item, text):
+        self.configured += 1
+        self.items[item]["text"] = text
+
+    def texts(self):
+        return [item["text"] for item in self.items.values()]
+
+
+class FakeScrollbar:
+    def config(self, command):
+        self.command = command
+
+    def set(self, first, last):
+        self.fractions = (first, last)
+
+
+@pytest.fixture
+def edge_list():
+    canvas = FakeCanvas()
+    rows = EdgeList(canvas, FakeScrollbar(), top=45, row_height=27)
+    rows.canvas.bindings["<Configure>"](types.SimpleNamespace(width=200, height=45 + 4 * 27))
+    return rows
+
+
+def test_pool_covers_only_the_viewport(edge_list):
+    assert len(edge_list.items) == 5
+    edge_list.set_rows(((f"P{i}", "R1"), f"P{i} -> R1") for i in range(1000))
+    assert len(edge_list) == 1000
+    assert len(edge_list.canvas.items) == 5
+    assert edge_list.canvas.texts() == [f"P{i} -> R1" for i in range(5)]
+
+
+def test_adding_a_row_touches_a_bounded_number_of_items(edge_list):
+    edge_list.set_rows(((f"P{i}", "R1"), f"P{i} -> R1") for i in range(1000))
+    edge_list.canvas.configured = 0
+    edge_list.add(("P1000", "R1"), "P1000 -> R1")
+    assert edge_list.canvas.configured <= len(edge_list.items)
+    assert edge_list.canvas.texts()[-2] == "P1000 -> R1"  # Scrolled into view above the cut-off row
+    edge_list.canvas.configured = 0
+    edge_list.add(("P1000", "R1"), "P1000 -> R1")  # Unchanged text: nothing is redrawn
+    assert edge_list.canvas.configured == 0
+
+
+def test_remove_moves_later_rows_up(edge_list):
+    edge_list.set_rows([("a", "A"), ("b", "B"), ("c", "C")])
+    edge_list.remove("b")
+    assert "b" not in edge_list and "c" in edge_list
+    assert edge_list.canvas.texts()[:3] == ["A", "C", ""]
+    edge_list.clear()
+    assert len(edge_list) == 0 and edge_list.canvas.texts() == [""] * 5
+
+
+def test_scrolling_is_clamped(edge_list):
+    edge_list.set_rows((i, f"row {i}") for i in range(20))
+    edge_list.yview("scroll", 1, "pages")
+    assert edge_list.first_row == 4
+    edge_list.yview("moveto", "1.0")
+    assert edge_list.first_row == 16
+    assert edge_list.canvas.texts() == ["row 16", "row 17", "row 18", "row 19", ""]
+    edge_list.yview("scroll", -100, "units")
+    assert edge_list.first_row == 0
+    assert edge_list.scrollbar.fractions == (0.0, 0.25)
+
+
+def test_resize_rebuilds_the_pool_only_when_needed(edge_list):
+    items = list(edge_list.items)
+    edge_list.canvas.bindings["<Configure>"](types.SimpleNamespace(width=200, height=45 + 4 * 27))
+    assert edge_list.items == items
+    edge_list.canvas.bindings["<Configure>"](types.SimpleNamespace(width=300, height=45 + 9 * 27))
+    assert len(edge_list.items) == 10 and len(edge_list.canvas.items) == 10
+
+
+def test_random_edits_match_a_plain_list(edge_list):
+    rng = random.Random(7)
+    keys, texts, first_row = [], {}, 0
+    visible = len(edge_list.items) - 1
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.45 or not keys:
+            key = rng.randrange(60)
+            if key not in texts:
+                keys.append(key)
+            texts[key] = f"row {key} @{step}"
+            edge_list.add(key, texts[key])
+            if len(keys) - 1 >= first_row + visible:
+                first_row = len(keys) - visible
+        elif action < 0.9:
+            key = rng.choice(keys)
+            keys.remove(key)
+            del texts[key]
+            edge_list.remove(key)
+            first_row = max(0, min(first_row, len(keys) - visible))
+        else:
+            delta = rng.randint(-3, 3)
+            edge_list.yview("scroll", delta, "units")
+            first_row = max(0, min(first_row + delta, len(keys) - visible))
+        assert edge_list.first_row == first_row
+        shown = [texts[key] for key in keys[first_row:first_row + len(edge_list.items)]]
+        assert edge_list.canvas.texts() == shown + [""] * (len(edge_list.items) - len(shown))
+    assert len(edge_list) == len(keys)
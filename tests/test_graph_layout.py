@@ -0,0 +1,53 @@
+import math
+import networkx as nx
+from graph_layout import BipartiteLayout, CircularLayout
+
+
+def test_first_bipartite_layout_matches_networkx():
+    nodes = ["P1", "P2", "P3", "R1", "R2"]
+    processes = {"P1", "P2", "P3"}
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    expected = nx.bipartite_layout(graph, ["P1", "P2", "P3"], align="horizontal", scale=2.0, center=(0, 0))
+    positions = BipartiteLayout(scale=2.0).layout(nodes, processes)
+    for node in nodes:
+        assert positions[node] == (float(expected[node][0]), float(expected[node][1]))
+
+
+def test_bipartite_layout_keeps_old_nodes_and_extends_rows():
+    layout = BipartiteLayout()
+    first = layout.layout(["P1", "P2", "R1", "R2"], {"P1", "P2"})
+    second = layout.layout(["P1", "P2", "P3", "R1", "R2", "R3"], {"P1", "P2", "P3"})
+    for node in first:
+        assert second[node] == first[node]
+    xs = sorted((first["P1"][0], first["P2"][0]))
+    assert second["P3"] == (xs[1] + (xs[1] - xs[0]), first["P1"][1])  # One step past the end of the row
+    assert second["R3"][1] == first["R1"][1] and second["R3"][0] > max(first["R1"][0], first["R2"][0])
+
+
+def test_bipartite_layout_remembers_removed_nodes():
+    layout = BipartiteLayout()
+    first = layout.layout(["P1", "P2", "R1"], {"P1", "P2"})
+    layout.layout(["P1", "R1"], {"P1"})
+    assert layout.layout(["P1", "P2", "R1"], {"P1", "P2"}) == first
+
+
+def test_bipartite_layout_adds_the_first_node_of_a_kind_on_its_own_row():
+    layout = BipartiteLayout()
+    first = layout.layout(["P1", "P2"], {"P1", "P2"})
+    r1 = layout.layout(["P1", "P2", "R1"], {"P1", "P2"})["R1"]
+    assert r1[1] > first["P1"][1]
+
+
+def test_circular_layout_fills_the_widest_gap():
+    layout = CircularLayout(scale=1.0)
+    first = layout.layout(["P1", "P2", "P3", "P4"])
+    second = layout.layout(["P1", "P2", "P3", "P4", "P5", "P6"])
+    for node in first:
+        assert second[node] == first[node]
+    for node in ("P5", "P6"):
+        x, y = second[node]
+        assert math.isclose(math.hypot(x, y), 1.0)
+    angles = sorted(math.atan2(y, x) % (2 * math.pi) for x, y in second.values())
+    gaps = [(angles[(i + 1) % 6] - angles[i]) % (2 * math.pi) for i in range(6)]
+    assert max(gaps) <= math.pi / 2 + 1e-6  # No quarter of the circle is left empty
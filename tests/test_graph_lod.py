@@ -0,0 +1,68 @@
+import pytest
+from deadlock_algo import DeadlockDetector
+from graph_layout import BipartiteLayout, CircularLayout
+from graph_lod import LOD_THRESHOLD, MAX_DETAIL_NODES, build_lod, lod_positions
+from visualization import RAGView
+from workload_generator import generate_single_state
+from helpers import rag_adjacency
+
+
+def large_state(seed=0):
+    held, wanted, total = generate_single_state(200, 250, cycles=2, cycle_length=3, seed=seed)
+    detector = DeadlockDetector(held, wanted, total)
+    detector.detect_cycle()
+    focus = [node for component in detector.deadlocked_components for node in component]
+    adjacency = {node: sorted(targets) for node, targets in rag_adjacency(held, wanted).items()}
+    return held, wanted, total, adjacency, focus
+
+
+@pytest.mark.parametrize("max_detail, max_groups", [(150, 10), (20, 3), (1000, 1)])
+def test_every_node_and_edge_is_accounted_for(max_detail, max_groups):
+    _, _, _, adjacency, focus = large_state()
+    process_set = {node for node in adjacency if node.startswith("P")}
+    lod = build_lod(adjacency, process_set, focus, max_detail=max_detail, max_groups=max_groups)
+    assert len(lod.detail) <= max_detail
+    assert len(lod.groups) <= max_groups
+    assert set(focus) <= set(lod.detail) or len(lod.detail) == max_detail
+    assert len(lod.detail) + sum(size for _, size, _, _ in lod.groups) == len(adjacency)
+    assert sum(processes for _, _, processes, _ in lod.groups) == len(process_set - set(lod.detail))
+    total_edges = sum(len(targets) for targets in adjacency.values())
+    assert sum(count for *_, count in lod.edges) + sum(internal for *_, internal in lod.groups) == total_edges
+    for source, target, kind, _ in lod.edges:
+        assert kind == ("request" if source in process_set else "allocation") or source not in lod.detail
+
+
+def test_detail_is_the_neighbourhood_of_the_focus():
+    adjacency = {"P1": ["R2"], "P2": ["R1"], "R1": ["P1"], "R2": ["P2"], "P3": ["R1"], "R3": ["P3"],
+                 "P4": ["R3"], "P5": [], "R5": ["P5"]}
+    process_set = {"P1", "P2", "P3", "P4", "P5"}
+    lod = build_lod(adjacency, process_set, ["P1", "P2", "R1", "R2"], hops=1)
+    assert set(lod.detail) == {"P1", "P2", "R1", "R2", "P3"}
+    assert sorted(name for name, *_ in lod.groups) == ["G1", "G2"]
+    assert ("G1", "P3", "allocation", 1) in lod.edges or ("G2", "P3", "allocation", 1) in lod.edges
+
+
+def test_positions_cover_detail_and_groups():
+    _, _, _, adjacency, focus = large_state()
+    process_set = {node for node in adjacency if node.startswith("P")}
+    lod = build_lod(adjacency, process_set, focus)
+    pos = lod_positions(lod, process_set)
+    assert set(pos) == set(lod.detail) | {name for name, *_ in lod.groups}
+    assert {pos[node][1] for node in lod.detail if node in process_set} == {0.0}
+    assert {pos[name][1] for name, *_ in lod.groups} == {-2.5}
+
+
+def test_large_graphs_are_drawn_with_a_bounded_number_of_artists():
+    held, wanted, total, adjacency, _ = large_state()
+    assert len(adjacency) > LOD_THRESHOLD
+    detector = DeadlockDetector(held, wanted, total)
+    detector.detect_cycle()
+    view = RAGView(rag_layout=BipartiteLayout(), wfg_layout=CircularLayout())
+    view.update(detector.graph, held, wanted, detector.cycle, total)
+    assert view.lod.specs and not view.rag_nodes.specs
+    artists = sum(len(a) for a in view.lod.artists.values())
+    assert artists < len(adjacency)
+    assert artists <= 2 * MAX_DETAIL_NODES + 20  # Labels of the detail nodes in both panels, plus collections
+    assert view.update(detector.graph, held, wanted, detector.cycle, total) == 0
+    view.update(detector.graph, held, wanted, detector.cycle, total, detail="full")
+    assert not view.lod.specs and len(view.rag_nodes.specs) == detector.graph.num_nodes
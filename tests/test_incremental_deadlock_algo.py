@@ -0,0 +1,76 @@
+import random
+import pytest
+from incremental_deadlock_algo import IncrementalDeadlockDetector
+from helpers import random_single_state, rag_adjacency, has_cycle, is_cycle_of
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_reference_cycle_check(seed):
+    held, wanted, _ = random_single_state(seed)
+    detector = IncrementalDeadlockDetector(held, wanted)
+    assert detector.has_deadlock() == has_cycle(rag_adjacency(held, wanted))
+    if detector.has_deadlock():
+        assert is_cycle_of(detector.cycle, rag_adjacency(held, wanted))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_event_stream_matches_reference(seed):
+    rng = random.Random(seed)
+    processes = [f"P{i+1}" for i in range(6)]
+    resources = [f"R{j+1}" for j in range(6)]
+    detector = IncrementalDeadlockDetector()
+    for _ in range(200):
+        process, resource = rng.choice(processes), rng.choice(resources)
+        holder = detector.holder.get(resource)
+        wants = resource in detector.resources_wanted.get(process, [])
+        op = rng.choice(("allocate", "request", "release", "withdraw"))
+        if op == "allocate" and holder is None:
+            detector.add_allocation(process, resource)
+        elif op == "request" and holder != process and not wants:
+            detector.add_request(process, resource)
+        elif op == "release" and holder is not None:
+            detector.release(holder, resource)
+        elif op == "withdraw" and wants:
+            detector.withdraw_request(process, resource)
+        graph = rag_adjacency(detector.resources_held, detector.resources_wanted)
+        assert detector.has_deadlock() == has_cycle(graph)
+        if detector.has_deadlock():
+            assert is_cycle_of(detector.cycle, graph)
+
+
+def test_request_that_closes_a_cycle_returns_it():
+    detector = IncrementalDeadlockDetector({"P1": ["R1"], "P2": ["R2"]}, {"P1": ["R2"]})
+    assert not detector.has_deadlock()
+    cycle = detector.add_request("P2", "R1")
+    assert cycle is not None and cycle[0] == cycle[-1]
+    assert set(cycle) == {"P1", "P2", "R1", "R2"}
+    assert detector.detect_deadlock()[0]
+
+
+def test_release_resolves_the_deadlock():
+    detector = IncrementalDeadlockDetector({"P1": ["R1"], "P2": ["R2"]}, {"P1": ["R2"], "P2": ["R1"]})
+    assert detector.has_deadlock()
+    assert detector.release("P2", "R2") is None
+    assert not detector.has_deadlock()
+    assert detector.detect_deadlock() == (False, "No deadlock detected in the system.")
+
+
+def test_allocation_grants_a_pending_request():
+    detector = IncrementalDeadlockDetector({}, {"P1": ["R1"]})
+    detector.add_allocation("P1", "R1")
+    assert detector.resources_wanted["P1"] == []
+    assert detector.resources_held["P1"] == ["R1"]
+
+
+def test_invalid_operations_raise():
+    detector = IncrementalDeadlockDetector({"P1": ["R1"]}, {"P2": ["R1"]})
+    with pytest.raises(ValueError):
+        detector.add_allocation("P2", "R1")
+    with pytest.raises(ValueError):
+        detector.add_request("P1", "R1")
+    with pytest.raises(ValueError):
+        detector.add_request("P2", "R1")
+    with pytest.raises(ValueError):
+        detector.release("P2", "R1")
+    with pytest.raises(ValueError):
+        detector.withdraw_request("P1", "R1")
@@ -0,0 +1,135 @@
+from array import array
+import pytest
+from matrix_grid import MatrixGrid
+
+
+class FakeEditor:
+    """Stands in for the tk.Entry editor."""
+    def __init__(self, text=""):
+        self.text = text
+        self.placed = True
+        self.bg = "white"
+
+    def get(self):
+        return self.text
+
+    def place_forget(self):
+        self.placed = False
+
+    def config(self, bg):
+        self.bg = bg
+
+
+def make_grid(rows, cols, on_change=None, cell_value=None):
+    """A MatrixGrid without its Tk widgets, for the data and editing logic (no display needed)."""
+    grid = MatrixGrid.__new__(MatrixGrid)
+    grid.rows, grid.cols = rows, cols
+    grid.cell_value = cell_value
+    grid.editable = cell_value is None
+    grid.values = array("l", [0]) * (rows * cols) if grid.editable else None
+    grid.first_row = grid.first_col = 0
+    grid.visible_rows, grid.visible_cols = 5, 4
+    grid.edit_cell = None
+    grid.editor = FakeEditor()
+    grid.on_change = on_change
+    grid.refreshed = 0
+    grid.refresh = lambda: setattr(grid, "refreshed", grid.refreshed + 1)
+    grid.bell = lambda: None
+    grid.begin_edit = lambda row, col: setattr(grid, "edit_cell", (row, col))
+    return grid
+
+
+@pytest.mark.parametrize("text, value", [
+    ("", 0), (" 7 ", 7), ("0", 0), ("2147483647", 2**31 - 1),
+    ("-1", None), ("2147483648", None), ("1.5", None), ("abc", None),
+])
+def test_parse_accepts_non_negative_integers(text, value):
+    assert MatrixGrid._parse(text) == value
+
+
+@pytest.mark.parametrize("first, index, expected", [
+    (0, 2, 0),      # Already fully visible
+    (0, 4, 1),      # The last pooled row may be cut off, so scroll by one
+    (10, 3, 3),     # Above the view
+    (0, 999, 996),  # Clamped to the end of the data
+])
+def test_reveal_scrolls_the_least_needed(first, index, expected):
+    assert MatrixGrid._reveal(first, index, 5, 1000) == expected
+
+
+def test_fractions_for_the_scrollbars():
+    assert MatrixGrid._fractions(0, 10, 1000) == (0.0, 0.01)
+    assert MatrixGrid._fractions(995, 10, 1000) == (0.995, 1.0)
+
+
+def test_data_is_stored_row_major():
+    grid = make_grid(3, 2)
+    for i, value in enumerate([1, 2, 3, 4, 5, 6]):
+        grid.set(i // 2, i % 2, value)
+    assert list(grid.values) == [1, 2, 3, 4, 5, 6]
+    assert grid.get(2, 0) == 5
+    assert list(grid.row(1)) == [3, 4]
+    assert grid.column_sums() == [9, 12]
+    grid.set(0, 1, 10)
+    assert grid.column_sums() == [9, 20]
+    grid.fill(1)
+    assert grid.column_sums() == [3, 3]
+
+
+def test_load_replaces_the_data():
+    grid = make_grid(3, 2)
+    grid.load([1, 2, 3, 4, 5, 6])
+    assert grid.get(2, 0) == 5 and list(grid.row(1)) == [3, 4]
+    with pytest.raises(ValueError):
+        grid.load([1, 2, 3])
+
+
+def test_computed_grid_reads_through():
+    grid = make_grid(2, 2, cell_value=lambda row, col: row * 10 + col)
+    assert not grid.editable
+    assert grid.get(1, 1) == 11
+
+
+def test_commit_reports_only_real_changes():
+    changes = []
+    grid = make_grid(3, 3, on_change=lambda row, col: changes.append((row, col)))
+    grid.edit_cell, grid.editor.text = (1, 2), "0"
+    assert grid.commit_edit()
+    assert changes == [] and grid.edit_cell is None and not grid.editor.placed
+    grid.edit_cell, grid.editor.text = (1, 2), "4"
+    assert grid.commit_edit()
+    assert changes == [(1, 2)] and grid.get(1, 2) == 4
+
+
+def test_invalid_text_keeps_editing():
+    grid = make_grid(2, 2, on_change=lambda row, col: pytest.fail("changed"))
+    grid.edit_cell, grid.editor.text = (0, 0), "-3"
+    assert not grid.commit_edit()
+    assert grid.edit_cell == (0, 0) and grid.editor.bg == "#FFCDD2"
+    grid.cancel_edit()
+    assert grid.edit_cell is None and grid.get(0, 0) == 0
+
+
+def test_move_commits_and_clamps_to_the_grid():
+    grid = make_grid(2, 2)
+    grid.edit_cell, grid.editor.text = (1, 1), "5"
+    assert grid._move(1, 0) == "break"
+    assert grid.get(1, 1) == 5 and grid.edit_cell == (1, 1)
+    grid._move(0, -1)
+    assert grid.edit_cell == (1, 0)
+
+
+def test_move_without_an_edit_is_ignored():
+    grid = make_grid(2, 2)
+    assert grid._move(1, 0) == "break"
+    assert grid.edit_cell is None
+
+
+def test_cell_at_maps_positions_to_cells():
+    grid = make_grid(100, 100)
+    grid.first_row, grid.first_col = 10, 20
+    w, h, hw = MatrixGrid.CELL_WIDTH, MatrixGrid.CELL_HEIGHT, MatrixGrid.HEADER_WIDTH
+    assert grid._cell_at(hw + 2 * w + 1, h + 3 * h + 1) == (13, 22)
+    assert grid._cell_at(hw - 1, h + 1) is None  # Row header
+    grid.first_row = 99
+    assert grid._cell_at(hw + 1, h + h + 1) is None  # Past the last row
@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import pytest
+from matrix_io import load_matrices, save_matrices, load_detector
+from helpers import random_multi_state, rescan_safe_sequence
+
+FORMATS = ["state.csv", "state.npz", "state_npy"]
+
+
+def random_arrays(seed):
+    rng = np.random.default_rng(seed)
+    allocation = rng.integers(0, 4, size=(7, 3))
+    max_matrix = allocation + rng.integers(0, 3, size=(7, 3))
+    total = allocation.sum(axis=0) + rng.integers(0, 3, size=3)
+    return allocation, max_matrix, total
+
+
+@pytest.mark.parametrize("name", FORMATS)
+@pytest.mark.parametrize("labels", [(None, None), (["A", "B", "C", "D", "E", "F", "G"], ["X", "Y", "Z"])])
+def test_round_trip(tmp_path, name, labels):
+    allocation, max_matrix, total = random_arrays(len(name))
+    path = str(tmp_path / name)
+    save_matrices(path, allocation, max_matrix, total, *labels)
+    state = load_matrices(path)
+    np.testing.assert_array_equal(state.allocation, allocation)
+    np.testing.assert_array_equal(state.max, max_matrix)
+    np.testing.assert_array_equal(state.total, total)
+    assert (state.processes, state.resources) == labels
+
+
+def test_npy_directory_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "state_npy")
+    save_matrices(path, *random_arrays(0))
+    assert isinstance(load_matrices(path).allocation, np.memmap)
+    assert isinstance(load_matrices(os.path.join(path, "max.npy")).allocation, np.memmap)
+    assert not isinstance(load_matrices(path, mmap=False).allocation, np.memmap)
+
+
+def test_csv_layout(tmp_path):
+    path = str(tmp_path / "state.csv")
+    save_matrices(path, [[1, 0], [0, 2]], [[1, 1], [2, 2]], [2, 3])
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == ("matrix,process,R1,R2\n"
+                            "total,,2,3\n"
+                            "allocation,P1,1,0\n"
+                            "allocation,P2,0,2\n"
+                            "max,P1,1,1\n"
+                            "max,P2,2,2\n")
+
+
+@pytest.mark.parametrize("content", [
+    "process,matrix,R1\ntotal,,1\n",
+    "matrix,process,R1\nallocation,P1,1\nmax,P1,1\n",
+    "matrix,process,R1\ntotal,,1\ntotal,,1\nallocation,P1,1\nmax,P1,1\n",
+    "matrix,process,R1\ntotal,,1\nneed,P1,1\n",
+    "matrix,process,R1\ntotal,,1\nallocation,P1,1\nmax,P2,1\n",
+])
+def test_invalid_csv_files(tmp_path, content):
+    path = tmp_path / "state.csv"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_matrices(str(path))
+
+
+def test_invalid_shapes_and_missing_arrays(tmp_path):
+    with pytest.raises(ValueError):
+        save_matrices(str(tmp_path / "a.npz"), [[1, 0]], [[1, 0, 0]], [1, 1])
+    with pytest.raises(ValueError):
+        save_matrices(str(tmp_path / "a.npz"), [[1, 0]], [[1, 0]], [1, 1], processes=["A", "B"])
+    np.savez(str(tmp_path / "b.npz"), allocation=np.zeros((1, 1)), total=np.zeros(1))
+    with pytest.raises(ValueError, match="Missing 'max' array"):
+        load_matrices(str(tmp_path / "b.npz"))
+    os.makedirs(tmp_path / "c")
+    with pytest.raises(ValueError, match="Missing allocation.npy"):
+        load_matrices(str(tmp_path / "c"))
+
+
+@pytest.mark.parametrize("name", FORMATS)
+@pytest.mark.parametrize("seed", range(10))
+def test_load_detector_matches_the_rescan_reference(tmp_path, name, seed):
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    processes, resources = list(allocation), list(total)
+    path = str(tmp_path / name)
+    save_matrices(path, [[allocation[p][r] for r in resources] for p in processes],
+                  [[max_matrix[p][r] for r in resources] for p in processes], [total[r] for r in resources])
+    detector = load_detector(path)
+    sequence, unfinished = rescan_safe_sequence(allocation, max_matrix, available)
+    assert detector.detect_deadlock()[0] == bool(unfinished)
+    assert (detector.safe_sequence, detector.unfinished) == (sequence, unfinished)
+
+
+@pytest.mark.parametrize("name", FORMATS)
+def test_load_detector_rejects_totals_below_the_allocation(tmp_path, name):
+    path = str(tmp_path / name)
+    save_matrices(path, [[1, 2], [0, 2]], [[1, 2], [0, 2]], [1, 3], resources=["CPU", "Disk"])
+    with pytest.raises(ValueError, match=r"Allocation of Disk \(4\) exceeds Total \(3\)"):
+        load_detector(path)
@@ -0,0 +1,75 @@
+import json
+import pytest
+from monitor import DeadlockMonitor, main
+
+
+def lines(*events):
+    return [json.dumps(event) + "\n" for event in events]
+
+
+DEADLOCK = lines(
+    {"op": "allocate", "process": "P1", "resource": "R1"},
+    {"op": "allocate", "process": "P2", "resource": "R2"},
+    {"op": "request", "process": "P1", "resource": "R2"},
+    {"op": "request", "process": "P2", "resource": "R1"},
+    {"op": "release", "process": "P2", "resource": "R2"},
+)
+
+
+def test_alerts_when_a_deadlock_forms_and_resolves():
+    alerts = list(DeadlockMonitor().process_lines(DEADLOCK))
+    assert [alert["status"] for alert in alerts] == ["deadlock", "resolved"]
+    assert alerts[0]["event"] == 4
+    assert set(alerts[0]["cycle"]) == {"P1", "P2", "R1", "R2"}
+    assert alerts[1] == {"event": 5, "status": "resolved"}
+
+
+def test_release_that_leaves_another_deadlock_is_not_resolved():
+    monitor = DeadlockMonitor()
+    events = DEADLOCK[:4] + lines(
+        {"op": "allocate", "process": "P3", "resource": "R3"},
+        {"op": "allocate", "process": "P4", "resource": "R4"},
+        {"op": "request", "process": "P3", "resource": "R4"},
+        {"op": "request", "process": "P4", "resource": "R3"},
+    ) + DEADLOCK[4:]
+    alerts = list(monitor.process_lines(events))
+    assert [alert["status"] for alert in alerts] == ["deadlock", "deadlock"]
+    assert monitor.detector.has_deadlock()
+
+
+@pytest.mark.parametrize("line, message", [
+    ("not json\n", "Invalid JSON"),
+    ('{"op": "allocate", "process": "P1", "resource": "R1"} trailing\n', "Invalid JSON: Extra data"),
+    ("[1, 2]\n", "Event must be a JSON object, got list"),
+    ('{"op": "grab", "process": "P1", "resource": "R1"}\n', "Unknown event op: grab"),
+    ('{"op": ["allocate"], "process": "P1", "resource": "R1"}\n', "Unknown event op"),
+    ('{"op": "allocate", "process": ["P1"], "resource": "R1"}\n', "Event process and resource must be strings"),
+    ('{"op": "allocate", "process": "P1"}\n', "'resource'"),
+    ('{"op": "release", "process": "P1", "resource": "R1"}\n', "P1 does not hold R1."),
+])
+def test_invalid_events_are_reported_and_skipped(line, message):
+    monitor = DeadlockMonitor()
+    alerts = list(monitor.process_lines([line] + DEADLOCK[:4]))
+    assert alerts[0]["event"] == 1 and alerts[0]["status"] == "error"
+    assert alerts[0]["message"].startswith(message)
+    assert alerts[1]["event"] == 5 and alerts[1]["status"] == "deadlock"
+
+
+def test_blank_lines_and_surrounding_whitespace_are_accepted():
+    events = ["\n"] + ["  " + line.rstrip("\n") + "  \n" for line in DEADLOCK[:4]]
+    assert [alert["status"] for alert in DeadlockMonitor().process_lines(events)] == ["deadlock"]
+
+
+def test_strict_mode_raises():
+    with pytest.raises(ValueError, match="Invalid event 1"):
+        list(DeadlockMonitor(strict=True).process_lines(["not json\n"]))
+
+
+def test_main_writes_json_line_alerts(tmp_path, capsys):
+    path = tmp_path / "events.jsonl"
+    path.write_text("".join(DEADLOCK), encoding="utf-8")
+    assert main([str(path)]) == 0
+    alerts = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [alert["status"] for alert in alerts] == ["deadlock", "resolved"]
+    path.write_text("oops\n", encoding="utf-8")
+    assert main([str(path), "--strict"]) == 1
@@ -0,0 +1,37 @@
+import pytest
+from multi_deadlock_algo import MultiInstanceDeadlockDetector
+from helpers import random_multi_state, rescan_safe_sequence
+
+
+@pytest.mark.parametrize("seed", range(500))
+def test_matches_the_rescan_reference(seed):
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    sequence, unfinished = rescan_safe_sequence(allocation, max_matrix, available)
+    detector = MultiInstanceDeadlockDetector(allocation, max_matrix, available, total)
+    deadlocked, message = detector.detect_deadlock()
+    assert deadlocked == bool(unfinished) == detector.has_deadlock
+    assert detector.safe_sequence == sequence
+    if deadlocked:
+        assert message.endswith(f"Unfinished processes: {unfinished}")
+    else:
+        assert message == f"Safe sequence: {sequence}"
+
+
+def test_later_process_unblocks_an_earlier_one():
+    allocation = {"P1": {"R1": 0}, "P2": {"R1": 1}, "P3": {"R1": 1}}
+    max_matrix = {"P1": {"R1": 1}, "P2": {"R1": 1}, "P3": {"R1": 1}}
+    detector = MultiInstanceDeadlockDetector(allocation, max_matrix, {"R1": 0}, {"R1": 2})
+    assert detector.detect_deadlock() == (False, "Safe sequence: ['P2', 'P1', 'P3']")
+
+
+def test_does_not_modify_available():
+    available = {"R1": 1}
+    detector = MultiInstanceDeadlockDetector({"P1": {"R1": 1}}, {"P1": {"R1": 1}}, available, {"R1": 2})
+    detector.detect_deadlock()
+    assert available == {"R1": 1}
+
+
+def test_rejects_allocation_above_max():
+    detector = MultiInstanceDeadlockDetector({"P1": {"R1": 2}}, {"P1": {"R1": 1}}, {"R1": 0}, {"R1": 2})
+    with pytest.raises(ValueError):
+        detector.detect_deadlock()
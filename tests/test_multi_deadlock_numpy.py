@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from multi_deadlock_numpy import VectorizedMultiInstanceDeadlockDetector
+from helpers import random_multi_state, rescan_safe_sequence
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_the_rescan_reference(seed):
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    sequence, unfinished = rescan_safe_sequence(allocation, max_matrix, available)
+    detector = VectorizedMultiInstanceDeadlockDetector(allocation, max_matrix, available, total)
+    deadlocked, message = detector.detect_deadlock()
+    assert deadlocked == bool(unfinished) == detector.has_deadlock
+    assert detector.safe_sequence == sequence
+    assert detector.unfinished == unfinished
+    if not deadlocked:
+        assert message == f"Safe sequence: {sequence}"
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_from_arrays_matches_the_dict_constructor(seed):
+    allocation, max_matrix, available, total = random_multi_state(seed)
+    processes, resources = list(allocation), list(total)
+    detector = VectorizedMultiInstanceDeadlockDetector.from_arrays(
+        [[allocation[p][r] for r in resources] for p in processes],
+        [[max_matrix[p][r] for r in resources] for p in processes],
+        [available[r] for r in resources])
+    expected = VectorizedMultiInstanceDeadlockDetector(allocation, max_matrix, available, total)
+    assert detector.detect_deadlock() == expected.detect_deadlock()
+    assert detector.unfinished == expected.unfinished
+
+
+def test_from_arrays_uses_the_given_names():
+    detector = VectorizedMultiInstanceDeadlockDetector.from_arrays(
+        np.array([[1, 0], [0, 1]]), np.array([[1, 1], [1, 1]]), np.array([0, 0]),
+        processes=["A", "B"], resources=["X", "Y"])
+    assert detector.detect_deadlock()[0]
+    assert detector.unfinished == ["A", "B"]
+
+
+def test_from_arrays_rejects_mismatched_shapes():
+    with pytest.raises(ValueError):
+        VectorizedMultiInstanceDeadlockDetector.from_arrays([[1, 0]], [[1, 0, 0]], [0, 0])
+    with pytest.raises(ValueError):
+        VectorizedMultiInstanceDeadlockDetector.from_arrays([[1, 0]], [[1, 0]], [0])
+
+
+def test_rejects_allocation_above_max():
+    detector = VectorizedMultiInstanceDeadlockDetector.from_arrays([[2]], [[1]], [0])
+    with pytest.raises(ValueError):
+        detector.detect_deadlock()
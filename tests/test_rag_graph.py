@@ -0,0 +1,91 @@
+import pytest
+from rag_graph import RAGGraph, strongly_connected_components
+from deadlock_algo import DeadlockDetector
+from helpers import random_single_state, rag_adjacency, deadlocked_sets, is_cycle_of
+
+
+def as_sets(adjacency):
+    return {node: set(targets) for node, targets in adjacency.items()}
+
+
+def edge_arrays(held, wanted):
+    """Splits a 'P1'/'R1' state into 0-based edge arrays."""
+    alloc = [(int(r[1:]) - 1, int(p[1:]) - 1) for p, resources in held.items() for r in resources]
+    request = [(int(p[1:]) - 1, int(r[1:]) - 1) for p, resources in wanted.items() for r in resources]
+    return [r for r, _ in alloc], [p for _, p in alloc], [p for p, _ in request], [r for _, r in request]
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_from_state_matches_the_state(seed):
+    held, wanted, total = random_single_state(seed)
+    graph = RAGGraph.from_state(held, wanted, total)
+    expected = rag_adjacency(held, wanted)
+    for r in range(total):
+        expected.setdefault(f"R{r+1}", set())
+    assert as_sets(graph.to_adjacency()) == expected
+    assert graph.num_allocations == sum(map(len, held.values()))
+    assert graph.num_requests == sum(map(len, wanted.values()))
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_components_and_cycles_use_node_indices(seed):
+    held, wanted, total = random_single_state(seed)
+    graph = RAGGraph.from_state(held, wanted, total)
+    components = graph.strongly_connected_components()
+    labelled = {frozenset(graph.label(n) for n in component) for component in components}
+    assert labelled == deadlocked_sets(rag_adjacency(held, wanted))
+    adjacency = as_sets(graph.to_adjacency())
+    for component in components:
+        assert is_cycle_of([graph.label(n) for n in graph.extract_cycle(component)], adjacency)
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_from_arrays_matches_from_state(seed):
+    held, wanted, total = random_single_state(seed)
+    num_processes = max(int(p[1:]) for p in list(held) + list(wanted))
+    detector = DeadlockDetector.from_arrays(num_processes, total, *edge_arrays(held, wanted))
+    assert detector.detect_cycle() == DeadlockDetector(held, wanted, total).detect_cycle()
+
+
+def test_node_layout_and_labels():
+    graph = RAGGraph(2, 3, [0], [1], [0], [2], process_labels=["A", "B"], resource_labels=["X", "Y", "Z"])
+    assert graph.num_nodes == 5
+    assert graph.is_process(1) and not graph.is_process(2)
+    assert graph.process_nodes() == ["A", "B"]
+    assert graph.resource_nodes() == ["X", "Y", "Z"]
+    assert list(graph.neighbors(0)) == [4]
+    assert list(graph.neighbors(2)) == [1]
+    assert graph.to_adjacency() == {"A": ["Z"], "B": [], "X": ["B"], "Y": [], "Z": []}
+
+
+def test_module_level_scc_on_raw_csr():
+    # 0 -> 1 -> 2 -> 0, 2 -> 3, 3 -> 4 -> 3
+    offsets = [0, 1, 2, 4, 5, 6]
+    targets = [1, 2, 0, 3, 4, 3]
+    components = strongly_connected_components(5, offsets, targets)
+    assert sorted(sorted(c) for c in components) == [[0, 1, 2], [3, 4]]
+
+
+@pytest.mark.parametrize("held, wanted", [
+    ({"X1": ["R1"]}, {}),
+    ({"P1": ["R3"]}, {}),
+    ({"P1": ["R0"]}, {}),
+    ({"P1": ["Q1"]}, {}),
+    ({}, {"P1": ["R01"]}),
+    ({"P1": ["R1"], "P2": ["R1"]}, {}),
+    ({"P1": ["R1"]}, {"P1": ["R1"]}),
+])
+def test_from_state_rejects_invalid_states(held, wanted):
+    with pytest.raises(ValueError):
+        RAGGraph.from_state(held, wanted, 2)
+
+
+def test_rejects_out_of_range_and_mismatched_edges():
+    with pytest.raises(ValueError):
+        RAGGraph(2, 2, [2], [0], [], [])
+    with pytest.raises(ValueError):
+        RAGGraph(2, 2, [0], [-1], [], [])
+    with pytest.raises(ValueError):
+        RAGGraph(2, 2, [0, 1], [0], [], [])
+    with pytest.raises(ValueError):
+        DeadlockDetector.from_arrays(1, 0, [], [], [], [])
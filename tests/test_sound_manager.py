@@ -0,0 +1,146 @@
+import sys
+import time
+import types
+import threading
+import pytest
+from sound_manager import QUEUE_SIZE, SoundManager
+
+PATHS = ("allocate.wav", "request.wav", "deadlock.wav", "safe.wav")
+
+
+@pytest.fixture
+def fake_pygame(monkeypatch):
+    """A pygame stand-in whose mixer records what is played; loading waits until `ready` is set."""
+    pygame = types.SimpleNamespace(played=[], ready=threading.Event(), fail=False)
+
+    class Sound:
+        def __init__(self, path):
+            pygame.ready.wait(5)
+            self.path = path
+
+        def play(self):
+            pygame.played.append(self.path)
+
+    def init():
+        if pygame.fail:
+            raise RuntimeError("no audio device")
+
+    pygame.mixer = types.SimpleNamespace(init=init, Sound=Sound)
+    monkeypatch.setitem(sys.modules, "pygame", pygame)
+    return pygame
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_startup_does_not_wait_for_the_sounds(fake_pygame):
+    start_time = time.perf_counter()
+    manager = SoundManager(*PATHS)
+    manager.play_allocate_sound()  # Queued while the samples are still loading
+    assert time.perf_counter() - start_time < 0.5
+    assert not manager.sounds_loaded
+    fake_pygame.ready.set()
+    assert wait_for(lambda: fake_pygame.played == ["allocate.wav"])
+    manager.close()
+
+
+def test_bursts_are_coalesced(fake_pygame):
+    manager = SoundManager(*PATHS)
+    for _ in range(200):
+        manager.play_allocate_sound()
+    manager.play_request_sound()  # Dropped: the queue is already full
+    fake_pygame.ready.set()
+    assert wait_for(lambda: manager._events.empty())
+    manager.close()
+    assert fake_pygame.played == ["allocate.wav"]
+    assert QUEUE_SIZE < 200
+
+
+def test_each_sound_plays_once_per_batch_in_arrival_order(fake_pygame):
+    manager = SoundManager(*PATHS)
+    for play in (manager.play_request_sound, manager.play_deadlock_sound, manager.play_request_sound,
+                 manager.play_safe_sound):
+        play()
+    fake_pygame.ready.set()
+    manager.close()
+    assert fake_pygame.played == ["request.wav", "deadlock.wav", "safe.wav"]
+
+
+def test_disabled_sound_queues_nothing(fake_pygame):
+    fake_pygame.ready.set()
+    manager = SoundManager(*PATHS)
+    assert wait_for(lambda: manager.sounds_loaded)
+    assert manager.toggle_sound() is False
+    manager.play_deadlock_sound()
+    assert manager._events.empty()
+    assert manager.toggle_sound() is True
+    manager.close()
+    assert fake_pygame.played == []
+
+
+def test_missing_audio_device_disables_sound(fake_pygame):
+    fake_pygame.fail = True
+    manager = SoundManager(*PATHS)
+    assert wait_for(lambda: manager.load_failed)
+    assert not manager.sound_enabled
+    assert manager.toggle_sound() is False
+    manager.play_safe_sound()
+    assert fake_pygame.played == []
+
+
+class FakeWindow:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, function, *args):
+        self.scheduled.append((function, args))
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for function, args in scheduled:
+            function(*args)
+
+
+class FakeCheckbox:
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options):
+        self.options.update(options)
+
+
+def make_gui(manager):
+    """The sound checkbox logic of the main window, without its Tk widgets (no display needed)."""
+    from gui import DeadlockDetectionGUI
+    gui = DeadlockDetectionGUI.__new__(DeadlockDetectionGUI)
+    gui.window = FakeWindow()
+    gui.sound_manager = manager
+    gui.sound_checkbox = FakeCheckbox()
+    return gui
+
+
+def test_checkbox_follows_a_failed_load(fake_pygame):
+    fake_pygame.fail = True
+    gui = make_gui(SoundManager(*PATHS))
+    gui.sync_sound_checkbox()
+    assert wait_for(lambda: gui.sound_manager.load_failed)
+    gui.window.run_pending()  # The poll scheduled while loading, or nothing if the load failed first
+    assert gui.sound_checkbox.options == {"text": "Sound Off", "state": "disabled"}
+    assert not gui.window.scheduled
+    gui.toggle_sound()
+    assert gui.sound_checkbox.options["text"] == "Sound Off"
+
+
+def test_checkbox_stops_polling_once_loaded(fake_pygame):
+    gui = make_gui(SoundManager(*PATHS))
+    gui.sync_sound_checkbox()
+    assert gui.sound_checkbox.options == {"text": "Sound On"} and gui.window.scheduled
+    fake_pygame.ready.set()
+    assert wait_for(lambda: gui.sound_manager.sounds_loaded)
+    gui.window.run_pending()
+    assert gui.sound_checkbox.options == {"text": "Sound On"} and not gui.window.scheduled
+    gui.sound_manager.close()
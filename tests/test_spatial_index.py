@@ -0,0 +1,62 @@
+import random
+import pytest
+from spatial_index import GridIndex
+
+
+def brute_force_hit(positions, x, y, radius):
+    """Reference: the squared distance of the closest point inside the hit box, or None."""
+    distances = [(x - px) ** 2 + (y - py) ** 2 for px, py in positions.values()
+                 if abs(x - px) < radius and abs(y - py) < radius]
+    return min(distances) if distances else None
+
+
+@pytest.mark.parametrize("radius", [10, 40, 80, 200])
+@pytest.mark.parametrize("seed", range(10))
+def test_hit_matches_brute_force(seed, radius):
+    rng = random.Random(seed)
+    index = GridIndex(cell_size=80)
+    positions = {}
+    for i in range(300):
+        key = f"N{i}"
+        positions[key] = (rng.uniform(-100, 1200), rng.uniform(-100, 900))
+        index.move(key, *positions[key])
+    for i in rng.sample(range(300), 100):  # Drag some points around, and drop a few
+        key = f"N{i}"
+        if i % 5 == 0:
+            index.remove(key)
+            del positions[key]
+        else:
+            positions[key] = (rng.uniform(-100, 1200), rng.uniform(-100, 900))
+            index.move(key, *positions[key])
+    assert len(index) == len(positions)
+    for _ in range(300):
+        x, y = rng.uniform(-150, 1250), rng.uniform(-150, 950)
+        key = index.hit(x, y, radius)
+        expected = brute_force_hit(positions, x, y, radius)
+        if expected is None:
+            assert key is None
+        else:
+            px, py = positions[key]
+            assert (x - px) ** 2 + (y - py) ** 2 == expected
+
+
+def test_buckets_follow_moves_and_removals():
+    index = GridIndex(cell_size=80)
+    index.move("P1", 10, 10)
+    index.move("P1", 20, 20)  # Same cell
+    assert index.buckets == {(0, 0): {"P1"}}
+    index.move("P1", 170, 10)
+    assert index.buckets == {(2, 0): {"P1"}}
+    assert index.get("P1") == (170, 10) and "P1" in index
+    index.remove("P1")
+    index.remove("P1")  # Removing twice is fine
+    assert index.buckets == {} and index.get("P1") is None and "P1" not in index
+
+
+def test_hit_box_is_open_and_clear_empties_the_index():
+    index = GridIndex()
+    index.move("R1", 100, 100)
+    assert index.hit(139.9, 60.1) == "R1"
+    assert index.hit(140, 100) is None
+    index.clear()
+    assert len(index) == 0 and index.hit(100, 100) is None
@@ -0,0 +1,13 @@
+from startup_check import DEFERRED_MODULES, GUI_MODULES, measure_imports
+
+
+def test_gui_modules_defer_the_plotting_and_audio_stacks():
+    total_us, loaded = measure_imports(GUI_MODULES)
+    assert total_us > 0
+    assert set(GUI_MODULES) <= loaded
+    assert not [name for name in loaded if name.split(".")[0] in DEFERRED_MODULES]
+
+
+def test_measure_imports_reports_nested_modules():
+    _, loaded = measure_imports(("json",))
+    assert {"json", "json.decoder"} <= loaded
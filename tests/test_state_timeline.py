@@ -0,0 +1,174 @@
+import types
+import random
+import pytest
+from state_timeline import BRANCH, PersistentVector, StateTimeline
+
+
+@pytest.mark.parametrize("length", [0, 1, BRANCH - 1, BRANCH, BRANCH + 1, BRANCH * BRANCH + 3])
+def test_vector_behaves_like_a_list(length):
+    rng = random.Random(length)
+    expected = list(range(length))
+    vector = PersistentVector(expected)
+    versions = [(vector, list(expected))]
+    for _ in range(50 if length else 0):
+        i = rng.randrange(length)
+        vector = vector.set(i, -i)
+        expected[i] = -i
+        versions.append((vector, list(expected)))
+    for version, items in versions:  # Every old version is unchanged
+        assert len(version) == len(items)
+        assert list(version) == items
+
+
+def test_set_shares_everything_off_the_changed_path():
+    vector = PersistentVector(range(BRANCH * BRANCH))
+    changed = vector.set(5, "x")
+    assert changed.root[0] is not vector.root[0]
+    assert all(changed.root[i] is vector.root[i] for i in range(1, BRANCH))
+    assert vector[5] == 5 and changed[5] == "x"
+
+
+def test_vector_index_errors():
+    vector = PersistentVector("abc")
+    for index in (-1, 3):
+        with pytest.raises(IndexError):
+            vector[index]
+        with pytest.raises(IndexError):
+            vector.set(index, "z")
+
+
+def test_record_undo_redo_and_state():
+    timeline = StateTimeline(["P1", "P2"])
+    assert not timeline.can_undo() and not timeline.can_redo()
+    timeline.record("allocation", "P1", "R1")
+    timeline.record("request", "P2", "R1")
+    assert timeline.state() == ({"P1": ["R1"], "P2": []}, {"P1": [], "P2": ["R1"]})
+    assert timeline.undo() == ("request", "P2", "R1")
+    assert timeline.state() == ({"P1": ["R1"], "P2": []}, {"P1": [], "P2": []})
+    assert timeline.redo() == ("request", "P2", "R1")
+    assert timeline.state(timeline.snapshots[0]) == ({"P1": [], "P2": []}, {"P1": [], "P2": []})
+    assert not timeline.can_redo()
+    with pytest.raises(ValueError):
+        timeline.redo()
+    timeline.goto(0)
+    with pytest.raises(ValueError):
+        timeline.undo()
+
+
+def test_repeating_the_redo_step_keeps_the_branch_and_its_result():
+    timeline = StateTimeline(["P1", "P2"])
+    timeline.record("allocation", "P1", "R1")
+    timeline.record("request", "P2", "R1")
+    timeline.current.result = "detected"
+    timeline.goto(0)
+    timeline.record("allocation", "P1", "R1")
+    assert timeline.can_redo()
+    assert timeline.record("request", "P2", "R1").result == "detected"
+    timeline.undo()
+    timeline.record("allocation", "P2", "R2")  # A different step drops the redo branch
+    assert not timeline.can_redo() and len(timeline.snapshots) == 3
+    assert timeline.current.result is None
+
+
+def test_goto_jumps_to_any_state():
+    timeline = StateTimeline(["P1"])
+    for r in ("R1", "R2", "R3"):
+        timeline.record("allocation", "P1", r)
+    assert timeline.goto(1).action == ("allocation", "P1", "R1")
+    assert timeline.state()[0] == {"P1": ["R1"]}
+    assert timeline.can_undo() and timeline.can_redo()
+    assert timeline.goto(3) is timeline.current
+    for position in (-1, 4):
+        with pytest.raises(ValueError):
+            timeline.goto(position)
+    assert timeline.position == 3
+
+
+def test_unknown_steps_are_rejected():
+    timeline = StateTimeline(["P1"])
+    with pytest.raises(ValueError):
+        timeline.record("allocation", "P9", "R1")
+    with pytest.raises(ValueError):
+        timeline.record("release", "P1", "R1")
+    assert len(timeline.snapshots) == 1
+
+
+class FakeCanvas:
+    """Records the items the single-instance GUI draws on its drag-and-drop canvas."""
+    def __init__(self):
+        self.items = {}
+        self.next_id = 1
+
+    def create_text(self, x, y, **options):
+        item = self.next_id
+        self.next_id += 1
+        self.items[item] = dict(options, coords=(x, y))
+        return item
+
+    def delete(self, item):
+        self.items.pop(item, None)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def coords(self, item, x, y):
+        self.items[item]["coords"] = (x, y)
+
+    def tag_bind(self, tag, sequence, function):
+        pass
+
+    def tag_unbind(self, tag, sequence):
+        pass
+
+
+class FakeEdgeList:
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, key, text):
+        self.rows[key] = text
+
+    def remove(self, key):
+        del self.rows[key]
+
+
+def make_gui(total_processes, total_resources):
+    """A single-instance GUI in the allocation phase, without its Tk widgets (no display needed)."""
+    from gui import DeadlockDetectionGUI
+    from spatial_index import GridIndex
+    gui = DeadlockDetectionGUI.__new__(DeadlockDetectionGUI)
+    gui.total_processes, gui.total_resources = total_processes, total_resources
+    gui.resources_held = {f"P{i+1}": [] for i in range(total_processes)}
+    gui.resources_wanted = {f"P{i+1}": [] for i in range(total_processes)}
+    gui.main_canvas = FakeCanvas()
+    gui.left_part_width, gui.center_part_width = 200, 500
+    gui.process_icon = gui.resource_icon = ""
+    gui.process_index, gui.resource_index = GridIndex(), GridIndex()
+    gui.home_positions, gui.resource_holder, gui.resource_requesters = {}, {}, {}
+    gui.process_items, gui.resource_items = {}, {}
+    gui.allocation_list, gui.request_list = FakeEdgeList(), FakeEdgeList()
+    gui.timeline = StateTimeline(gui.resources_held)
+    gui.live_detector = gui.new_live_detector()
+    gui.last_cycle = None
+    gui.history_list = gui.rag_window = None
+    gui.phase_label = gui.main_canvas.create_text(0, 0)
+    gui.button_finish = types.SimpleNamespace(config=lambda **options: None)
+    gui.current_phase = "allocation"
+    gui.show_allocation_phase(total_processes, total_resources)
+    return gui
+
+
+def test_undo_and_redo_an_allocation_in_the_request_phase():
+    gui = make_gui(2, 3)
+    gui.apply_allocation("P1", "R3")  # Only R3 is involved, but R1..R3 are laid out in the request phase
+    gui.timeline.record("allocation", "P1", "R3")
+    gui.go_to_request_phase()
+    assert sorted(gui.resource_items) == ["R1", "R2", "R3"]
+    r3 = gui.main_canvas.items[gui.resource_items["R3"]]
+    assert r3["fill"] == "red"
+    gui.undo_last_action()
+    assert gui.resources_held["P1"] == [] and r3["fill"] == "green"
+    assert not gui.live_detector.holder
+    gui.redo_last_action()
+    assert gui.resources_held["P1"] == ["R3"] and r3["fill"] == "red"
+    assert gui.allocation_list.rows.keys() == {("P1", "R3")}
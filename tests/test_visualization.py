@@ -0,0 +1,103 @@
+import pytest
+from deadlock_algo import DeadlockDetector
+from incremental_deadlock_algo import IncrementalDeadlockDetector
+from graph_layout import BipartiteLayout, CircularLayout
+from rag_view import ArtistCache
+from visualization import RAGView, compute_safe_sequence
+from helpers import random_single_state, rag_adjacency
+
+
+def rescan_safe_sequence(processes, resources_held, resources_wanted, total_resources):
+    """Reference: the original compute_safe_sequence(), which rescans from the start after every step."""
+    held_resources = set()
+    for proc in resources_held:
+        held_resources.update(resources_held[proc])
+    available = {f"R{i+1}" for i in range(total_resources)} - held_resources
+    finish = {proc: False for proc in processes}
+    safe_sequence = []
+    while len(safe_sequence) < len(processes):
+        for proc in processes:
+            if not finish[proc] and all(res in available or res in resources_held[proc]
+                                        for res in resources_wanted[proc]):
+                safe_sequence.append(proc)
+                available.update(resources_held[proc])
+                finish[proc] = True
+                break
+        else:
+            return None
+    return safe_sequence
+
+
+def new_view():
+    return RAGView(rag_layout=BipartiteLayout(), wfg_layout=CircularLayout())
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_safe_sequence_matches_the_rescan(seed):
+    held, wanted, total = random_single_state(seed, hold_probability=0.5, max_requests=2)
+    processes = list(held)
+    assert (compute_safe_sequence(processes, held, wanted, total)
+            == rescan_safe_sequence(processes, held, wanted, total))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_live_adjacency_includes_blocked_edges(seed):
+    held, wanted, total = random_single_state(seed)
+    adjacency = IncrementalDeadlockDetector(held, wanted).adjacency()
+    assert {node: set(targets) for node, targets in adjacency.items()} == rag_adjacency(held, wanted)
+
+
+def test_update_redraws_only_what_changed():
+    held = {"P1": ["R1"], "P2": ["R2"], "P3": ["R3"]}
+    wanted = {"P1": ["R2"], "P2": [], "P3": []}
+    view = new_view()
+    detector = DeadlockDetector(held, wanted, 3)
+    assert view.update(detector.graph, held, wanted, None, 3) > 0
+    view.pop_changes()
+    assert view.update(detector.graph, held, wanted, None, 3) == 0
+    assert view.pop_changes() == ([], False)
+
+    untouched = view.rag_nodes.artists["P3"], view.rag_edges.artists[("R3", "P3")]
+    wanted["P2"].append("R1")  # Closes a cycle that P3 and R3 are not part of
+    detector = DeadlockDetector(held, wanted, 3)
+    assert detector.detect_cycle()
+    assert view.update(detector.graph, held, wanted, detector.cycle, 3) > 0
+    assert (view.rag_nodes.artists["P3"], view.rag_edges.artists[("R3", "P3")]) == untouched
+    assert view.annotations.specs["status"][1] == "No Safe Execution Sequence Found"
+    assert "cycle" in view.annotations.specs
+
+
+def test_adding_nodes_does_not_need_a_full_redraw():
+    held = {"P1": ["R1"], "P2": []}
+    wanted = {"P1": [], "P2": ["R1"]}
+    view = new_view()
+    view.update(rag_adjacency(held, wanted), held, wanted, None, 3)
+    view.pop_changes()
+    wanted["P2"].append("R2")  # R2 already has its place, so only an arrow is added
+    view.update({k: list(v) for k, v in rag_adjacency(held, wanted).items()}, held, wanted, None, 3)
+    added, full = view.pop_changes()
+    assert added and not full
+
+
+def test_artist_cache_only_recreates_changed_specs():
+    created, removed = [], []
+
+    class Artist:
+        def __init__(self, key):
+            self.key = key
+
+        def remove(self):
+            removed.append(self.key)
+
+    def create(key, spec):
+        created.append(key)
+        return [Artist(key)]
+
+    cache = ArtistCache()
+    assert cache.sync({"a": 1, "b": 2}, create) == 2
+    assert cache.sync({"a": 1, "b": 3, "c": 4}, create) == 2
+    assert cache.sync({"a": 1}, create) == 2
+    assert created == ["a", "b", "b", "c"]
+    assert sorted(removed) == ["b", "b", "c"]
+    cache.clear()
+    assert cache.specs == {} and cache.artists == {}
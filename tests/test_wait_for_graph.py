@@ -0,0 +1,78 @@
+import pytest
+from deadlock_algo import DeadlockDetector
+from rag_graph import RAGGraph
+from wait_for_graph import (WaitForGraph, build_holder_index, build_wait_for_graph,
+                            convert_deadlock_cycle_to_wfg, get_deadlock_details)
+from helpers import random_single_state, rag_adjacency, deadlocked_sets, is_cycle_of
+
+
+def scan_wait_for_graph(resources_held, resources_wanted):
+    """Reference WFG: scans every held list for every request."""
+    wfg = {proc: [] for proc in resources_held}
+    for p1 in resources_wanted:
+        for res in resources_wanted[p1]:
+            for p2 in resources_held:
+                if res in resources_held[p2] and p1 != p2:
+                    wfg.setdefault(p1, []).append(p2)
+        wfg.setdefault(p1, [])
+    return wfg
+
+
+def scan_details(deadlock_cycle, resources_held, resources_wanted):
+    """Reference for get_deadlock_details()."""
+    details = []
+    process_cycle = [node for node in deadlock_cycle if node.startswith("P")]
+    for i, p1 in enumerate(process_cycle):
+        p2 = process_cycle[(i + 1) % len(process_cycle)]
+        for res in resources_wanted[p1]:
+            if res in resources_held.get(p2, []):
+                details.append(f"{p1} holds {resources_held[p1]} and requests {res}, which is held by {p2}")
+                break
+    return details
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_holder_index_builds_the_same_graph_as_a_scan(seed):
+    held, wanted, total = random_single_state(seed)
+    expected = scan_wait_for_graph(held, wanted)
+    assert build_wait_for_graph(held, wanted) == expected
+    assert build_wait_for_graph(held, wanted, build_holder_index(held)) == expected
+    assert WaitForGraph(RAGGraph.from_state(held, wanted, total)).to_adjacency() == expected
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_wfg_components_are_the_deadlocked_processes(seed):
+    held, wanted, total = random_single_state(seed)
+    graph = RAGGraph.from_state(held, wanted, total)
+    wfg = WaitForGraph(graph)
+    rag = rag_adjacency(held, wanted)
+    expected = deadlocked_sets(rag)
+    components = wfg.strongly_connected_components()
+    assert ({frozenset(graph.label(p) for p in component) for component in components}
+            == {frozenset(node for node in s if node.startswith("P")) for s in expected})
+    for component in components:
+        assert frozenset(graph.label(n) for n in wfg.expand_component(component)) in expected
+        assert is_cycle_of([graph.label(n) for n in wfg.extract_cycle(component)], rag)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_cycle_conversion_and_details(seed):
+    held, wanted, total = random_single_state(seed)
+    detector = DeadlockDetector(held, wanted, total)
+    if not detector.detect_cycle():
+        assert convert_deadlock_cycle_to_wfg(detector.cycle, held, wanted) is None
+        assert get_deadlock_details(detector.cycle, held, wanted) == []
+        return
+    wfg_cycle = convert_deadlock_cycle_to_wfg(detector.cycle, held, wanted)
+    assert wfg_cycle == [node for node in detector.cycle if node.startswith("P")]
+    assert is_cycle_of(wfg_cycle, {p: set(q) for p, q in build_wait_for_graph(held, wanted).items()})
+    assert get_deadlock_details(detector.cycle, held, wanted) == scan_details(detector.cycle, held, wanted)
+
+
+def test_details_describe_each_wait():
+    held = {"P1": ["R1"], "P2": ["R2"]}
+    wanted = {"P1": ["R2"], "P2": ["R1"]}
+    assert get_deadlock_details(["P1", "R2", "P2", "R1", "P1"], held, wanted) == [
+        "P1 holds ['R1'] and requests R2, which is held by P2",
+        "P2 holds ['R2'] and requests R1, which is held by P1",
+    ]
@@ -0,0 +1,67 @@
+import io
+import json
+import pytest
+from deadlock_algo import DeadlockDetector
+from multi_deadlock_algo import MultiInstanceDeadlockDetector
+from monitor import DeadlockMonitor
+from workload_generator import (generate_single_state, generate_multi_state, write_single_state,
+                                write_single_events, write_multi_state)
+
+
+@pytest.mark.parametrize("cycles, cycle_length, density", [(0, 2, 1.0), (1, 2, 1.0), (3, 4, 2.5), (0, 2, 0.3)])
+@pytest.mark.parametrize("seed", range(5))
+def test_single_state_is_deadlocked_exactly_by_its_cycles(cycles, cycle_length, density, seed):
+    held, wanted, total = generate_single_state(60, 80, cycles=cycles, cycle_length=cycle_length,
+                                                density=density, seed=seed)
+    detector = DeadlockDetector(held, wanted, total)
+    assert detector.detect_cycle() == bool(cycles)
+    assert len(detector.deadlocked_components) == cycles
+    assert all(len(component) == 2 * cycle_length for component in detector.deadlocked_components)
+
+
+@pytest.mark.parametrize("cycles", [0, 1, 2])
+@pytest.mark.parametrize("seed", range(5))
+def test_multi_state_is_unsafe_exactly_by_its_groups(cycles, seed):
+    allocation, max_matrix, available, total = generate_multi_state(30, 5, cycles=cycles, cycle_length=3, seed=seed)
+    for r in total:
+        assert available[r] + sum(allocation[p][r] for p in allocation) == total[r]
+    detector = MultiInstanceDeadlockDetector(allocation, max_matrix, available, total)
+    assert detector.detect_deadlock()[0] == bool(cycles)
+    assert len(detector.safe_sequence) == 30 - 3 * cycles
+
+
+def test_same_seed_gives_the_same_state():
+    assert generate_single_state(40, 40, seed=7) == generate_single_state(40, 40, seed=7)
+    assert generate_single_state(40, 40, seed=7) != generate_single_state(40, 40, seed=8)
+    assert generate_multi_state(20, 4, seed=7) == generate_multi_state(20, 4, seed=7)
+
+
+def test_streamed_files_match_the_in_memory_states():
+    out = io.StringIO()
+    write_single_state(out, 30, 30, cycles=2, seed=1)
+    state = json.loads(out.getvalue())
+    held, wanted, total = generate_single_state(30, 30, cycles=2, seed=1)
+    assert (state["resources_held"], state["resources_wanted"], state["total_resources"]) == (held, wanted, total)
+
+    out = io.StringIO()
+    write_multi_state(out, 10, 3, cycles=1, seed=1)
+    state = json.loads(out.getvalue())
+    expected = generate_multi_state(10, 3, cycles=1, seed=1)
+    assert (state["allocation"], state["max"], state["available"], state["total_resources"]) == expected
+
+
+def test_event_stream_ends_in_the_planted_deadlock():
+    out = io.StringIO()
+    write_single_events(out, 20, 20, cycles=1, seed=2)
+    monitor = DeadlockMonitor(strict=True)
+    alerts = list(monitor.process_lines(out.getvalue().splitlines()))
+    assert [alert["status"] for alert in alerts] == ["deadlock"]
+
+
+def test_rejects_cycles_that_do_not_fit():
+    with pytest.raises(ValueError):
+        generate_single_state(3, 10, cycles=2)
+    with pytest.raises(ValueError):
+        generate_single_state(10, 10, cycles=1, cycle_length=1)
+    with pytest.raises(ValueError):
+        generate_multi_state(3, 2, cycles=2)